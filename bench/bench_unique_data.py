@@ -0,0 +1,102 @@
+#
+# Python 3.11.10
+#
+# Benchmark da montagem das linhas da tabela `cards` (CardBaseInfo).
+#
+#   python bench/bench_unique_data.py [--sizes 2000 4000 8000 16000] [--quadratico]
+#
+# Gera dumps sinteticos no formato do ygoprodeck e mede `iter_card_rows`
+# com o join por dicionario. Com --quadratico mede tambem a busca antiga,
+# um `isin` no DataFrame por carta, para comparacao.
+#
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base import COLUNAS_CARDS, iter_card_rows, mapa_arquetipos
+
+
+def dump_sintetico(n: int) -> List[Dict]:
+    """Cartas no formato do dump oficial, uma em cada dez com arte alternativa."""
+    cards = []
+    for k in range(n):
+        id = 10_000_000 + k
+        imagens = [id] if k % 10 else [id, 90_000_000 + k]
+        cards.append({
+            'id': id,
+            'name': f'Card {k}',
+            'desc': 'Effect text ' * 8,
+            'race': 'Dragon',
+            'type': 'Effect Monster',
+            'frameType': 'effect',
+            'humanReadableCardType': 'Effect Monster',
+            'atk': 1000,
+            'def': 1000,
+            'archetype': f'Arch {k % 500}',
+            'attribute': 'LIGHT',
+            'level': 4,
+            'typeline': ['Dragon', 'Effect'],
+            'ygoprodeck_url': f'https://ygoprodeck.com/card/card-{k}',
+            'card_prices': [{'cardmarket_price': '0.10', 'tcgplayer_price': '0.20',
+                             'ebay_price': '0.30', 'amazon_price': '0.40',
+                             'coolstuffinc_price': '0.50'}],
+            'card_images': [{'id': i, 'image_url': f'{i}.jpg', 'image_url_small': f'{i}s.jpg',
+                             'image_url_cropped': f'{i}c.jpg'} for i in imagens]
+        })
+    return cards
+
+
+def planilha_sintetica(cards: List[Dict]) -> pd.DataFrame:
+    """Planilha `complet` com `cod` e `arquetype` para metade das cartas."""
+    cods = [c['id'] for c in cards[::2]]
+    return pd.DataFrame({'cod': cods, 'arquetype': [f'Arch MC {c % 300}' for c in cods]})
+
+
+def arquetipos_quadratico(cards: List[Dict], complet: pd.DataFrame) -> List[str]:
+    """Custo da busca antiga: um filtro no DataFrame para cada carta."""
+    arquetipos = []
+    for card in cards:
+        arquetype_mc = complet.loc[complet['cod'].isin([card['id']])]
+        arquetype_mc = arquetype_mc['arquetype'].values.tolist()
+        arquetipos.append(arquetype_mc[0] if arquetype_mc else '')
+    return arquetipos
+
+
+def mede(func, *args) -> float:
+    inicio = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark de iter_card_rows')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000, 4000, 8000, 16000])
+    parser.add_argument('--quadratico', action='store_true')
+    args = parser.parse_args()
+
+    anterior = None
+    print(f'{"cartas":>8} {"linhas":>8} {"join (s)":>10} {"us/carta":>9} {"razao":>6}', end='')
+    print(f' {"isin (s)":>10}' if args.quadratico else '')
+    for n in args.sizes:
+        cards = dump_sintetico(n)
+        complet = planilha_sintetica(cards)
+
+        inicio = time.perf_counter()
+        df = pd.DataFrame.from_records(
+            iter_card_rows(cards, mapa_arquetipos(complet)), columns=COLUNAS_CARDS
+        )
+        tempo = time.perf_counter() - inicio
+
+        razao = f'{tempo / anterior:.2f}' if anterior else '-'
+        anterior = tempo
+        print(f'{n:>8} {df.shape[0]:>8} {tempo:>10.4f} {tempo / n * 1e6:>9.2f} {razao:>6}', end='')
+        print(f' {mede(arquetipos_quadratico, cards, complet):>10.4f}' if args.quadratico else '')
+
+
+if __name__ == '__main__':
+    main()
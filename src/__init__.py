@@ -11,6 +11,7 @@ try:
     from src.mesa import MesaCore, Combination
     from src.deck import FrameDeck
     from src.base import CardInfoOfficial, CardBaseInfo
+    from src.catalog import CardCatalog
 except:
     from ban import BanSheetWeb, BanSheetWebAsync
     from card import CardGame, CardGameAsync
@@ -18,5 +19,6 @@ except:
     from mesa import MesaCore, Combination
     from deck import FrameDeck
     from base import CardInfoOfficial, CardBaseInfo
+    from catalog import CardCatalog
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
@@ -1,21 +1,57 @@
 import os
-from typing import Union
+import json
+from typing import List, Union
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 
 try:
+    from ydke import CoreYDKE
     from deck import FrameDeck
     from base import CardInfoOfficial
+    from catalog import CardCatalog
+    from lru import ResultCache
+    from scheduler import RefreshScheduler
+    from decklist import DecklistParser
 except:
+    from src.ydke import CoreYDKE
     from src.deck import FrameDeck
     from src.base import CardInfoOfficial
+    from src.catalog import CardCatalog
+    from src.lru import ResultCache
+    from src.scheduler import RefreshScheduler
+    from src.decklist import DecklistParser
 
-app = FastAPI()
+# Cache de resultados do /decklist (entradas e segundos de vida)
+DECK_CACHE_SIZE = int(os.environ.get('DECKAPI_DECK_CACHE_SIZE', 4096))
+DECK_CACHE_TTL = float(os.environ.get('DECKAPI_DECK_CACHE_TTL', 3600))
+# Segundos entre atualizacoes em segundo plano dos dados, 0 desliga
+REFRESH_INTERVAL = float(os.environ.get('DECKAPI_REFRESH_INTERVAL', 86400))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Catálogo de cartas e banlist carregados uma única vez por processo
+    app.state.catalog = CardCatalog()
+    # Índice das estruturas oficiais montado antes da primeira requisição
+    app.state.catalog.card_structures
+    app.state.deck_cache = ResultCache(DECK_CACHE_SIZE, DECK_CACHE_TTL)
+    # Atualizacao dos dados fora das requisicoes; cada catalogo novo so e
+    # publicado pronto, com uma troca de referencia
+    app.state.scheduler = RefreshScheduler(
+        lambda catalog: setattr(app.state, 'catalog', catalog), REFRESH_INTERVAL
+    )
+    if REFRESH_INTERVAL > 0:
+        app.state.scheduler.start()
+    yield
+    app.state.scheduler.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configuração de CORS
 app.add_middleware(
@@ -39,16 +75,44 @@ def read_root(request: Request):
     })
 
 @app.get("/decklist")
-def read_item(ydke: Union[str, None] = None):
+def read_item(request: Request, ydke: Union[str, None] = None):
     if ydke:
         ydke = ydke.strip()
         ydke = ydke.replace(' ', '+').replace('/decklist?ydke=', '')
-        core = FrameDeck(ydke)
-        dados = core.get_dict_deck()
-        return JSONResponse(dados)
+        return JSONResponse(decklist_cached(
+            ydke, request.app.state.catalog, request.app.state.deck_cache
+        ))
     else:
         return JSONResponse('Parameter ydke= not insered', status_code=400)
 
+def decklist_cached(ydke: str, catalog: CardCatalog, cache: ResultCache) -> dict:
+    """
+    Retorna `get_dict_deck` do link usando o cache de resultados, indexado
+    pela versão do catálogo e pela impressão digital canônica do deck. Os
+    campos que dependem da ordem do link (`ydke` e `decklist`) são sempre
+    montados a partir do próprio link.
+    """
+    deck = CoreYDKE().read_url(ydke.replace('\n', '').replace('\t', ''))
+    if not isinstance(deck, dict):
+        return FrameDeck(ydke, catalog).get_dict_deck()
+
+    chave = CoreYDKE.fingerprint(deck)
+    dados = cache.get(catalog.version, chave)
+    if dados is None:
+        dados = FrameDeck(ydke, catalog).get_dict_deck()
+        cache.put(catalog.version, chave, dados)
+        return dados
+
+    return FrameDeck.rebind(dados, ydke, deck, catalog)
+
+@app.get('/decklist/cache')
+def read_decklist_cache(request: Request):
+    return JSONResponse(request.app.state.deck_cache.stats())
+
+@app.get('/refresh')
+def read_refresh_status(request: Request):
+    return JSONResponse(request.app.state.scheduler.status())
+
 @app.get('/card')
 def read_card(id: str):
     if id:
@@ -57,5 +121,91 @@ def read_card(id: str):
         return JSONResponse(card.info_card)
     return JSONResponse('Parameter "id" not insered', status_code=400)
 
+# Limite de cartas por requisição em lote
+MAX_CARDS = 1000
+# Códigos de carta são inteiros de 32 bits sem sinal (mesmo formato do ydke)
+MAX_COD = 2**32 - 1
+
+class CardsBody(BaseModel):
+    ids: List[int]
+
+def cards_response(ids: List[int]) -> JSONResponse:
+    """Resolve todos os códigos em uma consulta e responde por código, com ausentes explícitos."""
+    if not ids:
+        return JSONResponse('Parameter "ids" not insered', status_code=400)
+    if len(ids) > MAX_CARDS:
+        return JSONResponse(f'Parameter "ids" above limit of {MAX_CARDS}', status_code=400)
+    if not all(0 <= cod <= MAX_COD for cod in ids):
+        return JSONResponse(f'Parameter "ids" must be integers between 0 and {MAX_COD}', status_code=400)
+
+    cards = CardInfoOfficial.many(ids)
+    ordem = list(dict.fromkeys(ids))
+    return JSONResponse({
+        'cards': {str(cod): cards[cod].info_card for cod in ordem if cod in cards},
+        'missing': [cod for cod in ordem if cod not in cards]
+    })
+
+@app.get('/cards')
+def read_cards(ids: Union[str, None] = None):
+    if ids:
+        try:
+            cods = [int(i) for i in ids.replace(' ', '').split(',') if i]
+        except ValueError:
+            return JSONResponse('Parameter "ids" must be integers', status_code=400)
+        return cards_response(cods)
+    return JSONResponse('Parameter "ids" not insered', status_code=400)
+
+@app.post('/cards')
+def read_cards_post(body: CardsBody):
+    return cards_response(body.ids)
+
+# Limite de decks por requisição em lote
+MAX_DECKLISTS = 1000
+
+class DecklistsBody(BaseModel):
+    ydke: List[str]
+
+@app.post('/decklists')
+def read_decklists(request: Request, body: DecklistsBody):
+    if not body.ydke:
+        return JSONResponse('Parameter "ydke" not insered', status_code=400)
+    if len(body.ydke) > MAX_DECKLISTS:
+        return JSONResponse(f'Parameter "ydke" above limit of {MAX_DECKLISTS}', status_code=400)
+
+    resultados = FrameDeck.analyze_many(body.ydke, request.app.state.catalog)
+    linhas = (json.dumps(r, ensure_ascii=False) + '\n' for r in resultados)
+    return StreamingResponse(linhas, media_type='application/x-ndjson')
+
+# Limites da lista em texto: linhas e tamanho em bytes (UTF-8)
+MAX_LINHAS = 500
+MAX_TEXTO = 64 * 1024
+
+class DecklistTextBody(BaseModel):
+    text: str
+
+def decklist_parser(state) -> DecklistParser:
+    """Parser de listas em texto do catálogo atual, refeito quando o catálogo é trocado."""
+    catalog = state.catalog
+    atual = getattr(state, 'decklist_parser', None)
+    if atual is None or atual[0] != catalog.version:
+        atual = (catalog.version, DecklistParser.from_catalog(catalog))
+        state.decklist_parser = atual
+    return atual[1]
+
+@app.post('/decklist/text')
+def read_decklist_text(request: Request, body: DecklistTextBody):
+    if len(body.text.encode('utf-8')) > MAX_TEXTO:
+        return JSONResponse(f'Parameter "text" above limit of {MAX_TEXTO} bytes', status_code=400)
+    if len(body.text.splitlines()) > MAX_LINHAS:
+        return JSONResponse(f'Parameter "text" above limit of {MAX_LINHAS} lines', status_code=400)
+
+    resultado = decklist_parser(request.app.state).parse(body.text)
+    if not any(resultado.deck.values()):
+        return JSONResponse('Parameter "text" without recognized cards', status_code=400)
+
+    ydke = CoreYDKE().to_url(resultado.deck)
+    dados = decklist_cached(ydke, request.app.state.catalog, request.app.state.deck_cache)
+    return JSONResponse({**dados, 'unknown': resultado.unknown, 'fuzzy': resultado.fuzzy})
+
 if __name__ == '__main__':
     uvicorn.run(uvicorn.run("app:app", host="127.0.0.1", port=8000, reload=True))
@@ -3,14 +3,20 @@
 #
 
 import os
-import shutil
+import json
 import asyncio
-import requests
 from typing import Union
 
 import pandas as pd         # typing: ignore
 from pandas import DataFrame
 
+try:
+    from client import HttpClient, AsyncHttpClient
+    from manifest import SourceManifest, grava_csv_atomico, remove_dir_atomico
+except:
+    from src.client import HttpClient, AsyncHttpClient
+    from src.manifest import SourceManifest, grava_csv_atomico, remove_dir_atomico
+
 
 class BanSheetWeb:
     """
@@ -63,8 +69,8 @@ class BanSheetWeb:
         { 'error': 400 }
         ```
         """
-        d = requests.get(self.__END_POINT) if url == None else requests.get(str(url))
-        return dict(d.json()) if d.status_code == 200 else { 'error' : 400 }
+        data = HttpClient.shared().get_json(self.__END_POINT if url == None else str(url))
+        return data if data is not None else { 'error' : 400 }
 
     def clean_frame(self, data: dict) -> pd.DataFrame:
         """
@@ -83,7 +89,9 @@ class BanSheetWeb:
 
     def save(self, data: pd.DataFrame) -> bool:
         """
-        Cria o diretório `/var/` se não existir e salva o DataFrame como um arquivo CSV.
+        Cria o diretório `/var/` se não existir e salva o DataFrame como um arquivo CSV
+        de forma atômica, junto da versão colunar binária (`colunar`), e o registra
+        no manifesto do diretório (`ArtifactManifest`).
 
         Args:
             data (DataFrame): DataFrame que será salvo como CSV, com separador `|`.
@@ -91,13 +99,9 @@ class BanSheetWeb:
         Returns:
             bool: Retorna `True` se o arquivo for criado com sucesso, ou `False` em caso de falha.
         """
-        var_dir = os.path.join(os.path.dirname(__file__), 'var')
-        if not os.path.exists(var_dir):
-            os.mkdir(var_dir)
-
         data.columns = data.columns.str.replace(' ', '_').str.lower()
-        download = os.path.join(var_dir, f'{self.__SHEET}.csv')
-        data.to_csv(download, sep='|', index=False)
+        download = os.path.join(os.path.dirname(__file__), 'var', f'{self.__SHEET}.csv')
+        grava_csv_atomico(data, download, '|')
         return os.path.exists(download)
 
     def download_banlist(self) -> bool:
@@ -115,18 +119,14 @@ class BanSheetWeb:
     def var_delete(self) -> bool:
         """
         Deleta o diretório 'var' com todo o seu conteúdo,
-        localizado no mesmo diretório deste arquivo.
+        localizado no mesmo diretório deste arquivo. O diretório é renomeado
+        antes de ser apagado, leitores nunca veem parte dos arquivos.
 
         Returns:
             bool: `True` se o diretório foi deletado com sucesso,
             `False` se o diretório não existir.
         """
-        atual_dir = os.path.dirname(__file__)
-        dir_var = str(os.path.join(atual_dir, 'var'))
-        if os.path.exists(dir_var) and os.path.isdir(dir_var):
-            shutil.rmtree(dir_var)
-            return True
-        return False
+        return remove_dir_atomico(os.path.join(os.path.dirname(__file__), 'var'))
 
 class BanSheetWebAsync:
     """
@@ -154,6 +154,8 @@ class BanSheetWebAsync:
     async def fetch_data(self, links: list[str]) -> list[dict]:
         """
         Requisita uma série de links e retorna uma lista com as respostas.
+        As requisições são feitas em paralelo pelo `AsyncHttpClient`, com
+        limite por host e novas tentativas.
 
         Args:
             links (list[str]): Lista com os links de requisição
@@ -162,10 +164,9 @@ class BanSheetWebAsync:
         Returns:
             list[dict]: Lista com as respostas em formato `dict` para cada link.
         """
-        function_ = self.__BAN_SHEET_WEB__.request_frame
-        tasks = [asyncio.to_thread(function_, l) for l in links]
-        result = await asyncio.gather(*tasks)
-        return result
+        async with AsyncHttpClient() as client:
+            result = await asyncio.gather(*(client.get_json(l) for l in links))
+        return [r if r is not None else { 'error' : 400 } for r in result]
 
     async def mount_frame(self, sheet_dict: list[dict]) -> list[DataFrame]:
         """
@@ -184,7 +185,9 @@ class BanSheetWebAsync:
 
     async def write_frame(self, frames: list[DataFrame], sheet_names: list[str]) -> list[str]:
         """
-        Cria o diretório `/var/` se não existir e salva os DataFrames como arquivos CSV.\n
+        Cria o diretório `/var/` se não existir e salva os DataFrames como arquivos CSV
+        de forma atômica e na versão colunar binária, registrando cada um no
+        manifesto do diretório.\n
         Os nomes dos arquivos serão passados na lista `sheet_names`.
 
         Args:
@@ -196,21 +199,20 @@ class BanSheetWebAsync:
             dos arquivos CSV salvos no diretório `/var/`.
         """
         var_dir = str(os.path.join(os.path.dirname(__file__), 'var'))
-        if not os.path.exists(var_dir):
-            os.mkdir(var_dir)
-
         stack_paths = []
         for f, name in zip(frames, sheet_names):
             f.columns = f.columns.str.replace(' ', '_').str.lower()
             download_path = str(os.path.join(var_dir, f"{name}.csv"))
             stack_paths.append(download_path)
-            f.to_csv(download_path, sep='|', index=False)
+            await asyncio.to_thread(grava_csv_atomico, f, download_path, '|')
         return stack_paths
 
     async def creat_files(self, sheets: list[str]) -> bool:
         """
         Requisita os dados de cada folha do Google Sheets e cria uma pasta `/var/`.\n
-        Retorna `True` se todos os arquivos forem baixados com sucesso.
+        Retorna `True` se todos os arquivos forem baixados com sucesso. As folhas
+        que não mudaram desde o último download (`SourceManifest`) não são lidas
+        nem gravadas de novo.
 
         Args:
             sheets (list[str]): Lista com os nomes de cada folha do Google Sheets.\n
@@ -220,10 +222,22 @@ class BanSheetWebAsync:
             bool: Retorna `True` se todos os arquivos forem n\
             baixados e salvos corretamente, `False` caso contrário.
         """
-        lista_dicts = await self.fetch_data(self.__mount_link__(sheets))
-        lista_dados = await self.mount_frame(lista_dicts)
-        paths_files = await self.write_frame(lista_dados, sheets)
-        return all(map(lambda x: os.path.exists(x), paths_files))
+        var_dir = str(os.path.join(os.path.dirname(__file__), 'var'))
+        fontes = {
+            f'ban:{s}': (l, os.path.join(var_dir, f'{s}.csv'))
+            for s, l in zip(sheets, self.__mount_link__(sheets))
+        }
+
+        async def grava(nome: str, conteudo: bytes) -> None:
+            frames = await self.mount_frame([dict(json.loads(conteudo))])
+            await self.write_frame(frames, [nome.split(':', 1)[1]])
+
+        try:
+            async with AsyncHttpClient() as client:
+                await SourceManifest().sync_async(client, fontes, grava)
+        except ConnectionError:
+            return False
+        return all(map(lambda x: os.path.exists(os.path.join(var_dir, f'{x}.csv')), sheets))
 
     def async_download_run(self, f: list[str]) -> bool:
         """
@@ -1,22 +1,509 @@
 import os
 import json
+import queue
+import hashlib
 import sqlite3
+import tempfile
+import threading
 from pprint import pprint
-from typing import List, Dict, Union
+from contextlib import contextmanager
+from typing import Iterator, Iterable, List, Dict, Union
 from datetime import datetime
+from urllib.request import pathname2url
 
-import requests
-import numpy as np
 import pandas as pd
 
 try:
+    import dump
     from card import CardGame, CardGameAsync
+    from client import HttpClient
+    from manifest import SourceManifest
+    from catalog import ler_cache
 except:
+    from src import dump
     from src.card import CardGame, CardGameAsync
-    
+    from src.client import HttpClient
+    from src.manifest import SourceManifest
+    from src.catalog import ler_cache
+
+
+COLUNAS_CARDS: List[str] = [
+    'id', 'name', 'desc', 'race', 'type', 'frame_type', 'class_card',
+    'attack', 'defense', 'arquetype_official', 'arquetype_mc', 'attribute',
+    'level', 'type_set', 'url_target', 'name_ygopro', 'cardmarket_price',
+    'tcgplayer_price', 'ebay_price', 'amazon_price', 'coolstuffinc_price',
+    'id_sets', 'image_url', 'image_url_small', 'image_url_cropped'
+]
+
+URL_CARDINFO: str = 'https://db.ygoprodeck.com/api/v7/cardinfo.php'
+
+# Linhas gravadas por executemany em cada lote da sincronizacao
+LOTE_SYNC: int = 1000
+
+# Tipos SQLite das colunas nao textuais da tabela `cards`
+TIPOS_CARDS: Dict[str, str] = {
+    'id': 'INTEGER PRIMARY KEY',
+    'attack': 'INTEGER',
+    'defense': 'INTEGER',
+    'level': 'INTEGER',
+    'cardmarket_price': 'REAL',
+    'tcgplayer_price': 'REAL',
+    'ebay_price': 'REAL',
+    'amazon_price': 'REAL',
+    'coolstuffinc_price': 'REAL'
+}
+
+
+def mapa_arquetipos(cards_complet: Union[pd.DataFrame, None]) -> Dict[int, str]:
+    """
+    Monta o dicionário `cod -> arquetype` da planilha completa, mantendo a
+    primeira ocorrência de cada código, para o join com o dump oficial.
+
+    Args:
+        cards_complet (Union[DataFrame, None]): Frame com `cod` e `arquetype`.
+
+    Returns:
+        Dict[int, str]: Arquétipo da planilha para cada código.
+    """
+    if cards_complet is None:
+        return {}
+    unicos = cards_complet.drop_duplicates('cod', keep='first')
+    return dict(zip(unicos['cod'].astype(int).tolist(), unicos['arquetype'].tolist()))
+
+
+def iter_card_rows(cards_off: Iterable[Dict], arquetipos: Dict[int, str]) -> Iterator[Dict]:
+    """
+    Achata as cartas do dump oficial em linhas da tabela `cards`, uma por
+    imagem (`card_images`), sob demanda. O arquétipo da planilha vem de uma
+    consulta ao dicionário, então o custo é linear no número de cartas.
+
+    Args:
+        cards_off (Iterable[Dict]): Cartas do dump do ygoprodeck.
+        arquetipos (Dict[int, str]): Saída de `mapa_arquetipos`.
+
+    Yields:
+        Dict: Linha com as colunas de `COLUNAS_CARDS`.
+    """
+    for i in cards_off:
+        i = dict(i)
+        id = i.get('id')
+        url_target = i.get('ygoprodeck_url')
+        type_set = i.get('typeline')
+        card_prices = (i.get('card_prices') or [None])[0]
+        if not isinstance(card_prices, dict):
+            card_prices = {}
+
+        data = {
+            'id': id,
+            'name': i.get('name'),
+            'desc': i.get('desc'),
+            'race': i.get('race'),
+            'type': i.get('type'),
+            'frame_type': i.get('frameType'),
+            'class_card': i.get('humanReadableCardType'),
+            'attack': i.get('atk'),
+            'defense': i.get('def'),
+            'arquetype_official': i.get('archetype'),
+            'arquetype_mc': arquetipos.get(id, ''),
+            'attribute': i.get('attribute'),
+            'level': i.get('level'),
+            'type_set': ' | '.join(type_set) if isinstance(type_set, list) else None,
+            'url_target': url_target,
+            'name_ygopro': str(url_target).replace('https://ygoprodeck.com/card/', ''),
+            'cardmarket_price': card_prices.get('cardmarket_price'),
+            'tcgplayer_price': card_prices.get('tcgplayer_price'),
+            'ebay_price': card_prices.get('ebay_price'),
+            'amazon_price': card_prices.get('amazon_price'),
+            'coolstuffinc_price': card_prices.get('coolstuffinc_price'),
+            'id_sets': None,
+            'image_url': None,
+            'image_url_small': None,
+            'image_url_cropped': None
+        }
+
+        card_images = i.get('card_images')
+        if not card_images:
+            continue
+        if len(card_images) > 1:
+            data['id_sets'] = '|'.join(str(d['id']) for d in card_images).strip()
+            for d in card_images:
+                new_data = data.copy()
+                new_data['id'] = d['id']
+                new_data['image_url'] = d['image_url']
+                new_data['image_url_small'] = d['image_url_small']
+                new_data['image_url_cropped'] = d['image_url_cropped']
+                yield new_data
+        else:
+            dicio = card_images[0]
+            data['id_sets'] = str(data['id'])
+            data['image_url'] = dicio['image_url']
+            data['image_url_small'] = dicio['image_url_small']
+            data['image_url_cropped'] = dicio['image_url_cropped']
+            yield data
+
+
+def _hash_linha(valores: tuple) -> str:
+    """Hash estável de uma linha da tabela `cards`."""
+    texto = json.dumps(valores, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _tuplas_cards(linhas: Union[pd.DataFrame, Iterable[Dict]]) -> Iterator[tuple]:
+    """Linhas na ordem de `COLUNAS_CARDS`, com valores ausentes como None."""
+    if isinstance(linhas, pd.DataFrame):
+        df = linhas[COLUNAS_CARDS]
+        yield from df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        return
+    for linha in linhas:
+        yield tuple(
+            None if isinstance(v, float) and v != v else v
+            for v in (linha.get(c) for c in COLUNAS_CARDS)
+        )
+
+
+def sincroniza_cards(
+    conx: sqlite3.Connection, linhas: Union[pd.DataFrame, Iterable[Dict]],
+    meta: Union[Dict[str, str], None] = None
+) -> Dict[str, int]:
+    """
+    Atualiza a tabela `cards` de forma incremental a partir das linhas montadas.
+
+    Cada linha é resumida por um hash guardado em `cards_hash`; só as cartas
+    novas, alteradas ou removidas são escritas, tudo em uma única transação,
+    então os leitores nunca veem a tabela vazia ou pela metade. Se alguma
+    linha mudou, a versão do catálogo em `catalog_meta` é incrementada.
+
+    As linhas são consumidas sob demanda e gravadas em lotes de `LOTE_SYNC`,
+    então um gerador (como `iter_card_rows`) nunca é materializado inteiro.
+
+    Args:
+        conx (sqlite3.Connection): Conexão de escrita ao banco.
+        linhas (Union[DataFrame, Iterable[Dict]]): Linhas com as colunas de
+        `COLUNAS_CARDS`; códigos repetidos mantêm a primeira ocorrência.
+        meta (Union[Dict[str, str], None]): Chaves extras gravadas em
+        `catalog_meta` na mesma transação.
+
+    Returns:
+        Dict[str, int]: Quantidade de cartas recebidas, inseridas,
+        atualizadas e removidas, e a versão do catálogo após a sincronização.
+    """
+    colunas = ', '.join(f'"{c}" {TIPOS_CARDS.get(c, "TEXT")}' for c in COLUNAS_CARDS)
+    nomes = ', '.join(f'"{c}"' for c in COLUNAS_CARDS)
+    marcas = ', '.join('?' for _ in COLUNAS_CARDS)
+    updates = ', '.join(f'"{c}" = excluded."{c}"' for c in COLUNAS_CARDS[1:])
+
+    def grava(lote: List[tuple]) -> None:
+        conx.executemany(
+            f'INSERT INTO cards ({nomes}) VALUES ({marcas}) ON CONFLICT(id) DO UPDATE SET {updates}',
+            (row for row, _ in lote)
+        )
+        conx.executemany(
+            'INSERT OR REPLACE INTO cards_hash (id, hash) VALUES (?, ?)',
+            ((row[0], hash_) for row, hash_ in lote)
+        )
+        lote.clear()
+
+    conx.execute('BEGIN IMMEDIATE')
+    try:
+        atuais = [c[1] for c in conx.execute('PRAGMA table_info(cards)').fetchall()]
+        if atuais and atuais != COLUNAS_CARDS:
+            # Esquema antigo: recria a tabela dentro da mesma transacao
+            conx.execute('DROP TABLE cards')
+            conx.execute('DROP TABLE IF EXISTS cards_hash')
+        conx.execute(f'CREATE TABLE IF NOT EXISTS cards ({colunas})')
+        conx.execute('CREATE TABLE IF NOT EXISTS cards_hash (id INTEGER PRIMARY KEY, hash TEXT)')
+        conx.execute('CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value TEXT)')
+
+        # Linhas sem hash (banco gravado por to_sql) contam como alteradas
+        anteriores = dict(conx.execute(
+            'SELECT c.id, h.hash FROM cards c LEFT JOIN cards_hash h ON h.id = c.id'
+        ).fetchall())
+        vistos = set()
+        novos = alterados = 0
+        lote: List[tuple] = []
+        for row in _tuplas_cards(linhas):
+            id = int(row[0])
+            if id in vistos:
+                continue
+            vistos.add(id)
+            row = (id,) + row[1:]
+            hash_ = _hash_linha(row)
+            if id not in anteriores:
+                novos += 1
+            elif anteriores[id] != hash_:
+                alterados += 1
+            else:
+                continue
+            lote.append((row, hash_))
+            if len(lote) >= LOTE_SYNC:
+                grava(lote)
+        grava(lote)
+
+        removidos = [(id,) for id in anteriores if id not in vistos]
+        conx.executemany('DELETE FROM cards WHERE id = ?', removidos)
+        conx.executemany('DELETE FROM cards_hash WHERE id = ?', removidos)
+
+        row = conx.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+        versao = int(row[0]) if row else 0
+        if novos or alterados or removidos or row is None:
+            versao += 1
+            conx.executemany(
+                'INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)',
+                [('version', str(versao)), ('updated_at', datetime.now().isoformat())]
+            )
+        if meta:
+            conx.executemany(
+                'INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)', meta.items()
+            )
+        conx.execute('COMMIT')
+    except BaseException:
+        conx.execute('ROLLBACK')
+        raise
+
+    return {
+        'rows': len(vistos),
+        'inserted': novos,
+        'updated': alterados,
+        'deleted': len(removidos),
+        'version': versao
+    }
+
+
+def le_meta(base: str, key: str) -> Union[str, None]:
+    """Valor de `catalog_meta` no banco, ou None se o banco ou a chave não existirem."""
+    if not os.path.exists(base):
+        return None
+    conx = sqlite3.connect(f'file:{pathname2url(os.path.abspath(base))}?mode=ro', uri=True)
+    try:
+        row = conx.execute('SELECT value FROM catalog_meta WHERE key = ?', (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conx.close()
+    return row[0] if row else None
+
+
+def reconstroi_banco(
+    base: str, linhas: Union[pd.DataFrame, Iterable[Dict]],
+    meta: Union[Dict[str, str], None] = None
+) -> Dict[str, int]:
+    """
+    Reconstrói o banco em um arquivo temporário e o troca pelo atual com um
+    rename atômico, assim os leitores nunca encontram o banco ausente ou pela
+    metade.
+
+    O temporário parte de uma cópia do banco atual (API de backup do SQLite),
+    recebe a sincronização incremental de `sincroniza_cards` e só é promovido
+    se passar no `integrity_check` e tiver uma linha por carta recebida.
+
+    Args:
+        base (str): Caminho do banco `cardgame.db`.
+        linhas (Union[DataFrame, Iterable[Dict]]): Linhas com as colunas de
+        `COLUNAS_CARDS`, consumidas sob demanda.
+        meta (Union[Dict[str, str], None]): Chaves extras de `catalog_meta`.
+
+    Returns:
+        Dict[str, int]: Resumo de `sincroniza_cards`.
+
+    Raises:
+        sqlite3.DatabaseError: Se o banco reconstruído não passar na validação,
+        o banco atual é mantido.
+    """
+    diretorio = os.path.dirname(os.path.abspath(base))
+    fd, tmp = tempfile.mkstemp(prefix='.cardgame-', suffix='.db', dir=diretorio)
+    os.close(fd)
+    try:
+        conx = sqlite3.connect(tmp, isolation_level=None)
+        try:
+            if os.path.exists(base):
+                atual = sqlite3.connect(base)
+                try:
+                    atual.backup(conx)
+                finally:
+                    atual.close()
+            # O arquivo promovido e somente leitura, sem -wal ao lado
+            conx.execute('PRAGMA journal_mode = DELETE')
+            resumo = sincroniza_cards(conx, linhas, meta)
+
+            integridade = conx.execute('PRAGMA integrity_check').fetchone()[0]
+            total = conx.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+            esperado = resumo['rows']
+            if integridade != 'ok':
+                raise sqlite3.DatabaseError(f'integrity_check falhou: {integridade}')
+            if total != esperado or total == 0:
+                raise sqlite3.DatabaseError(
+                    f'Banco reconstruído com {total} cartas, esperado {esperado}'
+                )
+        finally:
+            conx.close()
+
+        with open(tmp, 'rb') as file:
+            os.fsync(file.fileno())
+        os.replace(tmp, base)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    # Restos do modo WAL do arquivo anterior nao pertencem ao banco novo
+    for resto in (f'{base}-wal', f'{base}-shm'):
+        if os.path.exists(resto):
+            os.remove(resto)
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(diretorio, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    return resumo
+
+
+class CardDatabasePool:
+    """
+    Pool de conexões somente leitura ao banco `data/cardgame.db`.
+
+    As conexões são abertas com `mode=ro`, `query_only` e `mmap_size`, e
+    reaproveitadas entre requisições. As colunas da tabela `cards` são lidas
+    uma única vez e as consultas são parametrizadas, assim o sqlite3 reutiliza
+    os comandos preparados do próprio cache de cada conexão.
+
+    O banco é trocado inteiro por `reconstroi_banco` (rename atômico). Cada
+    conexão guarda o inode do arquivo em que foi aberta; quando ele muda, as
+    conexões antigas terminam a consulta em andamento e são fechadas, e as
+    próximas já abrem o arquivo novo.
+
+    Args:
+        path (Union[str, None]): Caminho do banco, padrão `data/cardgame.db`.
+        size (int): Máximo de conexões ociosas mantidas no pool.
+    """
+    MMAP_SIZE: int = 256 * 1024 * 1024
+    # Limite seguro de parametros por consulta em versoes antigas do SQLite
+    LOTE_IN: int = 500
+
+    __SHARED: Union['CardDatabasePool', None] = None
+    __SHARED_LOCK = threading.Lock()
+
+    def __init__(self, path: Union[str, None] = None, size: int = 8) -> None:
+        if path is None:
+            path = os.path.join(os.path.dirname(__file__), 'data', 'cardgame.db')
+        self.path: str = os.path.abspath(path)
+        self.__LIVRES: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self.__COLUNAS: Union[List[str], None] = None
+        self.__INODE: Union[tuple, None] = None
+
+    @classmethod
+    def shared(cls) -> 'CardDatabasePool':
+        """Retorna o pool compartilhado pelo processo, criado no primeiro uso."""
+        if cls.__SHARED is None:
+            with cls.__SHARED_LOCK:
+                if cls.__SHARED is None:
+                    cls.__SHARED = cls()
+        return cls.__SHARED
+
+    def __abre_conexao_(self) -> sqlite3.Connection:
+        """Abre uma nova conexão somente leitura com os pragmas de leitura."""
+        uri = f'file:{pathname2url(self.path)}?mode=ro'
+        conx = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conx.execute('PRAGMA query_only = ON')
+        conx.execute(f'PRAGMA mmap_size = {self.MMAP_SIZE}')
+        return conx
+
+    def __inode_(self) -> Union[tuple, None]:
+        """Identifica o arquivo atual do banco, que muda a cada troca atômica."""
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (info.st_dev, info.st_ino)
+
+    def __confere_troca_(self) -> Union[tuple, None]:
+        """Descarta as conexões ociosas se o arquivo do banco foi trocado."""
+        inode = self.__inode_()
+        if inode != self.__INODE:
+            self.__INODE = inode
+            self.__COLUNAS = None
+            self.close()
+        return inode
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool, devolvendo-a ao final do bloco."""
+        inode = self.__confere_troca_()
+        try:
+            conx, origem = self.__LIVRES.get_nowait()
+            if origem != inode:
+                conx.close()
+                raise queue.Empty
+        except queue.Empty:
+            conx, origem = self.__abre_conexao_(), inode
+        try:
+            yield conx
+        finally:
+            if origem != self.__INODE:
+                conx.close()
+            else:
+                try:
+                    self.__LIVRES.put_nowait((conx, origem))
+                except queue.Full:
+                    conx.close()
+
+    def close(self) -> None:
+        """Fecha todas as conexões ociosas do pool."""
+        while True:
+            try:
+                self.__LIVRES.get_nowait()[0].close()
+            except queue.Empty:
+                break
+
+    @property
+    def columns(self) -> List[str]:
+        """Colunas da tabela `cards`, lidas uma única vez."""
+        if self.__COLUNAS is None:
+            with self.connection() as conx:
+                info = conx.execute('PRAGMA table_info(cards)').fetchall()
+            self.__COLUNAS = [coluna[1] for coluna in info]
+        return self.__COLUNAS
+
+    def catalog_version(self) -> int:
+        """Versão do catálogo gravada por `sincroniza_cards`, 0 se ausente."""
+        with self.connection() as conx:
+            try:
+                row = conx.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+            except sqlite3.OperationalError:
+                return 0
+        return int(row[0]) if row else 0
+
+    def fetch_one(self, cod: int) -> Dict:
+        """Retorna a carta do código como dicionário, ou `{}` se não existir."""
+        columns = self.columns
+        with self.connection() as conx:
+            row = conx.execute('SELECT * FROM cards WHERE id = ?', (int(cod),)).fetchone()
+        return dict(zip(columns, row)) if row else {}
+
+    def fetch_many(self, cods: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Busca várias cartas com consultas `IN` em lotes de `LOTE_IN` códigos.
+
+        Returns:
+            Dict[int, Dict]: Cartas encontradas indexadas pelo código,
+            códigos inexistentes ficam de fora.
+        """
+        ids = list(dict.fromkeys(int(c) for c in cods))
+        columns = self.columns
+        cards: Dict[int, Dict] = {}
+        with self.connection() as conx:
+            for i in range(0, len(ids), self.LOTE_IN):
+                lote = ids[i:i + self.LOTE_IN]
+                marcadores = ','.join('?' * len(lote))
+                query = f'SELECT * FROM cards WHERE id IN ({marcadores})'
+                for row in conx.execute(query, lote):
+                    card = dict(zip(columns, row))
+                    cards[int(card['id'])] = card
+        return cards
+
 
 class CardInfoOfficial:
-    def __init__(self, cod: Union[int, None] = None):
+    def __init__(self, cod: Union[int, None] = None, info_card: Union[Dict, None] = None):
         self.cod: Union[int, None] = cod
         self.id: Union[int, None] = None
         self.name: Union[str, None] = None
@@ -44,7 +531,7 @@ class CardInfoOfficial:
         self.image_url_small: Union[str, None] = None
         self.image_url_cropped: Union[str, None] = None
         
-        self.info_card = self.__data_card_query()
+        self.info_card = self.__data_card_query() if info_card is None else info_card
         if self.info_card:
             for key, value in self.info_card.items():
                 if hasattr(self, key):
@@ -52,19 +539,24 @@ class CardInfoOfficial:
 
     def __data_card_query(self) -> Dict:
         """Query letter no dice bank cardgame.db e obtem as dictionary."""
-        SRC = os.path.dirname(__file__)
-        DATA = os.path.join(SRC, 'data')
-        FILE_DB = os.path.join(DATA, 'cardgame.db')
-        conx = sqlite3.connect(FILE_DB)
-        cur = conx.cursor()
-        query = f"""SELECT * FROM cards WHERE id = '{self.cod}'"""
-        cur.execute(query)
-        if datas := cur.fetchall():
-            query = f"""PRAGMA table_info(cards)"""
-            cur.execute(query)
-            columns = [coluna[1] for coluna in cur.fetchall()]
-            return dict(zip(columns, datas[0]))
-        return {}
+        if self.cod is None:
+            return {}
+        return CardDatabasePool.shared().fetch_one(self.cod)
+
+    @classmethod
+    def many(cls, ids: Iterable[int]) -> Dict[int, 'CardInfoOfficial']:
+        """
+        Busca várias cartas do `cardgame.db` em uma única consulta `IN`.
+
+        Args:
+            ids (Iterable[int]): Códigos das cartas.
+
+        Returns:
+            Dict[int, CardInfoOfficial]: Cartas encontradas indexadas pelo
+            código, códigos inexistentes ficam de fora.
+        """
+        cards = CardDatabasePool.shared().fetch_many(ids)
+        return {cod: cls(cod, info) for cod, info in cards.items()}
 
 class CardBaseInfo:
     def __init__(self):
@@ -73,6 +565,8 @@ class CardBaseInfo:
         self.directory_json = os.path.join(self.SRC, 'json')
         self.path_file_data = os.path.join(self.directory_data, 'date.txt')
         self.date: str = str(datetime.now().strftime(r'%d/%m/%Y'))
+        self.__FORCAR: bool = False
+        self.__PLANILHA: bool = True
 
         if not os.path.exists(self.path_file_data):
             with open(self.path_file_data, 'w', encoding='utf-8') as file:
@@ -83,60 +577,101 @@ class CardBaseInfo:
 
         if not self.directory_json:
             os.mkdir(self.directory_json)
-        
-        self.__update_db()
 
-    def __load_api(self) -> np.ndarray:
-        file_path = os.path.join(self.directory_json, 'data_cards_official.json')
-        if os.path.exists(self.path_file_data):
-            if os.path.exists(file_path):
-                with open(self.path_file_data, 'r', encoding='utf-8') as file:
-                    content = file.read().strip()
-                
-                data_fornecida = datetime.strptime(content, r'%d/%m/%Y')
-                data_atual = datetime.now()
-                diferenca = data_atual - data_fornecida
-                dias_passados = diferenca.days
-                if dias_passados > 10:
-                    r = requests.get('https://db.ygoprodeck.com/api/v7/cardinfo.php')
-                    if r.status_code == 200:
-                        data = r.json()
-                        data = data['data']
-
-                    with open(file_path, 'w', encoding='utf-8') as file:
-                        json.dump(data, file, ensure_ascii=False, indent=4)
-                    
-                    with open(self.path_file_data, 'w', encoding='utf-8') as file:
-                        file.write(str(data_atual.strftime(r'%d/%m/%Y')))
-                else:
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        data = json.load(file)
-            else:
-                r = requests.get('https://db.ygoprodeck.com/api/v7/cardinfo.php')
-                if r.status_code == 200:
-                    data = r.json()
-                    data = data['data']
+    def atualizar(self, forcar: bool = False, planilha: bool = True) -> bool:
+        """
+        Atualiza o dump oficial e o banco `data/cardgame.db`. As fontes só são
+        consultadas passado o prazo de 10 dias, ou sempre com `forcar`; como
+        as consultas são condicionais (`SourceManifest`), fontes inalteradas
+        não são baixadas nem reconstruídas.
 
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    json.dump(data, file, ensure_ascii=False, indent=4)
+        Args:
+            forcar (bool): Consulta as fontes mesmo dentro do prazo.
+            planilha (bool): Consulta também a folha `complet`; False quando
+            ela acabou de ser baixada (`DependencyDownloader`).
 
-        return np.array(data)
+        Returns:
+            bool: True se o dump mudou ou o banco foi reconstruído.
+        """
+        self.__FORCAR = forcar
+        self.__PLANILHA = planilha
+        return self.__update_db()
 
-    def __load_card_game_api(self) -> pd.DataFrame:
+    def __expirado(self) -> bool:
+        if self.__FORCAR:
+            return True
         with open(self.path_file_data, 'r', encoding='utf-8') as file:
             content = file.read().strip()
-        
+
         data_fornecida = datetime.strptime(content, r'%d/%m/%Y')
-        data_atual = datetime.now()
-        diferenca = data_atual - data_fornecida
-        dias_passados = diferenca.days
-        if dias_passados > 10:
+        return (datetime.now() - data_fornecida).days > 10
+
+    def __assinatura_complet(self) -> str:
+        complet = os.path.join(self.SRC, 'cache', 'complet.csv')
+        if not os.path.exists(complet):
+            return ''
+        info = os.stat(complet)
+        return f'{info.st_size}:{info.st_mtime_ns}'
+
+    def __load_api(self) -> Iterator[Dict]:
+        file_path = os.path.join(self.directory_json, 'data_cards_official.json')
+        if os.path.exists(file_path) and not self.__expirado():
+            return dump.iter_file(file_path)
+
+        bruto = self.__download_api(file_path)
+        if bruto is None:
+            return dump.iter_file(file_path)
+        self.__DUMP_MUDOU = True
+        return self.__grava_dump(file_path, bruto)
+
+    def __download_api(self, file_path: str) -> Union[str, None]:
+        """
+        Consulta `cardinfo.php` com os cabeçalhos condicionais do manifesto e
+        baixa a resposta em blocos para um arquivo temporário, calculando o
+        sha256. Retorna o caminho do temporário, ou None se o dump não mudou.
+        """
+        headers = self.__MANIFEST.conditional_headers('cardinfo', file_path)
+        with HttpClient.shared().get(URL_CARDINFO, stream=True, headers=headers) as r:
+            if r.status_code == 304:
+                self.__MANIFEST.record('cardinfo', URL_CARDINFO, r.headers, None)
+                return None
+            r.raise_for_status()
+
+            hash_ = hashlib.sha256()
+            fd, bruto = tempfile.mkstemp(prefix='.cardinfo-', suffix='.json', dir=self.directory_json)
+            with os.fdopen(fd, 'wb') as file:
+                for bloco in r.iter_content(dump.TAMANHO_BLOCO):
+                    hash_.update(bloco)
+                    file.write(bloco)
+
+        sha256 = hash_.hexdigest()
+        inalterado = self.__MANIFEST.is_unchanged('cardinfo', sha256, file_path)
+        self.__MANIFEST.record('cardinfo', URL_CARDINFO, r.headers, sha256)
+        if inalterado:
+            os.remove(bruto)
+            return None
+        return bruto
+
+    def __grava_dump(self, file_path: str, bruto: str) -> Iterator[Dict]:
+        """
+        Repassa as cartas da resposta baixada uma a uma, gravando ao mesmo
+        tempo o dump compacto em `file_path`.
+        """
+        try:
+            yield from dump.write_file(file_path, dump.iter_file(bruto))
+        finally:
+            os.remove(bruto)
+
+    def __download_card_game_api(self) -> None:
+        complet = os.path.join(self.SRC, 'cache', 'complet.csv')
+        if self.__PLANILHA and self.__expirado():
             card = CardGame()
-            complet = card.request_frame()
-            frame = card.mount_frame(complet)
-            frame = frame[['cod', 'arquetype']].copy()
-            frame['cod'] = frame['cod'].astype(int)
-            return frame
+            url = card.get_end_point()['point']
+            status, conteudo = self.__MANIFEST.fetch('card:complet', url, artefato=complet)
+            if status == 200:
+                frame = card.mount_frame(json.loads(conteudo))
+                frame.columns = frame.columns.str.replace(' ', '_').str.lower()
+                card.save(frame, 'complet')
 
         if not os.path.exists(os.path.join(self.SRC, 'cache')):
             card_game_async = CardGameAsync()
@@ -145,131 +680,44 @@ class CardBaseInfo:
                 print('Async operation success!!!')
             else:
                 print('Async operation not success!!!')
-        
-        complet = os.path.join(self.SRC, 'cache', 'complet.csv')
-        if os.path.exists(complet):
-            df = pd.read_csv(complet, sep=';', encoding='utf-8', skipinitialspace=True)
-            df = df[['cod', 'arquetype']].copy()
+
+    def __load_card_game_api(self) -> Union[pd.DataFrame, None]:
+        # Leitura memorizada por sha256 (`ler_artefato`): o complet.csv
+        # recem-gravado pelo downloader nao e lido de novo do disco
+        if os.path.exists(os.path.join(self.SRC, 'cache', 'complet.csv')):
+            df = ler_cache('complet.csv')[['cod', 'arquetype']].copy()
             df['cod'] = df['cod'].astype(int)
             return df
+        return None
+
+    def __unique_data(self, cards_off: Iterable[Dict], cards_complet: Union[pd.DataFrame, None]) -> Iterator[Dict]:
+        return iter_card_rows(cards_off, mapa_arquetipos(cards_complet))
+
+    def __update_db(self) -> bool:
+        self.__MANIFEST = SourceManifest()
+        self.__DUMP_MUDOU = False
+        verificado = self.__expirado()
 
-    def __remove_db(self) -> None:
-        src = os.path.dirname(__file__)
-        directory_data = os.path.join(src, 'data')
-        base = os.path.join(directory_data, 'cardgame.db')
-        if os.path.exists(base):
-            os.remove(base)
-
-    def __unique_data(self, cards_off: np.ndarray, cards_complet: pd.DataFrame) -> np.ndarray:
-        card = []
-        for i in cards_off:
-            i = dict(i)
-            id = i.get('id')
-            name = i.get('name')
-            desc = i.get('desc')
-            race = i.get('race')
-            type_ = i.get('type')
-            frame_type = i.get('frameType')
-            class_card = i.get('humanReadableCardType')
-            attack = i.get('atk')
-            defense = i.get('def')
-            arquetype_official = i.get('archetype')
-            arquetype_mc = cards_complet.loc[cards_complet['cod'].isin([id])]
-            arquetype_mc = arquetype_mc['arquetype'].values.tolist()
-            arquetype_mc = arquetype_mc[0] if arquetype_mc else ''
-            attribute = i.get('attribute')
-            level = i.get('level')
-            type_set = i.get('typeline')
-            url_target = i.get('ygoprodeck_url')
-            name_ygopro = str(url_target).replace('https://ygoprodeck.com/card/', '')
-            card_prices = i.get('card_prices')[0]
-            if isinstance(card_prices, dict):
-                cardmarket_price = card_prices.get('cardmarket_price')
-                tcgplayer_price = card_prices.get('tcgplayer_price')
-                ebay_price = card_prices.get('ebay_price')
-                amazon_price = card_prices.get('amazon_price')
-                coolstuffinc_price = card_prices.get('coolstuffinc_price')
-
-            data = {
-                'id': id,
-                'name': name,
-                'desc': desc,
-                'race': race,
-                'type': type_,
-                'frame_type': frame_type,
-                'class_card': class_card,
-                'attack': attack,
-                'defense': defense,
-                'arquetype_official': arquetype_official,
-                'arquetype_mc': arquetype_mc,
-                'attribute': attribute,
-                'level': level,
-                'type_set': ' | '.join(type_set) if isinstance(type_set, list) else None,
-                'url_target': url_target,
-                'name_ygopro': name_ygopro,
-                'cardmarket_price': cardmarket_price,
-                'tcgplayer_price': tcgplayer_price,
-                'ebay_price': ebay_price,
-                'amazon_price': amazon_price,
-                'coolstuffinc_price': coolstuffinc_price,
-                'id_sets': None,
-                'image_url': None,
-                'image_url_small': None,
-                'image_url_cropped': None
-            }
-
-            card_images = i.get('card_images')
-            if card_images:
-                if len(card_images) > 1:
-                    ids = map(lambda x: str(x['id']), card_images)
-                    id_sets = '|'.join(ids).strip()
-                    data['id_sets'] = id_sets
-                    for d in card_images:
-                        new_data = data.copy()
-                        new_data['id'] = d['id']
-                        new_data['image_url'] = d['image_url']
-                        new_data['image_url_small'] = d['image_url_small']
-                        new_data['image_url_cropped'] = d['image_url_cropped']
-                        card.append(new_data)
-                else:
-                    dicio = card_images[0]
-                    data['id_sets'] = str(data['id'])
-                    data['image_url'] = dicio['image_url']
-                    data['image_url_small'] = dicio['image_url_small']
-                    data['image_url_cropped'] = dicio['image_url_cropped']
-                    card.append(data)
-        return card
-
-    def __update_db(self) -> None:
         data_cards = self.__load_api()
-        frame_complet = self.__load_card_game_api()
-        set_cards = self.__unique_data(data_cards, frame_complet)
-        
-        df = pd.DataFrame(set_cards, columns=set_cards[0].keys())
+        self.__download_card_game_api()
 
         src = os.path.dirname(__file__)
         directory_data = os.path.join(src, 'data')
         base = os.path.join(directory_data, 'cardgame.db')
-        conx = sqlite3.connect(base)
-        df.to_sql(
-            'cards',
-            conx,
-            if_exists='replace',
-            index=False,
-            dtype={
-                'id': 'INTEGER PRIMARY KEY',
-                'attack': 'INTEGER',
-                'defense': 'INTEGER',
-                'level': 'INTEGER',
-                'cardmarket_price': 'REAL',
-                'tcgplayer_price': 'REAL',
-                'ebay_price': 'REAL',
-                'amazon_price': 'REAL',
-                'coolstuffinc_price': 'REAL'
-            }
-        )
-        conx.commit()
-        conx.close()
+        # O complet.csv pode ter sido trocado por outro caminho (downloader),
+        # entao o banco guarda a assinatura do arquivo com que foi montado
+        assinatura = self.__assinatura_complet()
+        # Fontes inalteradas: nada a baixar, ler ou reconstruir
+        mudou = self.__DUMP_MUDOU or le_meta(base, 'complet') != assinatura
+        if mudou:
+            set_cards = self.__unique_data(data_cards, self.__load_card_game_api())
+            reconstroi_banco(base, set_cards, {'complet': assinatura})
+
+        self.__MANIFEST.save()
+        if verificado:
+            with open(self.path_file_data, 'w', encoding='utf-8') as file:
+                file.write(str(datetime.now().strftime(r'%d/%m/%Y')))
+        return mudou
 
 if __name__ == '__main__':
     SRC = os.path.dirname(__file__)
@@ -286,6 +734,7 @@ if __name__ == '__main__':
     
     # if dias_passados > 10:
     card = CardBaseInfo()
+    card.atualizar()
 
     card_info = CardInfoOfficial(60800381)
     print(card_info.info_card)
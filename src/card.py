@@ -3,14 +3,20 @@
 #
 
 import os
-import shutil
+import json
 import asyncio
-import requests
 from os.path import join, exists, dirname
 
 from typing import Union, List
 from pandas import DataFrame
 
+try:
+    from client import HttpClient, AsyncHttpClient
+    from manifest import SourceManifest, grava_csv_atomico, remove_dir_atomico
+except:
+    from src.client import HttpClient, AsyncHttpClient
+    from src.manifest import SourceManifest, grava_csv_atomico, remove_dir_atomico
+
 class CardGame:
     """
     Estrutura de dados criada para lidar com requisicoes ao google.sheet,
@@ -58,8 +64,8 @@ class CardGame:
         Returns:
             dict : Em caso de error -> ```{ 'error' : 400 }```
         """
-        d = requests.get(self.__END_POINT) if url == None else requests.get(str(url))
-        return dict(d.json()) if d.status_code == 200 else { 'error' : 400 }
+        data = HttpClient.shared().get_json(self.__END_POINT if url == None else str(url))
+        return data if data is not None else { 'error' : 400 }
 
     def mount_frame(self, data: dict, sheet: str = 'complet') -> DataFrame:
         """
@@ -76,7 +82,9 @@ class CardGame:
 
     def save(self, data: DataFrame, name: str) -> bool:
         """
-        Cria o diretório `/cache/` se nao existir e salva o DataFrame como CSV.
+        Cria o diretório `/cache/` se nao existir e salva o DataFrame como CSV
+        de forma atômica, junto da versão colunar binária (`colunar`), e o
+        registra no manifesto do diretório (`ArtifactManifest`).
 
         Args:
             data (DataFrame): DataFrame que sera salvo como CSV separado por `;`
@@ -86,29 +94,21 @@ class CardGame:
             bool :
                 `True` se o arquivo for criado, `False` para falha.
         """
-        cache_dir = join(dirname(__file__), 'cache')
-        if not exists(cache_dir):
-            os.mkdir(cache_dir)
-
-        download = join(cache_dir, f'{name}.csv')
-        data.to_csv(download, sep=';', index=False)
+        download = join(dirname(__file__), 'cache', f'{name}.csv')
+        grava_csv_atomico(data, download, ';')
         return exists(download)
 
     def cache_delete(self) -> bool:
         """
         Deleta o diretório 'cache' com todo o seu conteúdo,
-        localizado no mesmo diretório deste arquivo.
+        localizado no mesmo diretório deste arquivo. O diretório é renomeado
+        antes de ser apagado, leitores nunca veem parte dos arquivos.
 
         Returns:
             bool: `True` se o diretório foi deletado com sucesso,
             `False` se o diretório não existir.
         """
-        atual_dir = os.path.dirname(__file__)
-        dir_cache = str(os.path.join(atual_dir, 'cache'))
-        if os.path.exists(dir_cache) and os.path.isdir(dir_cache):
-            shutil.rmtree(dir_cache)
-            return True
-        return False
+        return remove_dir_atomico(os.path.join(os.path.dirname(__file__), 'cache'))
 
 class CardGameAsync:
     """
@@ -136,6 +136,8 @@ class CardGameAsync:
     async def fetch_data(self, links: List[str]) -> List[dict]:
         """
         Requisita uma serie de links, retornando uma lista com as respostas.
+        As requisicoes sao feitas em paralelo pelo `AsyncHttpClient`, com
+        limite por host e novas tentativas.
 
         Args:
             links (list[str]): Lista com cada link da requisicao em resposta JSON.
@@ -143,10 +145,9 @@ class CardGameAsync:
         Returns:
             list[dict]: Lista com as respostas em `dict`.
         """
-        function_ = self.__CARD_GAME__.request_frame
-        tasks = [asyncio.to_thread(function_, l) for l in links]
-        result = await asyncio.gather(*tasks)
-        return result
+        async with AsyncHttpClient() as client:
+            result = await asyncio.gather(*(client.get_json(l) for l in links))
+        return [r if r is not None else { 'error' : 400 } for r in result]
 
     async def mount_frames(self, sheet_dict: List[dict], names: List[str]) -> List[DataFrame]:
         """
@@ -168,8 +169,9 @@ class CardGameAsync:
 
     async def save_frames(self, frames: List[DataFrame], sheet_names: List[str]) -> List[str]:
         """
-        Cria o diretório `/cache/` se nao existir e salva os DataFrames como CSV,
-        os nomes dos arquivos serao passados em sheet_names.
+        Cria o diretório `/cache/` se nao existir e salva os DataFrames como CSV
+        de forma atômica e na versão colunar binária, registrando cada um no
+        manifesto do diretório. Os nomes dos arquivos serao passados em sheet_names.
 
         Args:
             frames (list[DataFrame]): Sequencia de DataFrames para serem salvos.
@@ -179,22 +181,20 @@ class CardGameAsync:
             None
         """
         cache_dir = str(join(dirname(__file__), 'cache'))
-        if not exists(cache_dir):
-            os.mkdir(cache_dir)
-
         stack_paths = []
         for f, name in zip(frames, sheet_names):
             f.columns = f.columns.str.replace(' ', '_').str.lower()
             download_path = str(join(cache_dir, f"{name}.csv"))
             stack_paths.append(download_path)
-            f.to_csv(download_path, sep=';', index=False)
+            await asyncio.to_thread(grava_csv_atomico, f, download_path, ';')
 
         return stack_paths
 
     async def creat_files(self, sheets: List[str]) -> bool:
         """
         Requisita cada sheet e cria uma pasta `/cache/`, 
-        retorna `True` se todos forem baixados.
+        retorna `True` se todos forem baixados. As folhas que nao mudaram
+        desde o ultimo download (`SourceManifest`) nao sao lidas nem gravadas.
 
         Args:
             sheets (list[str]): Nomes de cada folha do sheet, sera o nome dos arquivos.
@@ -203,10 +203,23 @@ class CardGameAsync:
             bool
                 `True` se todos os arquivos foram criados, `False` para falha.
         """
-        lista_dicts = await self.fetch_data(self.__mount_link__(sheets))
-        lista_dados = await self.mount_frames(lista_dicts, sheets)
-        paths_files = await self.save_frames(lista_dados, sheets)
-        return all(map(lambda x: exists(x), paths_files))
+        cache_dir = str(join(dirname(__file__), 'cache'))
+        fontes = {
+            f'card:{s}': (l, join(cache_dir, f'{s}.csv'))
+            for s, l in zip(sheets, self.__mount_link__(sheets))
+        }
+
+        async def grava(nome: str, conteudo: bytes) -> None:
+            sheet = nome.split(':', 1)[1]
+            frames = await self.mount_frames([dict(json.loads(conteudo))], [sheet])
+            await self.save_frames(frames, [sheet])
+
+        try:
+            async with AsyncHttpClient() as client:
+                await SourceManifest().sync_async(client, fontes, grava)
+        except ConnectionError:
+            return False
+        return all(map(lambda x: exists(join(cache_dir, f'{x}.csv')), sheets))
 
     def async_save_run(self, f: List[str]) -> bool:
         """
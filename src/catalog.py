@@ -0,0 +1,400 @@
+#
+# Python 3.11.10
+#
+import re
+import os
+import hashlib
+import threading
+from typing import Dict, List, NamedTuple, Union
+
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+from pandas import DataFrame                # type: ignore
+
+try:
+    import dump
+    import colunar
+    from manifest import ArtifactManifest
+except:
+    from src import dump
+    from src import colunar
+    from src.manifest import ArtifactManifest
+
+# Ultimo DataFrame lido de cada artefato registrado: path -> (sha256, frame)
+_LIDOS: Dict[str, tuple] = {}
+_LIDOS_LOCK = threading.Lock()
+
+
+def ler_artefato(file: str, lim: str) -> DataFrame:
+    """
+    Lê um CSV de `cache/` ou `var/` como DataFrame. Se o arquivo confere com
+    o `ArtifactManifest` do diretório e já foi lido com o mesmo sha256, a
+    cópia em memória é devolvida sem nova leitura nem validação; senão ele é
+    lido pela versão colunar binária, quando atualizada, ou pelo próprio CSV.
+
+    Args:
+        file (str): Caminho do CSV.
+        lim (str): Separador do arquivo.
+
+    Returns:
+        DataFrame: Um DataFrame que pertence a quem chama.
+    """
+    entrada = ArtifactManifest.of(file).verify(file)
+    if entrada is not None:
+        with _LIDOS_LOCK:
+            lido = _LIDOS.get(file)
+        if lido is not None and lido[0] == entrada['sha256']:
+            return lido[1].copy()
+
+    df = colunar.read_frame(file)
+    df = pd.read_csv(file, sep=lim, encoding='utf-8') if df is None else df
+    if entrada is not None:
+        with _LIDOS_LOCK:
+            _LIDOS[file] = (entrada['sha256'], df.copy())
+    return df
+
+
+def ler_cache(arq: str, lim: str = ';') -> DataFrame:
+    """
+    Lê um arquivo CSV do diretório `cache/` como DataFrame (`ler_artefato`).
+
+    Args:
+        arq (str): Nome do arquivo CSV a ser lido.
+        lim (str): Separador do arquivo.
+
+    Returns:
+        DataFrame: DataFrame contendo os dados lidos do arquivo.
+    """
+    return ler_artefato(os.path.join(os.path.dirname(__file__), 'cache', arq), lim)
+
+
+def ler_var(arq: str, lim: str = '|') -> DataFrame:
+    """
+    Lê um arquivo CSV do diretório `var/` como DataFrame (`ler_artefato`).
+
+    Args:
+        arq (str): Nome do arquivo CSV a ser lido.
+        lim (str): Separador do arquivo.
+
+    Returns:
+        DataFrame: DataFrame contendo os dados lidos do arquivo.
+    """
+    return ler_artefato(os.path.join(os.path.dirname(__file__), 'var', arq), lim)
+
+
+class CardLookup(NamedTuple):
+    """
+    Resultado da busca de uma sequência de códigos no catálogo.
+
+    Attributes:
+        frame (DataFrame): Linhas do catálogo na ordem dos códigos encontrados.
+        missing (List[int]): Códigos que não estão cadastrados no catálogo.
+    """
+    frame: DataFrame
+    missing: List[int]
+
+
+class CardCatalog:
+    """
+    Catálogo de cartas e banlist vigente, montado uma única vez e
+    compartilhado entre as requisições.
+
+    Todo o acesso a disco acontece no construtor: `cache/complet.csv`,
+    `cache/min.csv` e `var/Home.csv` são lidos e a banlist é cruzada com o
+    catálogo. Depois disso a instância é somente leitura, quem consome os
+    quadros deve copiar antes de alterar.
+
+    Args:
+        complet (Union[DataFrame, None]): Quadro `complet` já carregado,
+            se None é lido de `cache/complet.csv`.
+        mini (Union[DataFrame, None]): Quadro `min` já carregado,
+            se None é lido de `cache/min.csv`.
+        home (Union[DataFrame, None]): Quadro da banlist `Home` já carregado,
+            se None é lido de `var/Home.csv`.
+    """
+    def __init__(
+        self,
+        complet: Union[DataFrame, None] = None,
+        mini: Union[DataFrame, None] = None,
+        home: Union[DataFrame, None] = None
+    ) -> None:
+        complet = ler_cache('complet.csv') if complet is None else complet.copy()
+        mini = ler_cache('min.csv') if mini is None else mini
+        home = ler_var('Home.csv') if home is None else home.copy()
+        # Versao do conteudo efetivamente carregado, antes de qualquer ajuste
+        self.__VERSAO: str = self.__versao_(complet, mini, home)
+
+        complet['cod'] = complet['cod'].astype(int)
+        self.__COMPLET: DataFrame = complet
+        self.__MINI_ARQUETIPOS: np.ndarray = mini['name'].to_numpy(copy=True)
+        self.__MINI_ARQUETIPOS.flags.writeable = False
+        self.__MINI_SET: frozenset = frozenset(
+            m for m in self.__MINI_ARQUETIPOS if isinstance(m, str)
+        )
+        # Classificacao de cada arquetipo distinto do catalogo, pre-calculada
+        self.__CLASSE_ARQUETIPO: Dict[str, str] = {
+            a: self.classify(a) for a in complet['arquetype'].dropna().unique()
+        }
+
+        # Indice ordenado dos codigos (int32) para busca com searchsorted,
+        # a ordenacao estavel mantem a primeira ocorrencia de codigos repetidos
+        cods = complet['cod'].to_numpy(dtype=np.int64)
+        ordem = np.argsort(cods, kind='stable')
+        self.__COD_ORDENADO: np.ndarray = cods[ordem].astype(np.int32)
+        self.__POSICAO_COD: np.ndarray = ordem
+        self.__COD_ORDENADO.flags.writeable = False
+        self.__POSICAO_COD.flags.writeable = False
+
+        self.__BANLIST: DataFrame = self.__monta_banlist_atual_(complet, home)
+        self.__BANLIST_PART: DataFrame = self.__BANLIST[['cod', 'condition', 'remarks']].copy()
+        self.__BANLIST_PART['condition'] = self.__BANLIST_PART['condition'].map({
+            'Unlimited': 3,
+            'Semi-Limited': 2,
+            'Limited': 1,
+            'Forbidden': 0
+        })
+        self.__VETOR_COD_BANLIST: np.ndarray = self.__BANLIST['cod'].astype(int).unique()
+        self.__VETOR_COD_BANLIST.flags.writeable = False
+
+        # Indice codigo -> estrutura oficial da carta (ygoprodeck), sob demanda
+        self.__ESTRUTURAS: Union[Dict[int, Dict], None] = None
+        self.__LOCK_ESTRUTURAS = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        """
+        Versão dos dados do catálogo: muda sempre que `complet`, `min`, a
+        banlist `Home` ou o dump oficial das cartas mudam.
+        """
+        return self.__VERSAO
+
+    @property
+    def complet(self) -> DataFrame:
+        """Quadro completo de cartas do Card Game (`cache/complet.csv`)."""
+        return self.__COMPLET
+
+    @property
+    def mini_arquetipos(self) -> np.ndarray:
+        """Nomes dos mini-arquétipos tratados como `generic` (`cache/min.csv`)."""
+        return self.__MINI_ARQUETIPOS
+
+    @property
+    def arquetype_classes(self) -> Dict[str, str]:
+        """Arquétipo do catálogo -> arquétipo classificado (`generic` para mini-arquétipos)."""
+        return self.__CLASSE_ARQUETIPO
+
+    def classify(self, text: str) -> str:
+        """
+        Classifica um arquétipo: se ele (ou um dos arquétipos separados por
+        `|`) for um mini-arquétipo, retorna `generic`, senão o próprio texto.
+        """
+        if '|' in text:
+            tokens = text.replace(' | ', '|').split('|')
+            return 'generic' if any(t in self.__MINI_SET for t in tokens) else text
+        return 'generic' if text in self.__MINI_SET else text
+
+    def classify_series(self, arquetypes: pd.Series) -> pd.Series:
+        """Classifica uma coluna de arquétipos com o mapa pré-calculado do catálogo."""
+        classes = arquetypes.map(self.__CLASSE_ARQUETIPO)
+        faltantes = classes.isna() & arquetypes.notna()
+        if faltantes.any():
+            classes[faltantes] = arquetypes[faltantes].map(self.classify)
+        return classes.where(arquetypes.notna(), arquetypes)
+
+    @property
+    def banlist(self) -> DataFrame:
+        """Banlist vigente cruzada com o catálogo de cartas."""
+        return self.__BANLIST
+
+    @property
+    def banlist_part(self) -> DataFrame:
+        """Colunas `cod`, `condition` e `remarks` da banlist, condição numérica."""
+        return self.__BANLIST_PART
+
+    @property
+    def vetor_cod_banlist(self) -> np.ndarray:
+        """Códigos únicos das cartas presentes na banlist."""
+        return self.__VETOR_COD_BANLIST
+
+    @property
+    def card_structures(self) -> Dict[int, Dict]:
+        """
+        Índice de código para a estrutura oficial da carta, montado a partir
+        de `json/data_cards_official.json` na primeira leitura e compartilhado
+        desde então. Códigos de artes alternativas apontam para a carta de
+        origem, com `id` igual ao código da arte.
+        """
+        if self.__ESTRUTURAS is None:
+            with self.__LOCK_ESTRUTURAS:
+                if self.__ESTRUTURAS is None:
+                    self.__ESTRUTURAS = self.__monta_indice_estruturas_()
+        return self.__ESTRUTURAS
+
+    def card_structure(self, cod: int) -> Union[Dict, None]:
+        """
+        Retorna a estrutura oficial da carta pelo código, ou None se o código
+        não existir no dump da ygoprodeck. O dicionário é compartilhado e não
+        deve ser alterado.
+        """
+        return self.card_structures.get(int(cod))
+
+    def positions(self, codes: Union[List[int], np.ndarray]) -> np.ndarray:
+        """
+        Posição de cada código no quadro `complet`, resolvida em uma única
+        busca vetorizada sobre o índice ordenado.
+
+        Args:
+            codes (Union[List[int], ndarray]): Códigos das cartas.
+
+        Returns:
+            ndarray: Posições (int64) na mesma ordem de `codes`, `-1` para
+            códigos não cadastrados.
+        """
+        codes = np.asarray(codes, dtype=np.int64).ravel()
+        posicoes = np.full(codes.shape[0], -1, dtype=np.int64)
+        if not codes.size or not self.__COD_ORDENADO.size:
+            return posicoes
+
+        # Codigos fora do intervalo int32 nunca estao no indice
+        info = np.iinfo(np.int32)
+        validos = (codes >= info.min) & (codes <= info.max)
+        alvo = codes[validos].astype(np.int32)
+
+        idx = np.searchsorted(self.__COD_ORDENADO, alvo)
+        idx = np.minimum(idx, self.__COD_ORDENADO.size - 1)
+        achou = self.__COD_ORDENADO[idx] == alvo
+
+        resolvidos = np.full(alvo.shape[0], -1, dtype=np.int64)
+        resolvidos[achou] = self.__POSICAO_COD[idx[achou]]
+        posicoes[validos] = resolvidos
+        return posicoes
+
+    def lookup(self, codes: Union[List[int], np.ndarray]) -> CardLookup:
+        """
+        Resolve uma parte inteira do deck no catálogo com um único `take`.
+
+        Args:
+            codes (Union[List[int], ndarray]): Códigos das cartas, com repetições.
+
+        Returns:
+            CardLookup: Linhas encontradas, na ordem de `codes`, e a lista
+            de códigos ausentes do catálogo.
+        """
+        codes = np.asarray(codes, dtype=np.int64).ravel()
+        posicoes = self.positions(codes)
+        achou = posicoes >= 0
+        frame = self.__COMPLET.take(posicoes[achou]).reset_index(drop=True)
+        return CardLookup(frame, codes[~achou].tolist())
+
+    def lookup_many(self, partes: List[Union[List[int], np.ndarray]]) -> List[CardLookup]:
+        """
+        Resolve várias sequências de códigos (ex.: todas as partes de um lote
+        de decks) com uma única busca e um único `take` sobre o catálogo.
+
+        Args:
+            partes (List[Union[List[int], ndarray]]): Sequências de códigos.
+
+        Returns:
+            List[CardLookup]: Uma busca por sequência, na mesma ordem.
+        """
+        arrays = [np.asarray(p, dtype=np.int64).ravel() for p in partes]
+        if not arrays:
+            return []
+        codes = np.concatenate(arrays)
+        posicoes = self.positions(codes)
+        achou = posicoes >= 0
+        frame = self.__COMPLET.take(posicoes[achou]).reset_index(drop=True)
+
+        # Limites de cada sequencia no vetor total e no quadro encontrado
+        limites = np.cumsum([0] + [a.shape[0] for a in arrays])
+        limites_frame = np.concatenate([[0], np.cumsum(achou)])[limites]
+
+        buscas = []
+        for i in range(len(arrays)):
+            ini, fim = limites[i], limites[i + 1]
+            parte = frame.iloc[limites_frame[i]:limites_frame[i + 1]].reset_index(drop=True)
+            buscas.append(CardLookup(parte, codes[ini:fim][~achou[ini:fim]].tolist()))
+        return buscas
+
+    def __versao_(self, complet: DataFrame, mini: DataFrame, home: DataFrame) -> str:
+        """
+        Calcula a versão pelo conteúdo dos quadros carregados, lidos ou
+        recebidos, e pelo manifesto ou metadados do dump oficial, que só é
+        lido sob demanda (`card_structures`).
+        """
+        hash_ = hashlib.sha1()
+        for frame in (complet, mini, home):
+            hash_.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+
+        path = os.path.join(os.path.dirname(__file__), 'json', 'data_cards_official.json')
+        if os.path.exists(path):
+            # Conteudo registrado no manifesto, senao os metadados do arquivo
+            entrada = ArtifactManifest.of(path).verify(path)
+            if entrada is not None:
+                hash_.update(f'{path}:{entrada["sha256"]}'.encode())
+            else:
+                info = os.stat(path)
+                hash_.update(f'{path}:{info.st_size}:{info.st_mtime_ns}'.encode())
+        return hash_.hexdigest()[:16]
+
+    def __monta_indice_estruturas_(self) -> Dict[int, Dict]:
+        """Lê o dump oficial das cartas e indexa cada código de carta e de arte."""
+        dir_file_cards = os.path.join(
+            os.path.dirname(__file__), 'json', 'data_cards_official.json'
+        )
+        struct_cards = dump.iter_file(dir_file_cards)
+
+        # A primeira ocorrencia de um codigo vence, como na busca linear
+        # original: id da carta antes dos ids das artes da mesma carta
+        indice: Dict[int, Dict] = {}
+        for card in struct_cards:
+            estrutura = {
+                'card_images': card['card_images'],
+                'desc': card['desc'],
+                'frameType': card['frameType'],
+                'humanReadableCardType': card['humanReadableCardType'],
+                'id': card['id'],
+                'name': card['name'],
+                'race': card['race'],
+                'type': card['type'],
+                'ygoprodeck_url': card['ygoprodeck_url']
+            }
+            indice.setdefault(int(card['id']), estrutura)
+            for image in card['card_images']:
+                cod = int(image['id'])
+                if cod not in indice:
+                    indice[cod] = {**estrutura, 'id': image['id']}
+        return indice
+
+    def __monta_banlist_atual_(self, complet: DataFrame, home: DataFrame) -> DataFrame:
+        """Monta o quadro da banlist vigente de acordo com os códigos das cartas."""
+        # limpando espaço adicional e titulo clonado
+        home = home.loc[~home['card_name'].isin(['Card Name'])].reset_index(drop=True)
+        home['card_name'] = home['card_name'].str.strip().str.upper()
+        home['card_name'] = home['card_name'].apply(lambda x: re.sub(r'\s+', ' ', x).strip())
+
+        # separando codigos das cartas
+        cod_name = complet[['cod', 'card_name']].copy()
+        cod_name['card_name'] = cod_name['card_name'].str.upper().str.strip()
+
+        # montagem do quadro correto
+        frame_correto = pd.merge(home, cod_name, how='inner', on='card_name')
+        frame_correto['remarks'] = frame_correto['remarks'].fillna('')
+
+        # Procurando cartas com nomes bugados
+        DESAJUSTADOS = home.loc[
+            ~home['card_name'].isin(frame_correto['card_name'])
+        ].reset_index(drop=True)
+        if len(DESAJUSTADOS.index):
+            print('Problemas!! Existe nomes desajustados ou não cadastrados!!')
+            print(DESAJUSTADOS)
+
+        # separando cartas da banlist
+        cartas_banlist = frame_correto[['cod', 'condition', 'remarks']]
+        banlist = pd.merge(cartas_banlist, complet, how='inner', on='cod')
+        return banlist
+
+if __name__ == '__main__':
+    catalogo = CardCatalog()
+    print(catalogo.complet.shape)
+    print(catalogo.banlist)
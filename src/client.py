@@ -0,0 +1,177 @@
+#
+# Python 3.11.10
+#
+import random
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from typing import Dict, Union
+
+import httpx                                # type: ignore
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Parametros compartilhados pelos clientes HTTP do projeto
+TIMEOUT: float = 30.0
+TIMEOUT_CONEXAO: float = 10.0
+TENTATIVAS: int = 4
+BACKOFF_BASE: float = 0.5
+BACKOFF_MAX: float = 30.0
+LIMITE_HOST: int = 4
+STATUS_RETRY: frozenset = frozenset({429, 500, 502, 503, 504})
+
+
+def backoff(tentativa: int, base: float = BACKOFF_BASE, maximo: float = BACKOFF_MAX) -> float:
+    """
+    Espera antes da próxima tentativa: exponencial com jitter completo, um
+    valor aleatório entre 0 e `base * 2 ** tentativa`, limitado a `maximo`.
+    """
+    return random.uniform(0, min(maximo, base * 2 ** tentativa))
+
+
+def _retry_after(response: httpx.Response) -> Union[float, None]:
+    """Segundos pedidos pelo servidor no cabeçalho `Retry-After`, se houver."""
+    valor = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(valor)) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class HttpClient:
+    """
+    Cliente HTTP síncrono compartilhado: uma `requests.Session` com conexões
+    keep-alive reaproveitadas, no máximo `limite_host` conexões por host,
+    timeout em toda requisição e novas tentativas com backoff exponencial
+    (com jitter) para erros de conexão e respostas 429/5xx.
+
+    Args:
+        tentativas (int): Novas tentativas após a primeira requisição.
+        timeout (float): Timeout de leitura em segundos.
+        limite_host (int): Conexões simultâneas por host.
+        backoff_base (float): Fator do backoff exponencial em segundos.
+    """
+    __SHARED: Union['HttpClient', None] = None
+    __SHARED_LOCK = threading.Lock()
+
+    def __init__(
+        self, tentativas: int = TENTATIVAS, timeout: float = TIMEOUT,
+        limite_host: int = LIMITE_HOST, backoff_base: float = BACKOFF_BASE
+    ) -> None:
+        self.timeout: tuple = (TIMEOUT_CONEXAO, timeout)
+        retry = Retry(
+            total=tentativas,
+            status_forcelist=STATUS_RETRY,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            backoff_factor=backoff_base,
+            backoff_max=BACKOFF_MAX,
+            backoff_jitter=backoff_base,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=8, pool_maxsize=limite_host, pool_block=True, max_retries=retry
+        )
+        self.session: requests.Session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def shared(cls) -> 'HttpClient':
+        """Retorna o cliente compartilhado pelo processo, criado no primeiro uso."""
+        if cls.__SHARED is None:
+            with cls.__SHARED_LOCK:
+                if cls.__SHARED is None:
+                    cls.__SHARED = cls()
+        return cls.__SHARED
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """`GET` pela sessão compartilhada, com o timeout padrão se nenhum for passado."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def get_json(self, url: str) -> Union[Dict, None]:
+        """Retorna o JSON da resposta, ou None se o status final não for 200."""
+        response = self.get(url)
+        return dict(response.json()) if response.status_code == 200 else None
+
+    def close(self) -> None:
+        """Fecha as conexões abertas da sessão."""
+        self.session.close()
+
+
+class AsyncHttpClient:
+    """
+    Cliente HTTP assíncrono sobre `httpx.AsyncClient`, para ser usado como
+    `async with`. Mantém as conexões keep-alive entre as requisições, limita
+    as requisições simultâneas por host com um semáforo e repete erros de
+    conexão e respostas 429/5xx com backoff exponencial com jitter,
+    respeitando `Retry-After`.
+
+    Args:
+        tentativas (int): Novas tentativas após a primeira requisição.
+        timeout (float): Timeout de leitura em segundos.
+        limite_host (int): Requisições simultâneas por host.
+        backoff_base (float): Fator do backoff exponencial em segundos.
+    """
+    def __init__(
+        self, tentativas: int = TENTATIVAS, timeout: float = TIMEOUT,
+        limite_host: int = LIMITE_HOST, backoff_base: float = BACKOFF_BASE
+    ) -> None:
+        self.tentativas: int = tentativas
+        self.limite_host: int = limite_host
+        self.backoff_base: float = backoff_base
+        self.client: httpx.AsyncClient = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=TIMEOUT_CONEXAO),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=limite_host * 4),
+            follow_redirects=True
+        )
+        self.__SEMAFOROS: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Fecha as conexões abertas do cliente."""
+        await self.client.aclose()
+
+    def __semaforo_(self, url: str) -> asyncio.Semaphore:
+        """Semáforo do host da URL, criado no primeiro uso."""
+        host = urlsplit(url).netloc
+        if host not in self.__SEMAFOROS:
+            self.__SEMAFOROS[host] = asyncio.Semaphore(self.limite_host)
+        return self.__SEMAFOROS[host]
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        `GET` com novas tentativas. A última resposta é retornada mesmo com
+        status de erro; o último erro de conexão é relançado.
+        """
+        for tentativa in range(self.tentativas + 1):
+            ultima = tentativa == self.tentativas
+            try:
+                async with self.__semaforo_(url):
+                    response = await self.client.get(url, **kwargs)
+            except httpx.TransportError:
+                if ultima:
+                    raise
+                await asyncio.sleep(backoff(tentativa, self.backoff_base))
+                continue
+
+            if response.status_code not in STATUS_RETRY or ultima:
+                return response
+            espera = _retry_after(response)
+            await asyncio.sleep(
+                min(espera, BACKOFF_MAX) if espera is not None
+                else backoff(tentativa, self.backoff_base)
+            )
+        return response
+
+    async def get_json(self, url: str) -> Union[Dict, None]:
+        """Retorna o JSON da resposta, ou None se o status final não for 200."""
+        response = await self.get(url)
+        return dict(response.json()) if response.status_code == 200 else None
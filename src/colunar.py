@@ -0,0 +1,155 @@
+#
+# Python 3.11.10
+#
+import os
+import json
+import shutil
+import tempfile
+from typing import Dict, List, Union
+
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+from pandas import DataFrame                # type: ignore
+
+# Formato colunar binario espelhando os CSV de `cache/` e `var/`:
+#
+#   cache/complet.csv.col/
+#       header.json     -> formato, versao, origem (CSV espelhado), colunas
+#       0.npy, 2.npy    -> colunas numericas ou codigos de categorias (mmap)
+#       1.json          -> colunas de texto livre
+#
+# O header e gravado por ultimo, sem ele o diretorio e ignorado. O diretorio
+# e montado em um temporario e so entao trocado pelo atual.
+FORMATO: str = 'deckapi-colunar'
+VERSAO: int = 1
+ATIVO: bool = os.environ.get('DECKAPI_COLUNAR', '1') != '0'
+
+# Colunas gravadas como int32 e como categorias
+INT32: List[str] = ['cod']
+CATEGORICAS: List[str] = ['tipo', 'arquetype']
+
+
+def path_colunar(csv: Union[str, os.PathLike]) -> str:
+    """Diretório colunar que espelha o CSV informado."""
+    return f'{os.path.abspath(csv)}.col'
+
+
+def _origem(csv: Union[str, os.PathLike]) -> Dict[str, int]:
+    """Tamanho e data de modificação do CSV, usados como versão da origem."""
+    info = os.stat(csv)
+    return {'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+
+def write_frame(csv: Union[str, os.PathLike], lim: str) -> bool:
+    """
+    Grava a versão colunar de um CSV recém salvo. O CSV é relido para que
+    os tipos sejam exatamente os que `pd.read_csv` entregaria.
+
+    Args:
+        csv (Union[str, PathLike]): Caminho do CSV de origem.
+        lim (str): Separador do CSV.
+
+    Returns:
+        bool: `True` se o diretório colunar foi gravado.
+    """
+    if not ATIVO or not os.path.exists(csv):
+        return False
+
+    df = pd.read_csv(csv, sep=lim, encoding='utf-8')
+    final = path_colunar(csv)
+    destino = tempfile.mkdtemp(prefix=f'.{os.path.basename(final)}-', dir=os.path.dirname(final))
+
+    try:
+        colunas = []
+        for i, nome in enumerate(df.columns):
+            serie = df[nome]
+            coluna: Dict = {'nome': str(nome)}
+            if nome in INT32 and pd.api.types.is_integer_dtype(serie):
+                coluna['tipo'] = 'int32'
+                np.save(os.path.join(destino, f'{i}.npy'), serie.to_numpy(dtype=np.int32))
+            elif pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+                coluna['tipo'] = str(serie.dtype)
+                np.save(os.path.join(destino, f'{i}.npy'), serie.to_numpy())
+            elif nome in CATEGORICAS:
+                categorias = serie.astype('category')
+                coluna['tipo'] = 'categoria'
+                coluna['categorias'] = [str(c) for c in categorias.cat.categories]
+                np.save(
+                    os.path.join(destino, f'{i}.npy'),
+                    categorias.cat.codes.to_numpy(dtype=np.int32)
+                )
+            else:
+                coluna['tipo'] = 'texto'
+                valores = [None if pd.isna(v) else str(v) for v in serie]
+                with open(os.path.join(destino, f'{i}.json'), 'w', encoding='utf-8') as file:
+                    json.dump(valores, file, ensure_ascii=False, separators=(',', ':'))
+            colunas.append(coluna)
+
+        header = {
+            'formato': FORMATO,
+            'versao': VERSAO,
+            'origem': _origem(csv),
+            'linhas': int(df.shape[0]),
+            'colunas': colunas
+        }
+        with open(os.path.join(destino, 'header.json'), 'w', encoding='utf-8') as file:
+            json.dump(header, file, ensure_ascii=False)
+    except BaseException:
+        shutil.rmtree(destino, ignore_errors=True)
+        raise
+
+    # Diretorios nao sao trocados por rename, o antigo sai primeiro
+    antigo = None
+    if os.path.exists(final):
+        antigo = f'{destino}.old'
+        os.replace(final, antigo)
+    os.replace(destino, final)
+    if antigo is not None:
+        shutil.rmtree(antigo, ignore_errors=True)
+    return True
+
+
+def read_frame(csv: Union[str, os.PathLike]) -> Union[DataFrame, None]:
+    """
+    Lê a versão colunar de um CSV com as colunas numéricas mapeadas em
+    memória. Retorna None se ela não existir, for de outro formato ou
+    estiver desatualizada em relação ao CSV.
+
+    Args:
+        csv (Union[str, PathLike]): Caminho do CSV de origem.
+
+    Returns:
+        Union[DataFrame, None]: DataFrame com `cod` em int32 e categorias
+        em `tipo`/`arquetype`, ou None.
+    """
+    destino = path_colunar(csv)
+    path_header = os.path.join(destino, 'header.json')
+    if not ATIVO or not os.path.exists(path_header) or not os.path.exists(csv):
+        return None
+
+    try:
+        with open(path_header, 'r', encoding='utf-8') as file:
+            header = json.load(file)
+        if header.get('formato') != FORMATO or header.get('versao') != VERSAO \
+                or header.get('origem') != _origem(csv):
+            return None
+
+        dados = {}
+        for i, coluna in enumerate(header['colunas']):
+            if coluna['tipo'] == 'texto':
+                with open(os.path.join(destino, f'{i}.json'), 'r', encoding='utf-8') as file:
+                    serie = pd.Series(json.load(file), dtype=object)
+                dados[coluna['nome']] = serie.where(serie.notna(), np.nan)
+                continue
+
+            array = np.load(os.path.join(destino, f'{i}.npy'), mmap_mode='r')
+            if coluna['tipo'] == 'categoria':
+                dados[coluna['nome']] = pd.Categorical.from_codes(
+                    array, categories=coluna['categorias']
+                )
+            else:
+                dados[coluna['nome']] = array
+        df = DataFrame(dados)
+        return df if df.shape[0] == header['linhas'] else None
+    except (OSError, ValueError, KeyError):
+        return None
@@ -2,80 +2,51 @@
 # Python ^3.11
 #
 
-import os
 from os import PathLike
-import json
 import pprint
 from typing import (
+    Iterable,
+    Iterator,
     List,
     Union,
     Dict
 )
 
+import numpy as np                                 # type: ignore
 import pandas as pd                                # type: ignore
 from pandas import DataFrame                       # type: ignore
 
 try:
+    from ydke import CoreYDKE
     from mesa import Combination
+    from catalog import CardCatalog, CardLookup
 except:
+    from src.ydke import CoreYDKE
     from src.mesa import Combination
+    from src.catalog import CardCatalog, CardLookup
 
+# Eixos do tensor de contagens do FrameDeck
+PARTES = ('main', 'extra', 'side')
+TIPOS = ('monster', 'spell', 'trap', 'outro')
+CLASSES = ('arquetype', 'generic', 'invalid', 'outro')
+
+MAIN, EXTRA, SIDE = range(len(PARTES))
+MONSTER, SPELL, TRAP = range(len(TIPOS) - 1)
+ARQUETYPE, GENERIC, INVALID = range(len(CLASSES) - 1)
 
-class FrameDeck(Combination):
-    def __init__(self, deck_list: Union[str, PathLike]) -> None:
-        super().__init__(deck_list)
-        # Cache de criptografia do deck, independente a arquivos passados como argumento
-        self._cache_ydke: Union[None, str] = None
-
-        # Cache para numeros já cálculados
-        self._cache_full_main: Union[None, int] = None
-        self._cache_full_extra: Union[None, int] = None
-        self._cache_full_side: Union[None, int] = None
-        self._cache_full_cards: Union[None, int] = None
-
-        # Garante que arquetype no main deck original seja o nosso Y correto
-        self._cache_number_cards_arquetype_main: Union[None, int] = None
-        self._cache_number_cards_generic_main: Union[None, int] = None
-        self._cache_number_cards_invalid_main: Union[None, int] = None
-
-        # Garante que arquetype no extra deck original seja o nosso Y correto
-        self._cache_number_cards_arquetype_extra: Union[None, int] = None
-        self._cache_number_cards_generic_extra: Union[None, int] = None
-        self._cache_number_cards_invalid_extra: Union[None, int] = None
-
-        # Garante que arquetype no side deck original seja o nosso Y correto
-        self._cache_number_cards_arquetype_side: Union[None, int] = None
-        self._cache_number_cards_generic_side: Union[None, int] = None
-        self._cache_number_cards_invalid_side: Union[None, int] = None
-
-        # Caches de relacionamento full
-        self._cache_full_arquetype: Union[None, int] = None
-        self._cache_full_generic: Union[None, int] = None
-        self._cache_full_invalid: Union[None, int] = None
-
-        # Caches para quantidades detalhadas do deck
-        self._cache_number_monster_main: Union[None, int] = None
-        self._cache_number_monster_arquetype_main: Union[None, int] = None
-        self._cache_number_monster_generic_main: Union[None, int] = None
-
-        self._cache_number_spell_main: Union[None, int] = None
-        self._cache_number_spell_arquetype_main: Union[None, int] = None
-        self._cache_number_spell_generic_main: Union[None, int] = None
-
-        self._cache_number_trap_main: Union[None, int] = None
-        self._cache_number_trap_arquetype_main: Union[None, int] = None
-        self._cache_number_trap_generic_main: Union[None, int] = None
-
-        # Caches para banlist
-        self._cache_number_cards_banlist: Union[None, int] = None
-        self._cache_number_cards_banlist_main: Union[None, int] = None
-        self._cache_number_cards_banlist_extra: Union[None, int] = None
-        self._cache_number_cards_banlist_side: Union[None, int] = None
-
-        self._cache_number_cards_invalid_banlist: Union[None, int] = None
-        self._cache_cods: Union[None, List[int]] = None
-        self._cache_conditions: Union[None, List[int]] = None
 
+class FrameDeck(Combination):
+    def __init__(
+        self,
+        deck_list: Union[str, PathLike],
+        catalog: Union[CardCatalog, None] = None,
+        buscas: Union[Dict[str, CardLookup], None] = None
+    ) -> None:
+        super().__init__(deck_list, catalog, buscas)
+        # Tensor de contagens: parte x tipo x classe x banlist -> copias
+        self._cache_contagens: Union[None, np.ndarray] = None
+        # Cartas da banlist presentes no deck (codigo e condicao)
+        self._cache_banlist_no_deck: Union[None, Dict[str, List]] = None
         # Cache da estrutura de dados do deck
         self._cache_strutura_deck: Union[None, dict] = None
 
@@ -87,284 +58,186 @@ class FrameDeck(Combination):
             self.side
         ], axis=0).reset_index(drop=True)
 
+    @property
+    def contagens(self) -> np.ndarray:
+        """
+        Soma de cópias do deck agregada em uma única passada, indexada por
+        `[parte, tipo, classe, banlist]`:
+
+        - parte: `PARTES` -> main, extra, side
+        - tipo: `TIPOS` -> monster, spell, trap, outro
+        - classe: `CLASSES` -> arquetype, generic, invalid, outro
+        - banlist: 0 fora da banlist, 1 na banlist
+
+        Todas as propriedades `full_*` e `number_*` são leituras deste tensor.
+        """
+        if self._cache_contagens is None:
+            self._cache_contagens = self.__agrega_contagens_()
+        return self._cache_contagens
+
+    def __agrega_contagens_(self) -> np.ndarray:
+        """Classifica cada linha da deck-list e soma as cópias no tensor de contagens."""
+        deck = self.decklist()
+        tipo = deck['tipo'].astype(str)
+        arquetype = deck['arquetype']
+        eh_arquetipo = self.arquetype != 'generic'
+
+        parte = deck['categoria'].map({p: i for i, p in enumerate(PARTES)})
+        eixo_tipo = np.select([
+            tipo.str.contains('Monster', regex=False).to_numpy(),
+            (tipo == 'Spell').to_numpy(),
+            (tipo == 'Trap').to_numpy()
+        ], [0, 1, 2], default=3)
+        eixo_classe = np.select([
+            (arquetype == self.arquetype).to_numpy() & eh_arquetipo,
+            (arquetype == 'generic').to_numpy(),
+            (arquetype == 'invalid').to_numpy()
+        ], [0, 1, 2], default=3)
+        eixo_ban = deck['cod'].isin(self.VETOR_COD_BANLIST).to_numpy(dtype=int)
+
+        tensor = np.zeros((len(PARTES), len(TIPOS), len(CLASSES), 2), dtype=np.int64)
+        np.add.at(
+            tensor,
+            (parte.to_numpy(dtype=int), eixo_tipo, eixo_classe, eixo_ban),
+            deck['qtd_copy'].to_numpy(dtype=np.int64)
+        )
+        tensor.flags.writeable = False
+        return tensor
+
+    def _soma(
+        self,
+        parte: Union[int, slice] = slice(None),
+        tipo: Union[int, slice] = slice(None),
+        classe: Union[int, slice] = slice(None),
+        ban: Union[int, slice] = slice(None)
+    ) -> int:
+        """Soma um recorte do tensor de contagens."""
+        return int(self.contagens[parte, tipo, classe, ban].sum())
+
     @property
     def full_cards_main(self) -> int:
         """Retorna o número total de cartas do main deck."""
-        if self._cache_full_main is None:
-            self._cache_full_main = int(self.main['qtd_copy'].sum(axis=0))
-        return self._cache_full_main
+        return self._soma(parte=MAIN)
 
     @property
     def full_cards_extra(self) -> int:
         """Retorna o número total de cartas do extra deck."""
-        if self._cache_full_extra is None:
-            self._cache_full_extra = int(self.extra['qtd_copy'].sum(axis=0))
-        return self._cache_full_extra
+        return self._soma(parte=EXTRA)
 
     @property
     def full_cards_side(self) -> int:
         """Retorna o total de cartas do side deck."""
-        if self._cache_full_side is None:
-            self._cache_full_side = int(self.side['qtd_copy'].sum(axis=0))
-        return self._cache_full_side
+        return self._soma(parte=SIDE)
 
     @property
     def full_cards_arquetype(self) -> int:
         """Retorna o total de cartas do arquétipo em todo o deck."""
-        if self._cache_full_arquetype is None:
-            self._cache_full_arquetype = self.number_cards_arquetype_main + \
-                                            self.number_cards_arquetype_extra + \
-                                                self.number_cards_arquetype_side
-        return self._cache_full_arquetype
+        return self._soma(classe=ARQUETYPE)
 
     @property
     def full_cards_generic(self) -> int:
         """Retorna o total de cartas genericas em todo o deck."""
-        if self._cache_full_generic is None:
-            self._cache_full_generic = self.number_cards_generic_main + \
-                                            self.number_cards_generic_extra + \
-                                                self.number_cards_generic_side
-        return self._cache_full_generic
+        return self._soma(classe=GENERIC)
 
     @property
     def full_cards_invalid(self) -> int:
         """Retorna o total de cartas invalidas em todo o deck."""
-        if self._cache_full_invalid is None:
-            self._cache_full_invalid = self.number_cards_invalid_main + \
-                                            self.number_cards_invalid_extra + \
-                                                self.number_cards_invalid_side
-        return self._cache_full_invalid
+        return self._soma(classe=INVALID)
 
     @property
     def full_cards_deck(self) -> int:
         """Retorna o número total de cartas do deck."""
-        if self._cache_full_cards is None:
-            self._cache_full_cards = self.full_cards_main + \
-                                            self.full_cards_extra + \
-                                                self.full_cards_side
-        return self._cache_full_cards
+        return self._soma()
 
     @property
     def number_cards_arquetype_main(self) -> int:
         """Retorna o número total de cartas do arquetipo no main deck."""
-        if self._cache_number_cards_arquetype_main is None:
-            if self.arquetype == 'generic':
-                self._cache_number_cards_arquetype_main = 0
-            else:
-                self._cache_number_cards_arquetype_main = int(
-                    self.main.loc[
-                        self.main['arquetype'] == self.arquetype
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_cards_arquetype_main
+        return self._soma(parte=MAIN, classe=ARQUETYPE)
 
     @property
     def number_cards_generic_main(self) -> int:
         """Retorna o número total de cartas genericas no main deck."""
-        if self._cache_number_cards_generic_main is None:
-            self._cache_number_cards_generic_main = int(
-                self.main.loc[
-                    self.main['arquetype'] == 'generic'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_generic_main
+        return self._soma(parte=MAIN, classe=GENERIC)
 
     @property
     def number_cards_invalid_main(self) -> int:
         """Retorna o número total de cartas invalidas no main deck."""
-        if self._cache_number_cards_invalid_main is None:
-            self._cache_number_cards_invalid_main = int(
-                self.main.loc[
-                    self.main['arquetype'] == 'invalid'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_invalid_main
+        return self._soma(parte=MAIN, classe=INVALID)
 
     @property
     def number_cards_arquetype_extra(self) -> int:
         """Retorna o número total de cartas do arquetipo no extra deck."""
-        if self._cache_number_cards_arquetype_extra is None:
-            if self.arquetype == 'generic':
-                self._cache_number_cards_arquetype_extra = 0
-            else:
-                self._cache_number_cards_arquetype_extra = int(
-                    self.extra.loc[
-                        self.extra['arquetype'] == self.arquetype
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_cards_arquetype_extra
+        return self._soma(parte=EXTRA, classe=ARQUETYPE)
 
     @property
     def number_cards_generic_extra(self) -> int:
         """Retorna o número total de cartas genericas no extra deck."""
-        if self._cache_number_cards_generic_extra is None:
-            self._cache_number_cards_generic_extra = int(
-                self.extra.loc[
-                    self.extra['arquetype'] == 'generic'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_generic_extra
+        return self._soma(parte=EXTRA, classe=GENERIC)
 
     @property
     def number_cards_invalid_extra(self) -> int:
         """Retorna o número total de cartas invalidas no extra deck."""
-        if self._cache_number_cards_invalid_extra is None:
-            self._cache_number_cards_invalid_extra = int(
-                self.extra.loc[
-                    self.extra['arquetype'] == 'invalid'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_invalid_extra
+        return self._soma(parte=EXTRA, classe=INVALID)
 
     @property
     def number_cards_arquetype_side(self) -> int:
         """Retorna o número total de cartas do arquetipo no side deck."""
-        if self._cache_number_cards_arquetype_side is None:
-            if self.arquetype == 'generic':
-                self._cache_number_cards_arquetype_side = 0
-            else:
-                self._cache_number_cards_arquetype_side = int(
-                    self.side.loc[
-                        self.side['arquetype'] == self.arquetype
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_cards_arquetype_side
+        return self._soma(parte=SIDE, classe=ARQUETYPE)
 
     @property
     def number_cards_generic_side(self) -> int:
         """Retorna o número total de cartas genericas no side deck."""
-        if self._cache_number_cards_generic_side is None:
-            self._cache_number_cards_generic_side = int(
-                self.side.loc[
-                    self.side['arquetype'] == 'generic'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_generic_side
+        return self._soma(parte=SIDE, classe=GENERIC)
 
     @property
     def number_cards_invalid_side(self) -> int:
         """Retorna o número total de cartas invalidas no side deck."""
-        if self._cache_number_cards_invalid_side is None:
-            self._cache_number_cards_invalid_side = int(
-                self.side.loc[
-                    self.side['arquetype'] == 'invalid'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_cards_invalid_side
+        return self._soma(parte=SIDE, classe=INVALID)
 
     @property
     def number_monster_main(self) -> int:
         """Retorna o número de monstros no main deck pela quantidade de copias."""
-        if self._cache_number_monster_main is None:
-            self._cache_number_monster_main = int(
-                self.main.loc[
-                    self.main['tipo'].apply(lambda x: 'Monster' in x)
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_monster_main
+        return self._soma(parte=MAIN, tipo=MONSTER)
 
     @property
     def number_monster_arquetype_main(self) -> int:
         """Retorna o número de monstros do arquetipo no main deck pela quantidade de copias."""
-        if self._cache_number_monster_arquetype_main is None:
-            if self.arquetype == 'generic':
-                self._cache_number_monster_arquetype_main = 0
-            else:
-                self._cache_number_monster_arquetype_main = int(
-                    self.main.loc[
-                        (self.main['tipo'].apply(lambda x: 'Monster' in x)) &
-                        (self.main['arquetype'].isin([self.arquetype]))
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_monster_arquetype_main
+        return self._soma(parte=MAIN, tipo=MONSTER, classe=ARQUETYPE)
 
     @property
     def number_monster_generic_main(self) -> int:
         """Retorna o número de monstros genericos do main deck pela quantidade de copias."""
-        if self._cache_number_monster_generic_main is None:
-            self._cache_number_monster_generic_main = int(
-                self.main.loc[
-                    (self.main['tipo'].apply(lambda x: 'Monster' in x)) &
-                    (self.main['arquetype'].isin(['generic']))
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_monster_generic_main
+        return self._soma(parte=MAIN, tipo=MONSTER, classe=GENERIC)
 
     @property
     def number_spell_main(self) -> int:
         """Retorna o número de cartas magicas do main deck."""
-        if self._cache_number_spell_main is None:
-            self._cache_number_spell_main = int(
-                self.main.loc[
-                    self.main['tipo'] == 'Spell'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_spell_main
+        return self._soma(parte=MAIN, tipo=SPELL)
 
     @property
     def number_spell_arquetype_main(self) -> int:
         """Retorna o número de cartas magicas do arquetipo no main deck."""
-        if self._cache_number_spell_arquetype_main is None:
-            if self.arquetype == 'generic':
-                self._cache_number_spell_arquetype_main = 0
-            else:
-                self._cache_number_spell_arquetype_main = int(
-                    self.main.loc[
-                        (self.main['tipo'] == 'Spell') &
-                        (self.main['arquetype'].isin([self.arquetype]))
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_spell_arquetype_main
+        return self._soma(parte=MAIN, tipo=SPELL, classe=ARQUETYPE)
 
     @property
     def number_spell_generic_main(self) -> int:
         """Retorna o número de cartas magicas genericas do main deck."""
-        if self._cache_number_spell_generic_main is None:
-            self._cache_number_spell_generic_main = int(
-                self.main.loc[
-                    (self.main['tipo'] == 'Spell') &
-                    (self.main['arquetype'].isin(['generic']))
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_spell_generic_main
+        return self._soma(parte=MAIN, tipo=SPELL, classe=GENERIC)
 
     @property
     def number_trap_main(self) -> int:
         """Retorna o número de cartas de armadilha do main deck."""
-        if self._cache_number_trap_main is None:
-            self._cache_number_trap_main = int(
-                self.main.loc[
-                    self.main['tipo'] == 'Trap'
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_trap_main
+        return self._soma(parte=MAIN, tipo=TRAP)
 
     @property
     def number_trap_arquetype_main(self) -> int:
         """Retorna o número de cartas de armadilha do arquetipo no main deck."""
-        if self._cache_number_trap_arquetype_main is None:
-            if self.arquetype == 'generic':
-                self._cache_number_trap_arquetype_main = 0
-            else:
-                self._cache_number_trap_arquetype_main = int(
-                    self.main.loc[
-                        (self.main['tipo'] == 'Trap') &
-                        (self.main['arquetype'].isin([self.arquetype]))
-                    ]['qtd_copy'].sum(axis=0)
-                )
-        return self._cache_number_trap_arquetype_main
+        return self._soma(parte=MAIN, tipo=TRAP, classe=ARQUETYPE)
 
     @property
     def number_trap_generic_main(self) -> int:
         """Retorna o número de cartas de armadilha genericas do main deck."""
-        if self._cache_number_trap_generic_main is None:
-            self._cache_number_trap_generic_main = int(
-                self.main.loc[
-                    (self.main['tipo'] == 'Trap') &
-                    (self.main['arquetype'].isin(['generic']))
-                ]['qtd_copy'].sum(axis=0)
-            )
-        return self._cache_number_trap_generic_main
+        return self._soma(parte=MAIN, tipo=TRAP, classe=GENERIC)
 
     def cards_invalids_banlist(self) -> DataFrame:
         """Retorna o frame de cartas invalidas da banlist."""
@@ -378,73 +251,49 @@ class FrameDeck(Combination):
     @property
     def number_cards_banlist(self) -> int:
         """Retorna o número de cartas na banlist inseridas na deck-list."""
-        if self._cache_number_cards_banlist is None:
-            cache = self.decklist()
-            cod_banlist = self.BANLIST['cod'].astype(int).unique()
-            cards_na_lista = cache.loc[cache['cod'].isin(cod_banlist)]
-            self._cache_number_cards_banlist = int(cards_na_lista['qtd_copy'].sum(axis=0))
-        return self._cache_number_cards_banlist
+        return self._soma(ban=1)
 
     @property
     def number_cards_banlist_main(self) -> int:
         """Retorna o número de cartas na banlist, apenas no main deck."""
-        if self._cache_number_cards_banlist_main is None:
-            cache = self.main.copy()
-            cod_banlist = self.BANLIST['cod'].astype(int).unique()
-            cards_na_lista = cache.loc[cache['cod'].isin(cod_banlist)]
-            self._cache_number_cards_banlist_main = int(cards_na_lista['qtd_copy'].sum(axis=0))
-        return self._cache_number_cards_banlist_main
+        return self._soma(parte=MAIN, ban=1)
 
     @property
     def number_cards_banlist_extra(self) -> int:
         """Retorna o número de cartas na banlist, apenas no extra deck."""
-        if self._cache_number_cards_banlist_extra is None:
-            cache = self.extra.copy()
-            cod_banlist = self.BANLIST['cod'].astype(int).unique()
-            cards_na_lista = cache.loc[cache['cod'].isin(cod_banlist)]
-            self._cache_number_cards_banlist_extra = int(cards_na_lista['qtd_copy'].sum(axis=0))
-        return self._cache_number_cards_banlist_extra
+        return self._soma(parte=EXTRA, ban=1)
 
     @property
     def number_cards_banlist_side(self) -> int:
         """Retorna o número de cartas na banlist, apenas no side deck."""
-        if self._cache_number_cards_banlist_side is None:
-            cache = self.side.copy()
-            cod_banlist = self.BANLIST['cod'].astype(int).unique()
-            cards_na_lista = cache.loc[cache['cod'].isin(cod_banlist)]
-            self._cache_number_cards_banlist_side = int(cards_na_lista['qtd_copy'].sum(axis=0))
-        return self._cache_number_cards_banlist_side
+        return self._soma(parte=SIDE, ban=1)
 
     @property
     def number_cards_invalid_banlist(self) -> int:
         """Retorna o número de cartas que estão invalidadas pela banlist no deck."""
-        if self._cache_number_cards_invalid_banlist is None:
-            self._cache_number_cards_invalid_banlist = self.cards_invalids_banlist().shape[0]
-        return self._cache_number_cards_invalid_banlist
+        return self.cards_invalids_banlist().shape[0]
 
     def cards_banlist_no_deck(self) -> Dict[str, List]:
         """Retorna um dicionário com a lista dos códigos, quantidade de copias e condicoes de copias no deck."""
-        cache = self.decklist()
-        cache = cache.loc[cache['cod'].isin(self.VETOR_COD_BANLIST)]
-        cache = cache.groupby('cod', as_index=False).agg({
-            'qtd_copy': 'sum',
-            'condition': 'first'
-        })
-        return cache.to_dict(orient='list')
+        if self._cache_banlist_no_deck is None:
+            cache = self.decklist()
+            cache = cache.loc[cache['cod'].isin(self.VETOR_COD_BANLIST)]
+            cache = cache.groupby('cod', as_index=False).agg({
+                'qtd_copy': 'sum',
+                'condition': 'first'
+            })
+            self._cache_banlist_no_deck = cache.to_dict(orient='list')
+        return self._cache_banlist_no_deck
 
     @property
     def cod_cards_banlist_no_deck(self) -> List[int]:
         """Retorna os códigos das cartas que estão na banlist incluidas no deck."""
-        if self._cache_cods is None:
-            self._cache_cods = self.cards_banlist_no_deck()['cod']
-        return self._cache_cods
+        return self.cards_banlist_no_deck()['cod']
 
     @property
     def vetor_condition_cards_banlist(self) -> List[int]:
         """Retorna em cada index o valor correspondente a copias permitidas por cópia em relação ao código."""
-        if self._cache_conditions is None:
-            self._cache_conditions = self.cards_banlist_no_deck()['condition']
-        return self._cache_conditions
+        return self.cards_banlist_no_deck()['condition']
 
     def cards_invalids(self) -> DataFrame:
         """Analisa todo o deck em busca de cartas invalidas por arquétipo."""
@@ -459,46 +308,23 @@ class FrameDeck(Combination):
         """Retorna o dicionario do deck, sendo o dicionário código das cartas."""
         return self.read_url(self.YDKE)
 
-    def get_struct_complet_deck(self):
-        dir_file_cards = os.path.join(
-            os.path.dirname(__file__), 'json', 'data_cards_official.json'
-        )
-        with open(dir_file_cards, 'r', encoding='utf-8') as file:
-            struct_cards = json.loads(file.read())
-
-        list_data_cards = struct_cards
-        def select_card_structure(cod: int):
-            str_cod = str(cod)
-            
-            for card in list_data_cards:
-                # Verifica se o código está no ID do card
-                if str(card['id']) == str_cod:
-                    return {
-                        'card_images': card['card_images'],
-                        'desc': card['desc'],
-                        'frameType': card['frameType'],
-                        'humanReadableCardType': card['humanReadableCardType'],
-                        'id': card['id'],
-                        'name': card['name'],
-                        'race': card['race'],
-                        'type': card['type'],
-                        'ygoprodeck_url': card['ygoprodeck_url']
-                    }
-
-                # Verifica se o código está no ID das imagens
-                for image in card['card_images']:
-                    if str(image['id']) == str_cod:
-                        return {
-                            'card_images': card['card_images'],
-                            'desc': card['desc'],
-                            'frameType': card['frameType'],
-                            'humanReadableCardType': card['humanReadableCardType'],
-                            'id': image['id'],  # ID alterado aqui
-                            'name': card['name'],
-                            'race': card['race'],
-                            'type': card['type'],
-                            'ygoprodeck_url': card['ygoprodeck_url']
-                        }
+    @classmethod
+    def struct_deck(cls, deck: Dict[str, List[int]], catalog: CardCatalog) -> Dict[str, List[Dict]]:
+        """
+        Monta a estrutura oficial (ygoprodeck) de cada carta de um deck já
+        decodificado, resolvida pelo índice de códigos compartilhado do catálogo.
+
+        Args:
+            deck (Dict[str, List[int]]): Deck com as chaves 'main', 'extra' e 'side'.
+            catalog (CardCatalog): Catálogo compartilhado de cartas.
+
+        Returns:
+            Dict[str, List[Dict]]: Estruturas das cartas em cada parte, na ordem do deck.
+        """
+        def select_card_structure(cod: int) -> Dict:
+            estrutura = catalog.card_structure(cod)
+            if estrutura is not None:
+                return estrutura
 
             # Retorna um dicionário vazio padrão caso nada seja encontrado
             return {
@@ -518,13 +344,18 @@ class FrameDeck(Combination):
                 'ygoprodeck_url': 'https://ygoprodeck.com/card/found'
             }
 
-
-        cache_cod = self.get_deck()
-        main = list(map(select_card_structure, cache_cod['main']))
-        extra = list(map(select_card_structure, cache_cod['extra']))
-        side = list(map(select_card_structure, cache_cod['side']))
+        main = list(map(select_card_structure, deck['main']))
+        extra = list(map(select_card_structure, deck['extra']))
+        side = list(map(select_card_structure, deck['side']))
         return { 'main': main, 'extra': extra, 'side': side}
 
+    def get_struct_complet_deck(self) -> Dict[str, List[Dict]]:
+        """
+        Retorna a estrutura oficial (ygoprodeck) de cada carta do deck,
+        resolvida pelo índice de códigos compartilhado do catálogo.
+        """
+        return self.struct_deck(self.get_deck(), self.CATALOG)
+
     def get_dict_deck(self) -> Dict:
         """
         Retorna todos os dados da deck-list como dicionário.
@@ -604,6 +435,83 @@ class FrameDeck(Combination):
             }
         return self._cache_strutura_deck
 
+    @classmethod
+    def analyze_many(cls, links: Iterable[str], catalog: CardCatalog) -> Iterator[Dict]:
+        """
+        Analisa um lote de links YDKE. Todos os links são decodificados de
+        uma vez (`CoreYDKE.decode_batch`) e todos os códigos de todas as
+        partes são resolvidos no catálogo em uma única busca; a classificação
+        e a banlist rodam uma vez por deck distinto (`CoreYDKE.dedup_batch`)
+        sobre os quadros já resolvidos, e cada resultado é entregue assim que
+        fica pronto.
+
+        Args:
+            links (Iterable[str]): Links YDKE do lote.
+            catalog (CardCatalog): Catálogo compartilhado de cartas.
+
+        Returns:
+            Iterator[Dict]: Um dicionário por deck, na ordem dos links:
+                - index (int)
+                - ydke (str)
+                - deck (Dict) resultado de `get_dict_deck`, ou
+                - error (str) em caso de falha no deck
+        """
+        partes = ('main', 'extra', 'side')
+        links = [str(l).replace('\n', '').replace(' ', '').replace('\t', '') for l in links]
+        lote = CoreYDKE.decode_batch(links)
+        # Decks iguais em qualquer ordem sao analisados uma unica vez
+        unicos, grupos = CoreYDKE.dedup_batch(lote)
+        buscas = catalog.lookup_many([lote.part(i, p) for i in unicos for p in partes])
+        restantes = np.bincount(grupos[grupos >= 0], minlength=len(unicos))
+        resultados: Dict[int, Dict] = {}
+
+        for i, link in enumerate(links):
+            grupo = int(grupos[i])
+            if grupo < 0:
+                yield {'index': i, 'ydke': link, 'error': str(lote.errors[i])}
+                continue
+            if grupo not in resultados:
+                try:
+                    busca = dict(zip(partes, buscas[grupo * len(partes):(grupo + 1) * len(partes)]))
+                    resultados[grupo] = {'deck': cls(link, catalog, busca).get_dict_deck()}
+                except Exception as e:
+                    resultados[grupo] = {'error': f'{type(e).__name__}: {e}'}
+
+            resultado = resultados[grupo]
+            restantes[grupo] -= 1
+            if restantes[grupo] == 0:
+                del resultados[grupo]
+            if 'deck' in resultado and resultado['deck']['ydke'] != link:
+                resultado = {'deck': cls.rebind(resultado['deck'], link, lote.deck(i), catalog)}
+            yield {'index': i, 'ydke': link, **resultado}
+
+    @classmethod
+    def rebind(
+        cls, dados: Dict, ydke: str, deck: Dict[str, List[int]], catalog: CardCatalog
+    ) -> Dict:
+        """
+        Reaproveita o `get_dict_deck` de um deck igual (mesma impressão
+        digital canônica) para outro link. Só os campos que dependem da ordem
+        do link, `ydke` e `decklist`, são montados de novo.
+
+        Args:
+            dados (Dict): Resultado de `get_dict_deck` do deck igual.
+            ydke (str): Link do deck.
+            deck (Dict[str, List[int]]): O link decodificado por `read_url`.
+            catalog (CardCatalog): Catálogo compartilhado de cartas.
+
+        Returns:
+            Dict: Resultado de `get_dict_deck` do link.
+        """
+        return {
+            **dados,
+            'ydke': ydke.strip().replace(' ', ''),
+            'decklist': {
+                'cod': deck,
+                'deck': cls.struct_deck(deck, catalog)
+            }
+        }
+
     def get_dict_card(self, cod: int) -> Dict:
         """Retorna um dicionário com os dados da carta na deck-list."""
         frame = self.decklist()
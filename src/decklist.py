@@ -0,0 +1,257 @@
+#
+# Python 3.11.10
+#
+import re
+import difflib
+import sqlite3
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from pandas import DataFrame                # type: ignore
+
+try:
+    from ydke import CoreYDKE, DeckBatch, PARTES
+    from base import CardDatabasePool
+    from catalog import CardCatalog
+    from lru import ResultCache
+except:
+    from src.ydke import CoreYDKE, DeckBatch, PARTES
+    from src.base import CardDatabasePool
+    from src.catalog import CardCatalog
+    from src.lru import ResultCache
+
+# Formato `decklist.txt`, o mesmo dos arquivos de `arquetypes/`:
+#
+#   Main Deck:
+#   Blue-Eyes White Dragon x3
+#   Extra Deck:
+#   ...
+#
+# Tambem sao aceitos `3 Nome`, `3x Nome`, `Nome 3x` e nomes sem quantidade
+# (1 copia).
+_SECAO = re.compile(r'^(main|extra|side)(?:\s+deck)?\s*(?:\(\s*\d+\s*\))?\s*:?$', re.IGNORECASE)
+_NOME_QTD = re.compile(r'^(?P<nome>.+?)\s*[xX×]\s*(?P<qtd>\d+)$')
+_NOME_QTD_X = re.compile(r'^(?P<nome>.+?)\s+(?P<qtd>\d+)\s*[xX×]$')
+_QTD_NOME = re.compile(r'^(?P<qtd>\d+)\s*[xX×]?\s+(?P<nome>.+)$')
+_NAO_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Semelhanca minima (difflib) para aceitar um nome aproximado
+CORTE_FUZZY: float = 0.85
+# Mais copias que isso em uma linha nao e uma lista de deck
+MAX_COPIAS: int = 60
+# Nomes aproximados memorizados por indice (LRU)
+MAX_APROXIMADOS: int = 4096
+
+
+def normaliza_nome(nome: str) -> str:
+    """
+    Chave de busca de um nome de carta: sem acentos, em minúsculas e com
+    toda pontuação trocada por um espaço.
+    """
+    texto = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode('ascii')
+    return _NAO_ALNUM.sub(' ', texto.casefold()).strip()
+
+
+class CardNameIndex:
+    """
+    Índice nome normalizado -> código da carta (`normaliza_nome`), montado
+    uma vez e consultado em O(1) por nome. Nomes que não batem exatamente
+    são aproximados com `difflib` entre as cartas que compartilham as
+    palavras mais raras do nome; sem nenhuma palavra em comum não há
+    aproximação. As últimas `memoria` aproximações ficam memorizadas.
+
+    Args:
+        nomes (Iterable[Tuple[str, int]]): Pares (nome, código); o primeiro
+        código de cada nome é o usado.
+        corte (float): Semelhança mínima para aceitar uma aproximação.
+        memoria (int): Aproximações memorizadas (LRU).
+    """
+    def __init__(
+        self, nomes: Iterable[Tuple[str, int]], corte: float = CORTE_FUZZY,
+        memoria: int = MAX_APROXIMADOS
+    ) -> None:
+        self.corte: float = corte
+        self.__CODIGOS: Dict[str, int] = {}
+        for nome, cod in nomes:
+            chave = normaliza_nome(str(nome))
+            if chave:
+                self.__CODIGOS.setdefault(chave, int(cod))
+
+        self.__NOMES: List[str] = list(self.__CODIGOS)
+        self.__PALAVRAS: Dict[str, List[str]] = {}
+        for chave in self.__NOMES:
+            for palavra in set(chave.split()):
+                self.__PALAVRAS.setdefault(palavra, []).append(chave)
+        # Valores em tupla: `(None,)` memoriza um nome sem aproximacao
+        self.__APROXIMADOS = ResultCache(memoria, float('inf'))
+
+    @classmethod
+    def from_frame(cls, frame: DataFrame) -> 'CardNameIndex':
+        """Índice das colunas `card_name` e `cod` (ex.: `complet.csv`)."""
+        return cls(zip(frame['card_name'].astype(str), frame['cod']))
+
+    @classmethod
+    def from_catalog(
+        cls, catalog: CardCatalog, pool: Union[CardDatabasePool, None] = None
+    ) -> 'CardNameIndex':
+        """
+        Índice das cartas do catálogo (`complet.csv`) completado pelos nomes
+        do banco `cardgame.db`, quando ele existir.
+
+        Args:
+            catalog (CardCatalog): Catálogo compartilhado de cartas.
+            pool (Union[CardDatabasePool, None]): Pool do banco, padrão o compartilhado.
+        """
+        nomes = list(zip(catalog.complet['card_name'].astype(str), catalog.complet['cod']))
+        pool = CardDatabasePool.shared() if pool is None else pool
+        try:
+            with pool.connection() as conx:
+                nomes.extend((nome, cod) for cod, nome in conx.execute(
+                    'SELECT id, name FROM cards WHERE name IS NOT NULL'
+                ))
+        except sqlite3.Error:
+            # Sem o banco o indice fica so com o catalogo
+            pass
+        return cls(nomes)
+
+    def __len__(self) -> int:
+        return len(self.__NOMES)
+
+    def exact(self, nome: str) -> Union[int, None]:
+        """Código do nome normalizado, sem aproximação."""
+        return self.__CODIGOS.get(normaliza_nome(nome))
+
+    def resolve(self, nome: str) -> Tuple[Union[int, None], Union[str, None]]:
+        """
+        Código da carta pelo nome, exato ou aproximado.
+
+        Returns:
+            Tuple[Union[int, None], Union[str, None]]: O código (None se não
+            encontrado) e o nome normalizado usado quando houve aproximação.
+        """
+        chave = normaliza_nome(nome)
+        if chave in self.__CODIGOS:
+            return self.__CODIGOS[chave], None
+        if not chave:
+            return None, None
+
+        memorizado = self.__APROXIMADOS.get('', chave)
+        if memorizado is None:
+            memorizado = (self.__aproxima_(chave),)
+            self.__APROXIMADOS.put('', chave, memorizado)
+        aproximado = memorizado[0]
+        return (None, None) if aproximado is None else (self.__CODIGOS[aproximado], aproximado)
+
+    def __aproxima_(self, chave: str) -> Union[str, None]:
+        """Nome mais parecido entre as cartas com as palavras mais raras da chave."""
+        listas = sorted(
+            (self.__PALAVRAS[p] for p in set(chave.split()) if p in self.__PALAVRAS), key=len
+        )
+        # Sem palavra em comum nao ha nome parecido o bastante: evita o
+        # difflib sobre o indice inteiro
+        if not listas:
+            return None
+        candidatos = set().union(*listas[:2])
+        proximos = difflib.get_close_matches(chave, candidatos, n=1, cutoff=self.corte)
+        return proximos[0] if proximos else None
+
+
+class ParsedDecklist(NamedTuple):
+    """
+    Resultado de `DecklistParser.parse`.
+
+    Attributes:
+        deck (Dict[str, List[int]]): Deck no formato de `CoreYDKE.read_url`.
+        unknown (List[Dict]): Linhas não reconhecidas: `line`, `text` e `section`.
+        fuzzy (List[Dict]): Linhas com nome aproximado: `line`, `text`, `match` e `cod`.
+    """
+    deck: Dict[str, List[int]]
+    unknown: List[Dict]
+    fuzzy: List[Dict]
+
+
+class DecklistParser:
+    """
+    Converte listas em texto (`decklist.txt`, seções `Main Deck:`,
+    `Extra Deck:` e `Side Deck:` com linhas `Nome xN`) em decks, uma
+    consulta ao `CardNameIndex` por linha.
+
+    Args:
+        index (CardNameIndex): Índice de nomes das cartas.
+    """
+    def __init__(self, index: CardNameIndex) -> None:
+        self.INDEX: CardNameIndex = index
+
+    @classmethod
+    def from_catalog(cls, catalog: CardCatalog) -> 'DecklistParser':
+        """Parser com o índice de `CardNameIndex.from_catalog`."""
+        return cls(CardNameIndex.from_catalog(catalog))
+
+    def __linha_(self, linha: str) -> Tuple[Union[int, None], int, Union[str, None]]:
+        """Código, cópias e nome aproximado de uma linha de carta."""
+        casou = _NOME_QTD.match(linha)
+        if casou is not None:
+            cod, aproximado = self.INDEX.resolve(casou['nome'])
+            return cod, int(casou['qtd']), aproximado
+
+        # Nomes que comecam ou terminam com numero valem antes de `3 Nome`
+        cod = self.INDEX.exact(linha)
+        if cod is not None:
+            return cod, 1, None
+        casou = _NOME_QTD_X.match(linha) or _QTD_NOME.match(linha)
+        if casou is not None:
+            cod, aproximado = self.INDEX.resolve(casou['nome'])
+            return cod, int(casou['qtd']), aproximado
+        cod, aproximado = self.INDEX.resolve(linha)
+        return cod, 1, aproximado
+
+    def parse(self, texto: str) -> ParsedDecklist:
+        """
+        Interpreta uma lista em texto. Linhas antes de qualquer seção vão
+        para o `main`; outros cabeçalhos terminados em `:` são ignorados.
+
+        Args:
+            texto (str): Conteúdo da lista.
+
+        Returns:
+            ParsedDecklist: O deck, as linhas não reconhecidas e as aproximações.
+        """
+        deck: Dict[str, List[int]] = {p: [] for p in PARTES}
+        unknown: List[Dict] = []
+        fuzzy: List[Dict] = []
+        parte = 'main'
+        for n, linha in enumerate(texto.lstrip('\ufeff').splitlines(), 1):
+            linha = linha.strip()
+            if not linha:
+                continue
+            secao = _SECAO.match(linha)
+            if secao is not None:
+                parte = secao[1].lower()
+                continue
+            if linha.endswith(':'):
+                continue
+
+            cod, copias, aproximado = self.__linha_(linha)
+            if cod is None or not 0 < copias <= MAX_COPIAS:
+                unknown.append({'line': n, 'text': linha, 'section': parte})
+                continue
+            if aproximado is not None:
+                fuzzy.append({'line': n, 'text': linha, 'match': aproximado, 'cod': cod})
+            deck[parte].extend([cod] * copias)
+        return ParsedDecklist(deck, unknown, fuzzy)
+
+    def parse_many(self, textos: Iterable[str]) -> Tuple[DeckBatch, List[ParsedDecklist]]:
+        """
+        Interpreta um lote de listas; os nomes aproximados são memorizados
+        no índice e não se repetem entre as listas.
+
+        Returns:
+            Tuple[DeckBatch, List[ParsedDecklist]]: Os decks no lote irregular
+            de `CoreYDKE` e o resultado de cada lista, na mesma ordem.
+        """
+        resultados = [self.parse(texto) for texto in textos]
+        return DeckBatch.from_decks([r.deck for r in resultados]), resultados
+
+    def to_url(self, texto: str) -> str:
+        """Link YDKE da lista em texto; as linhas não reconhecidas são ignoradas."""
+        return CoreYDKE().to_url(self.parse(texto).deck)
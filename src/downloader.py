@@ -0,0 +1,117 @@
+#
+# Python 3.11.10
+#
+import os
+import json
+import asyncio
+from typing import Dict, List, Tuple, Union
+
+from pandas import DataFrame                # type: ignore
+
+try:
+    from card import CardGame
+    from ban import BanSheetWeb
+    from client import AsyncHttpClient
+    from manifest import SourceManifest, grava_csv_atomico
+    from catalog import CardCatalog, ler_artefato
+except:
+    from src.card import CardGame
+    from src.ban import BanSheetWeb
+    from src.client import AsyncHttpClient
+    from src.manifest import SourceManifest, grava_csv_atomico
+    from src.catalog import CardCatalog, ler_artefato
+
+SHEETS_CARD: List[str] = ['min', 'complet', 'monster', 'spell', 'trap']
+SHEETS_BAN: List[str] = ['Home', 'Forbidden', 'Limited', 'Semi-limited', 'Unlimited']
+# Folhas de que o catalogo (banlist atual) depende, na ordem do CardCatalog
+SHEETS_CATALOGO: Tuple[str, ...] = ('card:complet', 'card:min', 'ban:Home')
+
+
+class DependencyDownloader:
+    """
+    Baixa todas as dependências de `cache/` e `var/` em um único event loop.
+
+    As dez folhas (cartas e banlist) são requisitadas ao mesmo tempo, com no
+    máximo `paralelo` requisições simultâneas por host. Cada folha alterada
+    (`SourceManifest`) é lida e gravada de forma atômica assim que chega; as
+    inalteradas não são tocadas. O novo `CardCatalog`, que cruza `complet`
+    com `Home` na banlist atual, começa a ser montado assim que `complet`,
+    `min` e `Home` estão prontos, enquanto as demais folhas ainda chegam.
+
+    Args:
+        paralelo (int): Requisições simultâneas por host.
+        manifest (Union[SourceManifest, None]): Manifesto das fontes, padrão
+        `data/sources.json`.
+        diretorio (Union[str, None]): Diretório com `cache/` e `var/`, padrão
+        o do pacote.
+    """
+    def __init__(
+        self, paralelo: int = 10, manifest: Union[SourceManifest, None] = None,
+        diretorio: Union[str, None] = None
+    ) -> None:
+        self.paralelo: int = paralelo
+        self.MANIFEST: SourceManifest = SourceManifest() if manifest is None else manifest
+        self.SRC: str = os.path.dirname(__file__) if diretorio is None else diretorio
+        self.ALTERADOS: List[str] = []
+
+        card_point = CardGame().get_end_point()
+        ban_point = BanSheetWeb().get_end_point()
+        # nome no manifesto -> (url, csv, separador, folha)
+        self.FONTES: Dict[str, Tuple[str, str, str, str]] = {}
+        for s in SHEETS_CARD:
+            url = card_point['point'].replace(card_point['sheet'], s)
+            self.FONTES[f'card:{s}'] = (url, os.path.join(self.SRC, 'cache', f'{s}.csv'), ';', s)
+        for s in SHEETS_BAN:
+            url = ban_point['point'].replace(ban_point['sheet'], s)
+            self.FONTES[f'ban:{s}'] = (url, os.path.join(self.SRC, 'var', f'{s}.csv'), '|', s)
+
+    @staticmethod
+    def __monta_frame_(nome: str, data: dict) -> DataFrame:
+        """Converte a resposta da folha em DataFrame com as colunas normalizadas."""
+        folha = nome.split(':', 1)[1]
+        if nome.startswith('card:'):
+            frame = CardGame().mount_frame(data, folha)
+        else:
+            frame = BanSheetWeb().clean_frame(data)
+        frame.columns = frame.columns.str.replace(' ', '_').str.lower()
+        return frame
+
+    async def __grava_folha_(self, nome: str, conteudo: bytes) -> None:
+        """Converte a folha alterada e grava o CSV de forma atômica."""
+        _, path, lim, _ = self.FONTES[nome]
+        frame = await asyncio.to_thread(self.__monta_frame_, nome, dict(json.loads(conteudo)))
+        await asyncio.to_thread(grava_csv_atomico, frame, path, lim)
+
+    async def __monta_catalogo_(self, folhas: Dict[str, asyncio.Task]) -> CardCatalog:
+        """Monta o catálogo assim que as folhas de que ele depende estão gravadas."""
+        await asyncio.gather(*(folhas[n] for n in SHEETS_CATALOGO))
+        frames = [
+            await asyncio.to_thread(ler_artefato, self.FONTES[n][1], self.FONTES[n][2])
+            for n in SHEETS_CATALOGO
+        ]
+        return await asyncio.to_thread(CardCatalog, *frames)
+
+    async def run(self, catalogo: bool = True) -> Union[CardCatalog, None]:
+        """
+        Executa o download completo e retorna o catálogo montado com os dados
+        gravados. O manifesto só é salvo se todas as folhas foram baixadas.
+
+        Args:
+            catalogo (bool): Monta o catálogo junto com os downloads; sem ele
+            só as folhas são gravadas e o retorno é None.
+
+        Raises:
+            ConnectionError: Se alguma folha falhar; as folhas gravadas até
+            ali continuam íntegras.
+        """
+        self.ALTERADOS = []
+        fontes = {nome: (url, path) for nome, (url, path, _, _) in self.FONTES.items()}
+        async with AsyncHttpClient(limite_host=self.paralelo) as client:
+            self.ALTERADOS, resultado = await self.MANIFEST.sync_async(
+                client, fontes, self.__grava_folha_, self.__monta_catalogo_ if catalogo else None
+            )
+        return resultado
+
+    def run_sync(self, catalogo: bool = True) -> Union[CardCatalog, None]:
+        """Executa `run` em um novo event loop."""
+        return asyncio.run(self.run(catalogo))
@@ -0,0 +1,125 @@
+#
+# Python 3.11.10
+#
+import os
+import re
+import json
+import codecs
+import tempfile
+from typing import Dict, Iterable, Iterator, Union
+
+# Leitura e escrita incremental do dump de cartas do ygoprodeck.
+#
+# A resposta de `cardinfo.php` e um objeto `{"data": [...], ...}` e o dump
+# salvo em `json/data_cards_official.json` e o array puro, uma carta por
+# linha. Nos dois casos as cartas sao decodificadas uma a uma, sem montar
+# a lista inteira em memoria.
+TAMANHO_BLOCO: int = 64 * 1024
+
+# Inicio do array: `[` direto ou como valor da chave `data`
+_INICIO = re.compile(r'\s*(?:\{\s*"data"\s*:\s*)?\[')
+_ESPACOS = re.compile(r'[\s,]*')
+
+
+def iter_json_array(chunks: Iterable[Union[str, bytes]]) -> Iterator[Dict]:
+    """
+    Decodifica os itens de um array JSON recebido em pedaços, um por vez.
+
+    Aceita um array no topo do documento ou o array da chave `data` quando
+    ela é a primeira do objeto, como na resposta da API. Só o item sendo
+    decodificado fica no buffer.
+
+    Args:
+        chunks (Iterable[Union[str, bytes]]): Pedaços do documento, em texto
+        ou bytes UTF-8.
+
+    Yields:
+        Dict: Cada item do array.
+
+    Raises:
+        ValueError: Se o documento não começar com um array reconhecido ou
+        terminar antes de fechá-lo.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    pedacos = iter(chunks)
+    buffer = ''
+    pos = 0
+    iniciado = False
+
+    def mais() -> bool:
+        nonlocal buffer, pos
+        for chunk in pedacos:
+            texto = utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if texto:
+                buffer = buffer[pos:] + texto
+                pos = 0
+                return True
+        return False
+
+    while True:
+        if not iniciado:
+            inicio = _INICIO.match(buffer)
+            if inicio is None:
+                # Com `[` no buffer o prefixo ja esta completo e nao casou
+                if '[' in buffer or not mais():
+                    raise ValueError('Dump sem array de cartas')
+                continue
+            pos = inicio.end()
+            iniciado = True
+
+        pos = _ESPACOS.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if not mais():
+                raise ValueError('Dump terminou antes do fim do array')
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            item, fim = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if not mais():
+                raise ValueError('Dump terminou antes do fim do array')
+            continue
+        # Numeros podem estar cortados no fim do pedaco
+        if fim == len(buffer) and mais():
+            continue
+        pos = fim
+        yield item
+
+
+def iter_file(path: str, tamanho: int = TAMANHO_BLOCO) -> Iterator[Dict]:
+    """Itera as cartas de um dump salvo em disco, lendo em blocos."""
+    with open(path, 'rb') as file:
+        yield from iter_json_array(iter(lambda: file.read(tamanho), b''))
+
+
+def write_file(path: str, cards: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Grava o dump compacto, uma carta por linha, à medida que as cartas são
+    consumidas, e repassa cada carta adiante. O arquivo só substitui o atual
+    (rename atômico) depois que o array inteiro foi escrito.
+
+    Args:
+        path (str): Caminho do dump.
+        cards (Iterable[Dict]): Cartas a gravar.
+
+    Yields:
+        Dict: As mesmas cartas recebidas.
+    """
+    diretorio = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.dump-', suffix='.json', dir=diretorio)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write('[')
+            separador = '\n'
+            for card in cards:
+                file.write(separador)
+                file.write(json.dumps(card, ensure_ascii=False, separators=(',', ':')))
+                separador = ',\n'
+                yield card
+            file.write('\n]\n')
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
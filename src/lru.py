@@ -0,0 +1,81 @@
+#
+# Python 3.11.10
+#
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Union
+
+
+class ResultCache:
+    """
+    Cache LRU com expiração (TTL) para resultados calculados, seguro para
+    uso entre threads. Cada entrada pertence a uma versão dos dados: quando
+    uma leitura ou escrita chega com uma versão diferente da atual, todas as
+    entradas antigas são descartadas.
+
+    Args:
+        maxsize (int): Número máximo de entradas mantidas.
+        ttl (float): Tempo de vida de cada entrada em segundos.
+    """
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.__DADOS: OrderedDict = OrderedDict()
+        self.__VERSAO: Union[str, None] = None
+        self.__LOCK = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def __confere_versao_(self, version: str) -> None:
+        """Descarta todas as entradas se a versão dos dados mudou."""
+        if version != self.__VERSAO:
+            if self.__DADOS:
+                self.invalidations += 1
+            self.__DADOS.clear()
+            self.__VERSAO = version
+
+    def get(self, version: str, key: Hashable) -> Union[Any, None]:
+        """
+        Retorna o valor da chave na versão informada, ou None se não existir
+        ou estiver expirado.
+        """
+        with self.__LOCK:
+            self.__confere_versao_(version)
+            entrada = self.__DADOS.get(key)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self.__DADOS[key]
+                self.misses += 1
+                return None
+            self.__DADOS.move_to_end(key)
+            self.hits += 1
+            return entrada[1]
+
+    def put(self, version: str, key: Hashable, value: Any) -> None:
+        """Guarda o valor da chave na versão informada, removendo o menos usado se cheio."""
+        with self.__LOCK:
+            self.__confere_versao_(version)
+            self.__DADOS[key] = (time.monotonic() + self.ttl, value)
+            self.__DADOS.move_to_end(key)
+            while len(self.__DADOS) > self.maxsize:
+                self.__DADOS.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove todas as entradas, mantendo os contadores."""
+        with self.__LOCK:
+            self.__DADOS.clear()
+
+    def stats(self) -> Dict[str, Union[int, float, str, None]]:
+        """Retorna contadores de acertos, falhas, invalidações e ocupação."""
+        with self.__LOCK:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self.__DADOS),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'version': self.__VERSAO
+            }
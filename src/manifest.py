@@ -0,0 +1,409 @@
+#
+# Python 3.11.10
+#
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+import httpx                                # type: ignore
+from pandas import DataFrame                # type: ignore
+
+try:
+    import colunar
+    from client import HttpClient, AsyncHttpClient
+except:
+    from src import colunar
+    from src.client import HttpClient, AsyncHttpClient
+
+TAMANHO_BLOCO: int = 1024 * 1024
+
+
+def _grava_json_atomico(path: str, dados: Dict) -> None:
+    """Grava um JSON em arquivo temporário e o troca pelo destino com rename."""
+    diretorio = os.path.dirname(os.path.abspath(path))
+    os.makedirs(diretorio, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.manifest-', suffix='.json', dir=diretorio)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(dados, file, ensure_ascii=False, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def sha256_arquivo(path: str) -> str:
+    """sha256 hexadecimal do arquivo, lido em blocos."""
+    hash_ = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for bloco in iter(lambda: file.read(TAMANHO_BLOCO), b''):
+            hash_.update(bloco)
+    return hash_.hexdigest()
+
+
+def remove_dir_atomico(path: str) -> bool:
+    """
+    Remove um diretório inteiro sem expor um estado parcial: ele é antes
+    renomeado para um nome temporário no mesmo pai e só então apagado.
+    Leitores veem o diretório completo ou nenhum.
+
+    Args:
+        path (str): Diretório a remover.
+
+    Returns:
+        bool: `True` se o diretório foi removido, `False` se não existia.
+    """
+    path = os.path.abspath(path)
+    if not os.path.isdir(path):
+        return False
+    lixo = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}-', dir=os.path.dirname(path))
+    try:
+        os.replace(path, os.path.join(lixo, 'removido'))
+    except FileNotFoundError:
+        # Outro processo removeu primeiro
+        os.rmdir(lixo)
+        return False
+    shutil.rmtree(lixo, ignore_errors=True)
+    return True
+
+
+class ArtifactManifest:
+    """
+    Manifesto dos artefatos locais de um diretório (`cache/` ou `var/`),
+    gravado em `<diretorio>/manifest.json`. Para cada CSV guarda a versão
+    (incrementada a cada conteúdo novo), o número de linhas, o sha256, o
+    tamanho e a data de modificação do arquivo gravado.
+
+    Os CSV são gravados por `write_csv` em um temporário, com `fsync` e
+    rename; leitores veem o arquivo antigo ou o novo, nunca um parcial.
+    Quem lê confere o arquivo com `verify`: se tamanho e data batem com o
+    registro ele é o mesmo já validado e pode ser reaproveitado sem nova
+    leitura nem validação.
+
+    Args:
+        diretorio (str): Diretório dos artefatos.
+    """
+    NOME: str = 'manifest.json'
+    VERSAO: int = 1
+    __LOCKS: Dict[str, threading.Lock] = {}
+    __LOCKS_LOCK = threading.Lock()
+
+    def __init__(self, diretorio: str) -> None:
+        self.diretorio: str = os.path.abspath(diretorio)
+        self.path: str = os.path.join(self.diretorio, self.NOME)
+        with self.__LOCKS_LOCK:
+            self.__LOCK = self.__LOCKS.setdefault(self.path, threading.Lock())
+
+    @classmethod
+    def of(cls, arquivo: str) -> 'ArtifactManifest':
+        """Manifesto do diretório do arquivo informado."""
+        return cls(os.path.dirname(os.path.abspath(arquivo)))
+
+    def __carrega_(self) -> Dict[str, Dict]:
+        """Registros gravados em disco, `{}` se o manifesto não existe ou é inválido."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                dados = json.load(file)
+            if dados.get('versao') == self.VERSAO:
+                return dict(dados.get('artefatos', {}))
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def entries(self) -> Dict[str, Dict]:
+        """Registro de todos os artefatos, pelo nome do arquivo."""
+        return self.__carrega_()
+
+    def entry(self, arquivo: str) -> Dict:
+        """Registro do artefato, `{}` se ele nunca foi gravado pelo manifesto."""
+        return dict(self.__carrega_().get(os.path.basename(arquivo), {}))
+
+    def record(self, arquivo: str, linhas: int, sha256: Union[str, None] = None) -> Dict:
+        """
+        Registra o arquivo como está em disco e grava o manifesto. O manifesto
+        é relido sob o lock, então gravações de arquivos diferentes não se
+        sobrescrevem.
+
+        Args:
+            arquivo (str): Caminho do artefato.
+            linhas (int): Número de linhas de dados.
+            sha256 (Union[str, None]): Hash já calculado, senão o arquivo é lido.
+
+        Returns:
+            Dict: O registro gravado.
+        """
+        nome = os.path.basename(arquivo)
+        sha256 = sha256_arquivo(arquivo) if sha256 is None else sha256
+        info = os.stat(arquivo)
+        with self.__LOCK:
+            artefatos = self.__carrega_()
+            anterior = artefatos.get(nome, {})
+            versao = int(anterior.get('version', 0))
+            entrada = {
+                'version': versao if anterior.get('sha256') == sha256 else versao + 1,
+                'rows': int(linhas),
+                'sha256': sha256,
+                'size': info.st_size,
+                'mtime_ns': info.st_mtime_ns,
+                'written_at': datetime.now().isoformat()
+            }
+            artefatos[nome] = entrada
+            _grava_json_atomico(self.path, {'versao': self.VERSAO, 'artefatos': artefatos})
+        return dict(entrada)
+
+    def verify(self, arquivo: str) -> Union[Dict, None]:
+        """
+        Confere o arquivo com o registro. Tamanho e data iguais bastam; se só a
+        data mudou o sha256 é recalculado e, batendo, o registro é atualizado.
+
+        Args:
+            arquivo (str): Caminho do artefato.
+
+        Returns:
+            Union[Dict, None]: O registro se o arquivo é o gravado, senão None.
+        """
+        entrada = self.entry(arquivo)
+        if not entrada or not os.path.exists(arquivo):
+            return None
+        info = os.stat(arquivo)
+        if info.st_size != entrada.get('size'):
+            return None
+        if info.st_mtime_ns == entrada.get('mtime_ns'):
+            return entrada
+        sha256 = sha256_arquivo(arquivo)
+        if sha256 != entrada.get('sha256'):
+            return None
+        return self.record(arquivo, entrada['rows'], sha256)
+
+    def write_csv(self, frame: DataFrame, arquivo: str, lim: str) -> Dict:
+        """
+        Grava o DataFrame como CSV em um temporário do mesmo diretório, faz
+        `fsync`, troca o destino com rename, atualiza a versão colunar e
+        registra o artefato.
+
+        Args:
+            frame (DataFrame): Dados a gravar.
+            arquivo (str): Caminho final do CSV, dentro do diretório do manifesto.
+            lim (str): Separador do CSV.
+
+        Returns:
+            Dict: O registro do artefato.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.', suffix='.csv', dir=self.diretorio)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+                frame.to_csv(file, sep=lim, index=False)
+                file.flush()
+                os.fsync(file.fileno())
+            sha256 = sha256_arquivo(tmp)
+            os.replace(tmp, arquivo)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        colunar.write_frame(arquivo, lim)
+        return self.record(arquivo, frame.shape[0], sha256)
+
+
+def grava_csv_atomico(frame: DataFrame, path: str, lim: str) -> str:
+    """
+    Grava o CSV de forma atômica e o registra no `ArtifactManifest` do seu
+    diretório.
+
+    Args:
+        frame (DataFrame): Dados a gravar.
+        path (str): Caminho final do CSV.
+        lim (str): Separador do CSV.
+
+    Returns:
+        str: Caminho do CSV gravado.
+    """
+    ArtifactManifest.of(path).write_csv(frame, path, lim)
+    return path
+
+
+class SourceManifest:
+    """
+    Manifesto das fontes remotas (folhas do Google Sheets e `cardinfo.php`),
+    gravado em `data/sources.json`. Para cada fonte guarda a URL, o `ETag`,
+    o `Last-Modified` e o sha256 do último conteúdo baixado.
+
+    Uma atualização manda os cabeçalhos condicionais; com `304`, ou com um
+    corpo de mesmo sha256 quando o servidor não suporta validação, a fonte é
+    considerada inalterada e o download, a leitura e a reconstrução dos
+    artefatos derivados podem ser pulados.
+
+    Args:
+        path (Union[str, None]): Caminho do manifesto, padrão `data/sources.json`.
+    """
+    VERSAO: int = 1
+
+    def __init__(self, path: Union[str, None] = None) -> None:
+        if path is None:
+            path = os.path.join(os.path.dirname(__file__), 'data', 'sources.json')
+        self.path: str = path
+        self.__LOCK = threading.Lock()
+        self.__FONTES: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    dados = json.load(file)
+                if dados.get('versao') == self.VERSAO:
+                    self.__FONTES = dict(dados.get('fontes', {}))
+            except (OSError, ValueError):
+                self.__FONTES = {}
+
+    @staticmethod
+    def digest(conteudo: bytes) -> str:
+        """sha256 hexadecimal do conteúdo."""
+        return hashlib.sha256(conteudo).hexdigest()
+
+    def entry(self, nome: str) -> Dict:
+        """Registro da fonte, `{}` se ela nunca foi baixada."""
+        return dict(self.__FONTES.get(nome, {}))
+
+    def conditional_headers(self, nome: str, artefato: Union[str, None] = None) -> Dict[str, str]:
+        """
+        Cabeçalhos `If-None-Match`/`If-Modified-Since` da fonte. Se o artefato
+        local informado não existir, nenhum cabeçalho é enviado.
+        """
+        if artefato is not None and not os.path.exists(artefato):
+            return {}
+        entrada = self.__FONTES.get(nome, {})
+        headers = {}
+        if entrada.get('etag'):
+            headers['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            headers['If-Modified-Since'] = entrada['last_modified']
+        return headers
+
+    def is_unchanged(self, nome: str, sha256: str, artefato: Union[str, None] = None) -> bool:
+        """`True` se o conteúdo tem o mesmo sha256 do último registrado e o artefato existe."""
+        if artefato is not None and not os.path.exists(artefato):
+            return False
+        return self.__FONTES.get(nome, {}).get('sha256') == sha256
+
+    def record(self, nome: str, url: str, headers, sha256: Union[str, None]) -> None:
+        """Registra a resposta da fonte; `sha256` None mantém o hash anterior (304)."""
+        with self.__LOCK:
+            entrada = self.__FONTES.setdefault(nome, {})
+            entrada['url'] = url
+            entrada['checked_at'] = datetime.now().isoformat()
+            if sha256 is None:
+                return
+            entrada['etag'] = headers.get('ETag')
+            entrada['last_modified'] = headers.get('Last-Modified')
+            entrada['sha256'] = sha256
+            entrada['updated_at'] = entrada['checked_at']
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica."""
+        with self.__LOCK:
+            dados = {'versao': self.VERSAO, 'fontes': dict(self.__FONTES)}
+        _grava_json_atomico(self.path, dados)
+
+    def fetch(
+        self, nome: str, url: str, client: Union[HttpClient, None] = None,
+        artefato: Union[str, None] = None
+    ) -> Tuple[int, Union[bytes, None]]:
+        """
+        Baixa a fonte com os cabeçalhos condicionais.
+
+        Args:
+            nome (str): Nome da fonte no manifesto.
+            url (str): URL da fonte.
+            client (Union[HttpClient, None]): Cliente HTTP, padrão o compartilhado.
+            artefato (Union[str, None]): Arquivo local derivado da fonte; se
+            ausente, a fonte é sempre tratada como alterada.
+
+        Returns:
+            Tuple[int, Union[bytes, None]]: `(200, conteudo)` se a fonte mudou,
+            `(304, None)` se não mudou e `(status, None)` em caso de erro.
+        """
+        client = HttpClient.shared() if client is None else client
+        response = client.get(url, headers=self.conditional_headers(nome, artefato))
+        return self.__resolve_(nome, url, response.status_code, response.headers, response.content, artefato)
+
+    async def fetch_async(
+        self, nome: str, url: str, client: AsyncHttpClient, artefato: Union[str, None] = None
+    ) -> Tuple[int, Union[bytes, None]]:
+        """Versão assíncrona de `fetch` sobre o `AsyncHttpClient`."""
+        response = await client.get(url, headers=self.conditional_headers(nome, artefato))
+        return self.__resolve_(nome, url, response.status_code, response.headers, response.content, artefato)
+
+    async def sync_async(
+        self, client: AsyncHttpClient, fontes: Dict[str, Tuple[str, str]],
+        grava: Callable[[str, bytes], Awaitable[None]],
+        junto: Union[Callable[[Dict[str, asyncio.Task]], Awaitable[Any]], None] = None
+    ) -> Tuple[List[str], Any]:
+        """
+        Sincroniza várias fontes com os seus artefatos locais. Todas são
+        requisitadas ao mesmo tempo e cada fonte alterada é gravada por `grava`
+        assim que chega; as inalteradas não são tocadas. O manifesto só é
+        salvo se todas responderam `200` ou `304`, senão as fontes com erro são
+        baixadas de novo na próxima chamada.
+
+        Args:
+            client (AsyncHttpClient): Cliente HTTP.
+            fontes (Dict[str, Tuple[str, str]]): `nome -> (url, artefato)`.
+            grava (Callable[[str, bytes], Awaitable[None]]): Grava o artefato
+            de uma fonte alterada a partir do nome e do conteúdo.
+            junto (Union[Callable, None]): Executada junto com os downloads,
+            recebe a tarefa de cada fonte (resultado `True` se ela mudou).
+
+        Returns:
+            Tuple[List[str], Any]: Fontes alteradas, na ordem de `fontes`, e o
+            resultado de `junto`.
+
+        Raises:
+            ConnectionError: Se alguma fonte falhar; os artefatos gravados até
+            ali continuam íntegros.
+        """
+        async def sincroniza(nome: str, url: str, artefato: str) -> bool:
+            status, conteudo = await self.fetch_async(nome, url, client, artefato)
+            if status == 200:
+                await grava(nome, conteudo)
+                return True
+            if status != 304:
+                raise ConnectionError(f'Falha ao baixar {nome}: HTTP {status}')
+            return False
+
+        tarefas = {
+            nome: asyncio.create_task(sincroniza(nome, url, artefato))
+            for nome, (url, artefato) in fontes.items()
+        }
+        pendentes = list(tarefas.values())
+        if junto is not None:
+            pendentes.append(asyncio.ensure_future(junto(tarefas)))
+        resultados = await asyncio.gather(*pendentes, return_exceptions=True)
+
+        for resultado in resultados:
+            if isinstance(resultado, BaseException):
+                if isinstance(resultado, httpx.HTTPError):
+                    raise ConnectionError(str(resultado)) from resultado
+                raise resultado
+        self.save()
+        alterados = [nome for nome, tarefa in tarefas.items() if tarefa.result()]
+        return alterados, resultados[-1] if junto is not None else None
+
+    def __resolve_(
+        self, nome: str, url: str, status: int, headers, conteudo: bytes, artefato: Union[str, None]
+    ) -> Tuple[int, Union[bytes, None]]:
+        """Interpreta a resposta de `fetch` e atualiza o registro da fonte."""
+        if status == 304:
+            self.record(nome, url, headers, None)
+            return 304, None
+        if status != 200:
+            return status, None
+        sha256 = self.digest(conteudo)
+        inalterado = self.is_unchanged(nome, sha256, artefato)
+        self.record(nome, url, headers, sha256)
+        return (304, None) if inalterado else (200, conteudo)
@@ -5,7 +5,7 @@ import re
 import os
 import math
 from os import PathLike
-from typing import List, Tuple, Union, Literal
+from typing import Dict, List, Tuple, Union, Literal
 
 import numpy as np                          # type: ignore
 import pandas as pd                         # type: ignore
@@ -13,12 +13,12 @@ from pandas import DataFrame                # type: ignore
 
 try:
     from ydke import CoreYDKE
-    from card import CardGameAsync
-    from ban import BanSheetWeb, BanSheetWebAsync
+    from catalog import CardCatalog, CardLookup, ler_cache, ler_var
+    from downloader import DependencyDownloader
 except:
     from src.ydke import CoreYDKE
-    from src.card import CardGameAsync
-    from src.ban import BanSheetWeb, BanSheetWebAsync
+    from src.catalog import CardCatalog, CardLookup, ler_cache, ler_var
+    from src.downloader import DependencyDownloader
     
 
 class MesaCore(CoreYDKE):
@@ -26,45 +26,51 @@ class MesaCore(CoreYDKE):
     Estrutura de dados desenvolvida para lidar com a base de recursos do projeto.
     Executa a leitura de diretórios, arquivos e afins. Todos relacionados ao
     deck e a estrutura de dados de criptografia YDKE.
+
+    Args:
+        catalog (Union[CardCatalog, None]): Catálogo de cartas e banlist já
+            carregado. Se None, um novo catálogo é lido de `cache/` e `var/`.
     """
-    def __init__(self) -> None:
+    def __init__(self, catalog: Union[CardCatalog, None] = None) -> None:
         super().__init__()
         self.YDKE_EX: str = """ydke://T+rhBE/q4QRP6uEEZkhVA2ZIVQNmSFUDSNtkAEjbZAAtTsoALU7KAC1OygDMvQQDzL0EA4/c4wSP3OMETRcqAU0XKgFNFyoBsPMNAaBT8QKgU/ECoFPxArqWmgK6lpoCsskJBLLJCQRO93UBTvd1AbIyzAWyMswFJjzNASY8zQHjsCoDWXtjBO8nUQDvJ1EA1fbWANX21gDV9tYArmAJBA==!Vm8XAVZvFwFWbxcBOjGqAjoxqgI6MaoCWmixAVposQHKg4kC1m/tA9H6jAXKP2ABEbm4BRHqPQTrK/8C!7I8BAOyPAQDsjwEAWmHoBSbrAATvJ1EAo2rUAqNq1ALDLy0Ewy8tBCHuLQMh7i0DIe4tA4PX8QWD1/EF!"""
-        self.__CARD_GAME_ASYNC__: CardGameAsync = CardGameAsync()
-        self.__BANLIST_WEB__: BanSheetWeb = BanSheetWeb()
-        self.__BANLIST_ASYNC__: BanSheetWebAsync = BanSheetWebAsync()
+        self.CATALOG: CardCatalog = CardCatalog() if catalog is None else catalog
+        # Codigos de cada parte do deck que nao estao no catalogo
+        self.CARTAS_AUSENTES: Dict[str, List[int]] = {}
         # Parte essencial da banlist em caches
-        self.BANLIST: DataFrame = self.__monta_banlist_atual_()
-        self.BANLIST_PART = self.BANLIST[['cod', 'condition', 'remarks']].copy()
-        self.VETOR_COD_BANLIST = self.BANLIST_PART['cod'].astype(int).unique()
-        self.BANLIST_PART['condition'] = self.BANLIST_PART['condition'].map({
-            'Unlimited': 3,
-            'Semi-Limited': 2,
-            'Limited': 1,
-            'Forbidden': 0
-        })
+        self.BANLIST: DataFrame = self.CATALOG.banlist
+        self.BANLIST_PART: DataFrame = self.CATALOG.banlist_part
+        self.VETOR_COD_BANLIST: np.ndarray = self.CATALOG.vetor_cod_banlist
 
     def download_async_dependencias(self) -> bool:
         """
         Baixa dados do jogo e salva as informações necessárias em `cache/` e `var/`.
 
+        Todas as folhas são baixadas em um único event loop pelo
+        `DependencyDownloader`, e o catálogo e a banlist desta instância
+        passam a ser os montados com os dados novos.
+
         Returns:
             bool: True se todos os downloads forem bem-sucedidos, False caso contrário.
         """
-        sheet_ban = ['Forbidden', 'Limited', 'Semi-limited', 'Unlimited']
-        sheet_card = ['min', 'complet', 'monster', 'spell', 'trap']
-        return all([
-            self.__CARD_GAME_ASYNC__.async_save_run(sheet_card),
-            self.__BANLIST_WEB__.request_frame(),
-            self.__BANLIST_ASYNC__.async_download_run(sheet_ban)
-        ])
+        try:
+            catalog = DependencyDownloader().run_sync()
+        except (ConnectionError, OSError, ValueError, KeyError):
+            return False
+
+        self.CATALOG = catalog
+        self.BANLIST = catalog.banlist
+        self.BANLIST_PART = catalog.banlist_part
+        self.VETOR_COD_BANLIST = catalog.vetor_cod_banlist
+        return True
 
     def read_cache(self, arq: str, lim: str = ';') -> DataFrame:
         """
         Lê nome do arquivo CSV como DataFrame e retorna o DataFrame lido.
 
         A função busca o arquivo especificado (`arq`) no diretório
-        de cache e o carrega em um DataFrame.
+        de cache e o carrega em um DataFrame, pela versão colunar
+        binária quando ela estiver atualizada.
 
         Args:
             arq (str): Nome do arquivo CSV a ser lido.
@@ -72,16 +78,15 @@ class MesaCore(CoreYDKE):
         Returns:
             DataFrame: DataFrame contendo os dados lidos do arquivo.
         """
-        file = os.path.join(os.path.dirname(__file__), 'cache', arq)
-        data_frame_cache = pd.read_csv(file, sep=lim, encoding='utf-8')
-        return data_frame_cache
+        return ler_cache(arq, lim)
 
     def read_var(self, arq: str, lim: str = '|') -> DataFrame:
         """
         Lê nome do arquivo CSV como DataFrame e retorna o DataFrame lido.
 
         A função busca o arquivo especificado (`arq`) no diretório
-        de var e o carrega em um DataFrame.
+        de var e o carrega em um DataFrame, pela versão colunar
+        binária quando ela estiver atualizada.
 
         Args:
             arq (str): Nome do arquivo CSV a ser lido.
@@ -89,22 +94,25 @@ class MesaCore(CoreYDKE):
         Returns:
             DataFrame: DataFrame contendo os dados lidos do arquivo.
         """
-        file = os.path.join(os.path.dirname(__file__), 'var', arq)
-        data_frame_var = pd.read_csv(file, sep=lim, encoding='utf-8')
-        return data_frame_var
+        return ler_var(arq, lim)
 
     def monta_parte_deck(
         self,
         part: Literal['main', 'side', 'extra'],
-        array: List[int]
+        array: List[int],
+        busca: Union[CardLookup, None] = None
     ) -> DataFrame:
         """
         Monta uma das partes do deck passada como argumento, retorna como DataFrame.
+        Os códigos não cadastrados no catálogo são registrados em
+        `CARTAS_AUSENTES[part]`.
         
         Args:
             part (Literal['main', 'side', 'extra']) : Parte que será montada.
             array (List[int]) : Código base 32 bits das cartas.
-        
+            busca (Union[CardLookup, None]) : Busca de `array` já resolvida no
+                catálogo, usada pela análise em lote para evitar nova busca.
+
         Returns:
             Dataframe: Conjunto de dados da parte do deck.
             - Colunas **constantes** do conjunto retornado:
@@ -116,22 +124,14 @@ class MesaCore(CoreYDKE):
                 - qtd_copy
                 - categoria
         """
-        data_frame_complet = self.read_cache('complet.csv')
-        data_frame_complet['cod'] = data_frame_complet['cod'].astype(int)
-
-        dados_deck_list = []
-        for x in array:
-            carta_encontrada = data_frame_complet.loc[
-                data_frame_complet['cod'].isin([x])]
-
-            if not carta_encontrada.empty:
-                dados_deck_list.append(carta_encontrada.values[0].tolist())
-            else:
-                # Se o código da carta não estiver cadastrado no cache
-                print(f"Warning: Não encontrei em 'cod' o valor: {x}")
+        if busca is None:
+            busca = self.CATALOG.lookup(array)
+        # Codigos nao cadastrados no catalogo ficam registrados por parte
+        self.CARTAS_AUSENTES[part] = busca.missing
 
         colunas_uteis = ['cod', 'card_name', 'tipo', 'effect', 'arquetype']
-        df = DataFrame(dados_deck_list, columns=colunas_uteis)
+        # Categorias do cache colunar voltam a texto na parte do deck
+        df = busca.frame[colunas_uteis].astype({'tipo': object, 'arquetype': object})
 
         # descobrindo a quantidade de copias de cards
         df['qtd_copy'] = np.ones(df.shape[0], dtype=int)
@@ -140,7 +140,11 @@ class MesaCore(CoreYDKE):
         df['cod'] = df['cod'].astype(int)
         return df.sort_values(by=['cod']).reset_index(drop=True)
 
-    def read_link_deck_ydke(self, link: str) -> Tuple[DataFrame, DataFrame, DataFrame]:
+    def read_link_deck_ydke(
+        self,
+        link: str,
+        buscas: Union[Dict[str, CardLookup], None] = None
+    ) -> Tuple[DataFrame, DataFrame, DataFrame]:
         """
         Lê dados de um deck com criptografia YDKE,\n
         identifica arquétipos genéricos como mini-arquetipos e monta as
@@ -148,65 +152,31 @@ class MesaCore(CoreYDKE):
 
         Args:
             link (str): URL do deck.
+            buscas (Union[Dict[str, CardLookup], None]): Buscas de cada parte
+                já resolvidas no catálogo, chaves `main`, `extra` e `side`.
 
         Returns:
             Tuple[DataFrame]: DataFrames `main`, `extra` e `side` com arquétipos ajustados.
         """
-        link = link.replace('\n', '').replace(' ', '').replace('\t', '')
-        deck = self.read_url(link)
-        mini_arquetipos = self.read_cache('min.csv')
-        mini_arquetipos = mini_arquetipos['name'].values
-
-        def classifier(text: str) -> str:
-            if '|' in text:
-                if any([
-                    t in mini_arquetipos for t in text.replace(' | ', '|').split('|')
-                ]):
-                    text = 'generic'
-            elif text in mini_arquetipos:
-                return 'generic'
-            return text
-
-        main = self.monta_parte_deck('main', deck['main'])
-        main['arquetype'] = main['arquetype'].apply(classifier)
-
-        extra = self.monta_parte_deck('extra', deck['extra'])
-        extra['arquetype'] = extra['arquetype'].apply(classifier)
-
-        side = self.monta_parte_deck('side', deck['side'])
-        side['arquetype'] = side['arquetype'].apply(classifier)
+        buscas = {} if buscas is None else buscas
+        if all(p in buscas for p in ('main', 'extra', 'side')):
+            # Lote ja decodificado, os codigos estao nas buscas
+            deck = {'main': [], 'extra': [], 'side': []}
+        else:
+            deck = self.read_url(link.replace('\n', '').replace(' ', '').replace('\t', ''))
+        # Mini-arquetipos viram 'generic' pelo mapa pre-calculado no catalogo
+        classifier = self.CATALOG.classify_series
 
-        return main, extra, side
+        main = self.monta_parte_deck('main', deck['main'], buscas.get('main'))
+        main['arquetype'] = classifier(main['arquetype'])
+
+        extra = self.monta_parte_deck('extra', deck['extra'], buscas.get('extra'))
+        extra['arquetype'] = classifier(extra['arquetype'])
 
-    def __monta_banlist_atual_(self) -> DataFrame:
-        """Monta o quadro da banlist vigente de acordo com os códigos das cartas."""
-        complet = self.read_cache('complet.csv')
-        home = self.read_var('Home.csv')
-        # limpando espaço adicional e titulo clonado
-        home = home.loc[~home['card_name'].isin(['Card Name'])].reset_index(drop=True)
-        home['card_name'] = home['card_name'].str.strip().str.upper()
-        home['card_name'] = home['card_name'].apply(lambda x: re.sub(r'\s+', ' ', x).strip())
-
-        # separando codigos das cartas
-        cod_name = complet[['cod', 'card_name']].copy()
-        cod_name['card_name'] = cod_name['card_name'].str.upper().str.strip()
-
-        # montagem do quadro correto
-        frame_correto = pd.merge(home, cod_name, how='inner', on='card_name')
-        frame_correto['remarks'] = frame_correto['remarks'].fillna('')
-
-        # Procurando cartas com nomes bugados
-        DESAJUSTADOS = home.loc[
-            ~home['card_name'].isin(frame_correto['card_name'])
-        ].reset_index(drop=True)
-        if len(DESAJUSTADOS.index):
-            print('Problemas!! Existe nomes desajustados ou não cadastrados!!')
-            print(DESAJUSTADOS)
-
-        # separando cartas da banlist
-        cartas_banlist = frame_correto[['cod', 'condition', 'remarks']]
-        banlist = pd.merge(cartas_banlist, complet, how='inner', on='cod')
-        return banlist
+        side = self.monta_parte_deck('side', deck['side'], buscas.get('side'))
+        side['arquetype'] = classifier(side['arquetype'])
+
+        return main, extra, side
 
 
 class Combination(MesaCore):
@@ -216,18 +186,26 @@ class Combination(MesaCore):
     conforme a regra 2.0 vigente do Mochila Champions acesse -> 
     (https://encurtador.com.br/eWXru)
     """
-    def __init__(self, decklist: Union[str, PathLike]) -> None:
+    def __init__(
+        self,
+        decklist: Union[str, PathLike],
+        catalog: Union[CardCatalog, None] = None,
+        buscas: Union[Dict[str, CardLookup], None] = None
+    ) -> None:
         """
         Contem estrutura de atributos para facil ascesso na classe filha `Mesa`
         
         Args:
             decklist (Union[str, PathLike]) : Link YDKE do deck ou arquivo.
+            catalog (Union[CardCatalog, None]) : Catálogo compartilhado de cartas.
+            buscas (Union[Dict[str, CardLookup], None]) : Partes do deck já
+                resolvidas no catálogo (análise em lote).
         """
-        super().__init__()
+        super().__init__(catalog)
 
         if 'ydke://' in decklist:
             self.YDKE: str = decklist.strip().replace(' ', '')
-            self.main, self.extra, self.side = self.read_link_deck_ydke(self.YDKE)
+            self.main, self.extra, self.side = self.read_link_deck_ydke(self.YDKE, buscas)
             self.arquetype, self.linear_main = self._construct_main_deck(self.main)
             self.linear_extra = self._construct_vetor(self.extra)
             self.linear_side  = self._construct_vetor(self.side)
@@ -249,6 +227,14 @@ class Combination(MesaCore):
         self.extra = self.__cache_extra()
         self.side = self.__cache_side()
 
+    @property
+    def deck_fingerprint(self) -> str:
+        """
+        Impressão digital canônica do deck (`CoreYDKE.fingerprint`); o mesmo
+        deck lido de links ou arquivos `.ydk` em outra ordem tem a mesma.
+        """
+        return self.fingerprint(self.read_url(self.YDKE))
+
     def __cache_main(self) -> DataFrame:
         """Retorna o frame do main deck mais atualizado."""
         self.main['arquetype'] = self.linear_main['arquetype_y']
@@ -347,27 +333,23 @@ class Combination(MesaCore):
         if array[0] == 'generic':
             alg_freq.loc[alg_freq['sub_key'] == alg_freq['sub_key'].max(), 'sub_key'] = 0
 
-        key = []
-        frq = []
-        # Procura uma palavra menor no conjunto de palavras do arquetipo
-        # Para criar uma chave e valor da ocorrencia
-        for j in part_deck.arquetype:
-            for i in alg_freq.arquetype:
+        # Procura a primeira palavra menor (na ordem de frequencia) contida
+        # no arquetipo, uma unica vez por arquetipo distinto do deck, e
+        # aplica o mapa token -> (chave, frequencia) em todas as linhas
+        tokens = list(zip(
+            alg_freq['arquetype'], alg_freq['sub_key'], alg_freq['sub_freq']
+        ))
+        mapa_key = {}
+        mapa_frq = {}
+        for j in part_deck['arquetype'].unique():
+            for i, k, f in tokens:
                 if i in j:
-                    key.append(
-                        alg_freq.loc[
-                            alg_freq['arquetype'].isin([i])
-                        ].iloc[0].to_numpy()[2]
-                    )
-                    frq.append(
-                        alg_freq.loc[
-                            alg_freq['arquetype'].isin([i])
-                        ].iloc[0].to_numpy()[1]
-                    )
+                    mapa_key[j] = k
+                    mapa_frq[j] = f
                     break
 
-        part_deck['sub_key'] = key
-        part_deck['sub_freq'] = frq
+        part_deck['sub_key'] = part_deck['arquetype'].map(mapa_key)
+        part_deck['sub_freq'] = part_deck['arquetype'].map(mapa_frq)
         return part_deck.copy()
 
     def _soma_linear_linhas_matrix(self, matriz: DataFrame) -> DataFrame:
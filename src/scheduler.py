@@ -0,0 +1,135 @@
+#
+# Python 3.11.10
+#
+import time
+import threading
+import traceback
+from datetime import datetime
+from typing import Callable, Dict, Union
+
+try:
+    from base import CardBaseInfo
+    from catalog import CardCatalog
+    from downloader import DependencyDownloader
+except:
+    from src.base import CardBaseInfo
+    from src.catalog import CardCatalog
+    from src.downloader import DependencyDownloader
+
+
+class RefreshScheduler:
+    """
+    Atualiza os dados do projeto em segundo plano, fora do caminho das
+    requisições e dos construtores.
+
+    A cada `intervalo` segundos uma thread baixa as folhas de `cache/` e
+    `var/` (`DependencyDownloader`), atualiza o dump oficial e o banco de
+    cartas (`CardBaseInfo.atualizar`), que é trocado de forma atômica, e só
+    então publica um novo `CardCatalog` pela função `publica`, quando alguma
+    folha, o dump ou o banco mudou; assim a versão e o índice de estruturas
+    do catálogo já refletem o dump novo. O catálogo é totalmente montado,
+    com o índice de estruturas aquecido, antes de ser publicado; quem lê só
+    enxerga a versão anterior ou a nova.
+
+    Falhas ficam registradas em `status()` e não interrompem o agendamento.
+
+    Args:
+        publica (Callable[[CardCatalog], None]): Recebe cada novo catálogo.
+        intervalo (float): Segundos entre o fim de uma atualização e o início
+        da próxima.
+        downloader (Callable[[], DependencyDownloader]): Fábrica do downloader.
+        base (Callable[[], CardBaseInfo]): Fábrica do atualizador do banco.
+        catalogo (Callable[[], CardCatalog]): Fábrica do catálogo publicado.
+    """
+    def __init__(
+        self,
+        publica: Callable[[CardCatalog], None],
+        intervalo: float = 86400.0,
+        downloader: Callable[[], DependencyDownloader] = DependencyDownloader,
+        base: Callable[[], CardBaseInfo] = CardBaseInfo,
+        catalogo: Callable[[], CardCatalog] = CardCatalog
+    ) -> None:
+        self.intervalo: float = intervalo
+        self.__PUBLICA = publica
+        self.__DOWNLOADER = downloader
+        self.__BASE = base
+        self.__CATALOGO = catalogo
+        self.__PARAR = threading.Event()
+        self.__LOCK = threading.Lock()
+        self.__THREAD: Union[threading.Thread, None] = None
+        self.__STATUS: Dict = {
+            'runs': 0,
+            'failures': 0,
+            'published': 0,
+            'last_run': None,
+            'last_success': None,
+            'last_error': None,
+            'last_duration': None,
+            'version': None
+        }
+
+    def start(self) -> None:
+        """Inicia a thread de atualização; a primeira roda após `intervalo`."""
+        if self.__THREAD is not None and self.__THREAD.is_alive():
+            return
+        self.__PARAR.clear()
+        self.__THREAD = threading.Thread(target=self.__loop_, name='deckapi-refresh', daemon=True)
+        self.__THREAD.start()
+
+    def stop(self, timeout: Union[float, None] = 5.0) -> None:
+        """Sinaliza a parada e espera a atualização em andamento terminar."""
+        self.__PARAR.set()
+        if self.__THREAD is not None:
+            self.__THREAD.join(timeout)
+            self.__THREAD = None
+
+    def __loop_(self) -> None:
+        while not self.__PARAR.wait(self.intervalo):
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Executa uma atualização completa agora, na thread de quem chama. Se
+        outra já estiver em andamento, retorna `False` sem esperar.
+
+        Returns:
+            bool: `True` se a atualização terminou sem erros.
+        """
+        if not self.__LOCK.acquire(blocking=False):
+            return False
+        inicio = time.monotonic()
+        try:
+            self.__STATUS['last_run'] = datetime.now().isoformat()
+            downloader = self.__DOWNLOADER()
+            downloader.run_sync(catalogo=False)
+            # Dump e banco antes do catalogo: a versao e o indice de
+            # estruturas sao montados a partir do dump oficial; a folha
+            # complet acabou de ser baixada e nao e consultada de novo
+            base_mudou = self.__BASE().atualizar(forcar=True, planilha=False)
+            if downloader.ALTERADOS or base_mudou or self.__STATUS['version'] is None:
+                catalog = self.__CATALOGO()
+                catalog.card_structures
+                self.__PUBLICA(catalog)
+                self.__STATUS['published'] += 1
+                self.__STATUS['version'] = catalog.version
+
+            self.__STATUS['last_success'] = datetime.now().isoformat()
+            self.__STATUS['last_error'] = None
+            return True
+        except Exception:
+            self.__STATUS['failures'] += 1
+            self.__STATUS['last_error'] = traceback.format_exc(limit=3)
+            return False
+        finally:
+            self.__STATUS['runs'] += 1
+            self.__STATUS['last_duration'] = round(time.monotonic() - inicio, 3)
+            self.__LOCK.release()
+
+    def status(self) -> Dict:
+        """Contadores e horários das atualizações."""
+        return {
+            **self.__STATUS,
+            'interval': self.intervalo,
+            'running': self.__LOCK.locked(),
+            'alive': self.__THREAD is not None and self.__THREAD.is_alive()
+        }
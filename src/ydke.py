@@ -3,11 +3,261 @@
 #
 import os
 import re
+import sys
+import array
 import struct
 import base64
+import codecs
+import binascii
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
 from os import PathLike
-from typing import List, Dict, Union
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np                          # type: ignore
+
+PROTOCOLO: str = 'ydke://'
+PARTES: tuple = ('main', 'extra', 'side')
+# Links em texto livre: exato e tolerante a quebras de linha nas partes;
+# espacos so valem como recuo logo apos a quebra, nunca no meio da linha
+_URL = re.compile(r'ydke://[A-Za-z0-9+/=]*![A-Za-z0-9+/=]*![A-Za-z0-9+/=]*!')
+_URL_QUEBRADA = re.compile(r'ydke://(?:[A-Za-z0-9+/=]*(?:\r?\n[ \t]*[A-Za-z0-9+/=]*)*!){3}')
+_ESPACOS = re.compile(r'\s+')
+
+# Leitura em blocos de fontes grandes
+TAMANHO_BLOCO: int = 1024 * 1024
+# Maior trecho guardado entre blocos para um link ainda incompleto
+LIMITE_LINK: int = 64 * 1024
+
+Fonte = Union[str, bytes, PathLike, IO, Iterable[Union[str, bytes]]]
+
+# Versao da codificacao canonica de `CoreYDKE.canonical_bytes`; a 2 guarda
+# distintos e copias em uint32, sem limite pratico de copias por carta
+CANONICO_VERSAO: bytes = b'\x02'
+
+
+def _pacote_canonico(codigos: np.ndarray, copias: np.ndarray) -> bytes:
+    """Bloco canônico de uma parte: distintos, códigos e cópias, todos em uint32."""
+    return (
+        struct.pack('<I', codigos.shape[0])
+        + codigos.astype('<u4').tobytes()
+        + copias.astype('<u4').tobytes()
+    )
+
+
+def _pedacos(fonte: Fonte, tamanho: int) -> Iterator[Union[str, bytes]]:
+    """Pedaços de texto ou bytes de uma string, arquivo, mmap, caminho ou iterável."""
+    if isinstance(fonte, (str, bytes, bytearray, memoryview)):
+        for i in range(0, len(fonte), tamanho):
+            yield fonte[i:i + tamanho]
+    elif isinstance(fonte, PathLike):
+        with open(fonte, 'rb') as file:
+            yield from _pedacos(file, tamanho)
+    elif hasattr(fonte, 'read'):
+        while chunk := fonte.read(tamanho):
+            yield chunk
+    else:
+        yield from fonte
+
+
+class YDKEError(ValueError):
+    """Erro base de links YDKE; a mensagem é a mesma retornada por `read_url`."""
+
+
+class YDKEProtocolError(YDKEError):
+    """O link não começa com `ydke://`."""
+
+
+class YDKEComponentError(YDKEError):
+    """O link não tem as três partes separadas por `!`."""
+
+
+class YDKEEncodingError(YDKEError):
+    """Uma parte não é base64 válido ou não contém inteiros de 32 bits inteiros."""
+
+
+class YDKFileError(YDKEError):
+    """Um arquivo `.ydk` não pôde ser lido ou não está no formato esperado."""
+
+
+class DeckBatch(NamedTuple):
+    """
+    Lote de decks em um vetor irregular: todos os códigos em `values` (int32)
+    e os limites de cada parte em `offsets`. A parte `p` (0 main, 1 extra,
+    2 side) do deck `i` é `values[offsets[3 * i + p]:offsets[3 * i + p + 1]]`.
+    Decks inválidos ficam com as partes vazias e o erro em `errors`.
+
+    Attributes:
+        values (np.ndarray): Códigos de todas as partes, int32.
+        offsets (np.ndarray): `3 * len(lote) + 1` limites em `values`, int64.
+        errors (Dict[int, YDKEError]): Erro de cada deck inválido, pelo índice.
+    """
+    values: np.ndarray
+    offsets: np.ndarray
+    errors: Dict[int, YDKEError]
+
+    def __len__(self) -> int:
+        return (self.offsets.shape[0] - 1) // len(PARTES)
+
+    def part(self, i: int, parte: str) -> np.ndarray:
+        """Visão (sem cópia) dos códigos de uma parte do deck `i`."""
+        j = len(PARTES) * i + PARTES.index(parte)
+        return self.values[self.offsets[j]:self.offsets[j + 1]]
+
+    def deck(self, i: int) -> Dict[str, List[int]]:
+        """Deck `i` no formato de `read_url`."""
+        if i in self.errors:
+            raise self.errors[i]
+        return {p: self.part(i, p).tolist() for p in PARTES}
+
+    @property
+    def valid(self) -> List[int]:
+        """Índices dos decks decodificados sem erro."""
+        return [i for i in range(len(self)) if i not in self.errors]
+
+    @classmethod
+    def from_buffers(cls, buffers: Sequence[bytes], errors: Dict[int, YDKEError]) -> 'DeckBatch':
+        """
+        Monta o lote a partir dos bytes int32 little-endian de cada parte,
+        três por deck, unidos em um só buffer visto por `np.frombuffer`.
+        """
+        values = np.frombuffer(b''.join(buffers), dtype='<i4')
+        offsets = np.zeros(len(buffers) + 1, dtype=np.int64)
+        np.cumsum([len(b) // 4 for b in buffers], out=offsets[1:])
+        return cls(values, offsets, errors)
+
+    @classmethod
+    def from_decks(cls, decks: Sequence[Dict[str, Sequence[int]]]) -> 'DeckBatch':
+        """
+        Monta o lote a partir de decks no formato de `read_url`.
+
+        Raises:
+            YDKEComponentError: Se algum deck não tiver as chaves 'main', 'extra' e 'side'.
+            YDKEEncodingError: Se algum código não couber em int32.
+        """
+        partes = []
+        for deck in decks:
+            if not all(p in deck for p in PARTES):
+                raise YDKEComponentError("Patter key 'main', 'extra' e 'side'.")
+            partes.extend(np.asarray(deck[p], dtype=np.int64).ravel() for p in PARTES)
+        values = np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+        if values.size and (values.min() < 0 or values.max() > np.iinfo(np.int32).max):
+            raise YDKEEncodingError('Passcode out of int32 range')
+        offsets = np.zeros(len(partes) + 1, dtype=np.int64)
+        np.cumsum([p.shape[0] for p in partes], out=offsets[1:])
+        return cls(values.astype('<i4'), offsets, {})
+
+
+# Arquivos .ydk: criador e cabecalho de cada secao
+CRIADOR_YDK: str = '#created by'
+SECOES_YDK: Dict[str, str] = {'#main': 'main', '#extra': 'extra', '!side': 'side'}
+CRIADOR_PADRAO: str = 'DeckAPI'
+
+
+def parse_ydk(texto: str) -> Dict[str, Union[str, List[int]]]:
+    """
+    Interpreta o conteúdo de um arquivo `.ydk`. Aceita finais de linha CRLF,
+    BOM, linhas em branco, outros comentários `#` e seções ausentes (um
+    arquivo sem `!side`, por exemplo); só `#main` é obrigatória.
+
+    Args:
+        texto (str): Conteúdo do arquivo.
+
+    Returns:
+        Dict[str, Union[str, List[int]]]: Chaves 'created', 'main', 'extra' e 'side'.
+
+    Raises:
+        YDKFileError: Sem a seção `#main` ou com uma linha que não é código de carta.
+    """
+    deck: Dict = {'created': '', 'main': [], 'extra': [], 'side': []}
+    parte = None
+    tem_main = False
+    for n, linha in enumerate(texto.lstrip('\ufeff').splitlines(), 1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        if linha.isdigit() and linha.isascii():
+            if parte is None:
+                raise YDKFileError(f'Card code outside a section at line {n}')
+            deck[parte].append(int(linha))
+        elif linha.lower() in SECOES_YDK:
+            parte = SECOES_YDK[linha.lower()]
+            tem_main = tem_main or parte == 'main'
+        elif linha.startswith(CRIADOR_YDK):
+            deck['created'] = linha[len(CRIADOR_YDK):].strip()
+        elif not linha.startswith('#'):
+            raise YDKFileError(f'Invalid card code at line {n}: {linha}')
+    if not tem_main:
+        raise YDKFileError('Missing #main section')
+    return deck
+
+
+def format_ydk(deck: Dict[str, Sequence[int]], created: Union[str, None] = None) -> str:
+    """
+    Conteúdo `.ydk` de um deck, no formato dos arquivos de `decks/`.
+
+    Args:
+        deck (Dict[str, Sequence[int]]): Deck com as chaves 'main', 'extra' e 'side'.
+        created (Union[str, None]): Criador; padrão `deck['created']` ou `CRIADOR_PADRAO`.
+
+    Returns:
+        str: Texto do arquivo, terminado por quebra de linha.
+    """
+    criador = created or deck.get('created') or CRIADOR_PADRAO
+    blocos = [f'{CRIADOR_YDK} {criador}']
+    for secao, parte in SECOES_YDK.items():
+        blocos.append(secao)
+        if len(deck[parte]):
+            blocos.append('\n'.join(map(str, deck[parte])))
+    return '\n'.join(blocos) + '\n'
+
+
+def _le_arquivo_ydk(path: str) -> Union[Tuple[str, List[bytes]], YDKEError]:
+    """Lê um `.ydk` para o lote: criador e bytes int32 de cada parte, ou o erro."""
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as file:
+            deck = parse_ydk(file.read())
+        partes = [array.array('i', deck[p]) for p in PARTES]
+        if sys.byteorder == 'big':
+            for parte in partes:
+                parte.byteswap()
+        return deck['created'], [p.tobytes() for p in partes]
+    except OverflowError:
+        return YDKFileError(f'Passcode out of int32 range in {path}')
+    except YDKEError as e:
+        return e
+    except (OSError, UnicodeDecodeError) as e:
+        return YDKFileError(f'{path} not accessible: {e}')
+
+
+def _le_arquivos_ydk(paths: List[str]) -> List[Union[Tuple[str, List[bytes]], YDKEError]]:
+    """Lê uma fatia de arquivos; cada tarefa do pool recebe várias leituras."""
+    return [_le_arquivo_ydk(p) for p in paths]
+
+
+class YdkScan(NamedTuple):
+    """
+    Resultado de `CoreYDKE.scan_directory`: os arquivos lidos, o criador de
+    cada um e os decks no lote irregular, na mesma ordem dos arquivos.
+
+    Attributes:
+        paths (List[str]): Caminhos dos arquivos `.ydk`.
+        created (List[str]): Criador de cada arquivo, vazio nos com erro.
+        batch (DeckBatch): Decks lidos; os erros ficam em `batch.errors`.
+    """
+    paths: List[str]
+    created: List[str]
+    batch: DeckBatch
+
+    @property
+    def errors(self) -> List[Dict[str, str]]:
+        """Um registro por arquivo com erro: caminho, tipo e mensagem."""
+        return [
+            {'path': self.paths[i], 'type': type(e).__name__, 'error': str(e)}
+            for i, e in sorted(self.batch.errors.items())
+        ]
+
 
 
 class CoreYDKE:
@@ -23,11 +273,11 @@ class CoreYDKE:
             List[int]: Uma lista de inteiros de 32 bits.
 
         Raises:
-            struct.error: Se a decodificação ou desempacotamento dos bytes falhar.
+            ValueError: Se os bytes não formarem inteiros de 32 bits completos.
             binascii.Error: Se a string base64 for malformada.
         """
         byte_data = base64.b64decode(base64_str)
-        return list(struct.unpack("<" + "I" * (len(byte_data) // 4), byte_data))
+        return np.frombuffer(byte_data, dtype='<u4').tolist()
 
     def __create_code_(self, passcodes: List[int]) -> str:
         """
@@ -89,12 +339,12 @@ class CoreYDKE:
                 pelo menos três componentes separados por `'!'`.
         """
         try:
-            if not ydke.startswith("ydke://"):
-                raise ValueError("Unrecognized URL protocol")
+            if not ydke.startswith(PROTOCOLO):
+                raise YDKEProtocolError("Unrecognized URL protocol")
 
-            components = ydke[len("ydke://"):].split("!")
+            components = ydke[len(PROTOCOLO):].split("!")
             if len(components) < 3:
-                raise ValueError("Missing ydke URL component")
+                raise YDKEComponentError("Missing ydke URL component")
 
             return {
                 "main": self.__to_pass_code_(components[0]),
@@ -104,6 +354,261 @@ class CoreYDKE:
         except ValueError as e:
             return str(e)
 
+    @staticmethod
+    def __bytes_parte_(componente: str) -> bytes:
+        """Bytes de uma parte do link, com a mesma tolerância de `read_url`."""
+        try:
+            parte = binascii.a2b_base64(componente, strict_mode=True)
+        except binascii.Error:
+            # O modo estrito cobre os links comuns; o b64decode de `read_url`
+            # ainda ignora caracteres fora do alfabeto base64
+            try:
+                parte = base64.b64decode(componente)
+            except binascii.Error as e:
+                raise YDKEEncodingError("Invalid ydke URL component encoding") from e
+        # Cada parte precisa de inteiros de 32 bits completos
+        if len(parte) % 4:
+            raise YDKEEncodingError("Invalid ydke URL component encoding")
+        return parte
+
+    @classmethod
+    def decode_batch(cls, links: Iterable[str], strict: bool = False) -> DeckBatch:
+        """
+        Decodifica um lote de links YDKE em um único vetor irregular int32.
+
+        Os links são separados em partes como em `read_url` (o `!` final é
+        opcional) e aceitos ou recusados exatamente como por ele; as partes
+        decodificadas são unidas em um só buffer e
+        `values` é uma visão `np.frombuffer` dele, sem cópia nem
+        desempacotamento por carta. Códigos acima do limite de int32 ficam
+        negativos e, como em `read_url`, não são encontrados no catálogo.
+
+        Args:
+            links (Iterable[str]): Links YDKE, já sem espaços.
+            strict (bool): Se `True`, o primeiro link inválido lança o erro;
+                senão o erro fica em `DeckBatch.errors` e o deck fica vazio.
+
+        Returns:
+            DeckBatch: Códigos e limites de cada parte de cada link.
+
+        Raises:
+            YDKEError: Com `strict`, pelo primeiro link inválido.
+        """
+        buffers: List[bytes] = []
+        errors: Dict[int, YDKEError] = {}
+        for i, link in enumerate(links):
+            try:
+                if not link.startswith(PROTOCOLO):
+                    raise YDKEProtocolError("Unrecognized URL protocol")
+                componentes = link[len(PROTOCOLO):].split('!', len(PARTES))
+                if len(componentes) < len(PARTES):
+                    raise YDKEComponentError("Missing ydke URL component")
+                partes = [cls.__bytes_parte_(c) for c in componentes[:len(PARTES)]]
+            except YDKEError as e:
+                if strict:
+                    raise
+                errors[i] = e
+                partes = [b''] * len(PARTES)
+            buffers.extend(partes)
+
+        return DeckBatch.from_buffers(buffers, errors)
+
+    @staticmethod
+    def encode_batch(batch: DeckBatch) -> List[Union[str, None]]:
+        """
+        Codifica um lote em links YDKE a partir de um único buffer de bytes,
+        fatiado por `memoryview` em cada parte.
+
+        Args:
+            batch (DeckBatch): Lote de `decode_batch` ou `DeckBatch.from_decks`.
+
+        Returns:
+            List[Union[str, None]]: Um link por deck, None para os decks com erro.
+        """
+        dados = memoryview(np.ascontiguousarray(batch.values, dtype='<i4').tobytes())
+        limites = (batch.offsets * 4).tolist()
+        links: List[Union[str, None]] = []
+        for i in range(len(batch)):
+            if i in batch.errors:
+                links.append(None)
+                continue
+            j = len(PARTES) * i
+            links.append(PROTOCOLO + ''.join(
+                base64.b64encode(dados[limites[j + p]:limites[j + p + 1]]).decode('ascii') + '!'
+                for p in range(len(PARTES))
+            ))
+        return links
+
+    @staticmethod
+    def canonical_bytes(deck: Dict[str, Sequence[int]]) -> bytes:
+        """
+        Codificação binária canônica do deck, independente da ordem das
+        cartas: um byte de versão e, para cada parte (`main`, `extra`,
+        `side`), a quantidade de códigos distintos, os códigos em ordem
+        crescente e as cópias de cada um, todos em uint32.
+
+        Args:
+            deck (Dict[str, Sequence[int]]): Deck com as chaves 'main', 'extra' e 'side'.
+
+        Returns:
+            bytes: Codificação canônica; decks iguais têm os mesmos bytes.
+
+        Raises:
+            ValueError: Se um código não couber em uint32.
+        """
+        blocos = [CANONICO_VERSAO]
+        for part in PARTES:
+            try:
+                cods = np.asarray(deck[part], dtype=np.int64).ravel()
+            except OverflowError as e:
+                raise ValueError('Passcode out of uint32 range') from e
+            if cods.size and (cods.min() < 0 or cods.max() > np.iinfo(np.uint32).max):
+                raise ValueError('Passcode out of uint32 range')
+            codigos, copias = np.unique(cods, return_counts=True)
+            blocos.append(_pacote_canonico(codigos.astype('<u4'), copias))
+        return b''.join(blocos)
+
+    @staticmethod
+    def from_canonical(data: bytes) -> Dict[str, List[int]]:
+        """
+        Decodifica `canonical_bytes` no formato de `read_url`, com as cartas
+        de cada parte em ordem crescente.
+
+        Raises:
+            ValueError: Se os bytes não forem uma codificação canônica válida.
+        """
+        if data[:1] != CANONICO_VERSAO:
+            raise ValueError('Unknown canonical deck version')
+        deck, pos = {}, 1
+        try:
+            for part in PARTES:
+                (distintos,) = struct.unpack_from('<I', data, pos)
+                pos += 4
+                codigos = np.frombuffer(data, dtype='<u4', count=distintos, offset=pos)
+                pos += 4 * distintos
+                copias = np.frombuffer(data, dtype='<u4', count=distintos, offset=pos)
+                pos += 4 * distintos
+                deck[part] = np.repeat(codigos, copias).tolist()
+        except (struct.error, ValueError) as e:
+            raise ValueError('Truncated canonical deck') from e
+        if pos != len(data):
+            raise ValueError('Trailing bytes in canonical deck')
+        return deck
+
+    @classmethod
+    def fingerprint(cls, deck: Dict[str, Sequence[int]]) -> str:
+        """
+        Impressão digital canônica do deck: independe da ordem das cartas e
+        da formatação do link, dois decks com os mesmos multiconjuntos de
+        `main`, `extra` e `side` têm a mesma impressão.
+
+        Args:
+            deck (Dict[str, Sequence[int]]): Deck com as chaves 'main', 'extra' e 'side'.
+
+        Returns:
+            str: Hash SHA-256 hexadecimal de `canonical_bytes`.
+        """
+        return hashlib.sha256(cls.canonical_bytes(deck)).hexdigest()
+
+    @staticmethod
+    def canonical_batch(batch: DeckBatch) -> List[Union[bytes, None]]:
+        """
+        `canonical_bytes` de todos os decks de um lote, com uma única
+        ordenação do vetor inteiro por parte e código.
+
+        Args:
+            batch (DeckBatch): Lote de `decode_batch` ou `DeckBatch.from_decks`.
+
+        Returns:
+            List[Union[bytes, None]]: Bytes canônicos por deck, None para os decks com erro.
+        """
+        n_partes = batch.offsets.shape[0] - 1
+        parte = np.repeat(np.arange(n_partes), np.diff(batch.offsets))
+        # Visao sem sinal: a ordem e a mesma de `canonical_bytes`
+        valores = np.ascontiguousarray(batch.values, dtype='<i4').view('<u4')
+        ordem = np.lexsort((valores, parte))
+        valores, parte = valores[ordem], parte[ordem]
+
+        # Inicio de cada sequencia de copias de um codigo dentro de uma parte
+        novo = np.ones(valores.shape[0], dtype=bool)
+        novo[1:] = (valores[1:] != valores[:-1]) | (parte[1:] != parte[:-1])
+        inicios = np.flatnonzero(novo)
+        codigos = valores[inicios]
+        copias = np.diff(np.append(inicios, valores.shape[0]))
+        limites = np.zeros(n_partes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parte[inicios], minlength=n_partes), out=limites[1:])
+
+        resultado: List[Union[bytes, None]] = []
+        for i in range(len(batch)):
+            if i in batch.errors:
+                resultado.append(None)
+                continue
+            j = len(PARTES) * i
+            resultado.append(CANONICO_VERSAO + b''.join(
+                _pacote_canonico(codigos[limites[k]:limites[k + 1]], copias[limites[k]:limites[k + 1]])
+                for k in range(j, j + len(PARTES))
+            ))
+        return resultado
+
+    @classmethod
+    def fingerprint_batch(cls, batch: DeckBatch) -> List[Union[str, None]]:
+        """`fingerprint` de todos os decks de um lote, None para os decks com erro."""
+        return [
+            None if c is None else hashlib.sha256(c).hexdigest()
+            for c in cls.canonical_batch(batch)
+        ]
+
+    @classmethod
+    def dedup_batch(cls, batch: DeckBatch) -> Tuple[List[int], np.ndarray]:
+        """
+        Agrupa os decks iguais de um lote pelos bytes canônicos, para que o
+        trabalho caro seja feito uma vez por deck distinto.
+
+        Args:
+            batch (DeckBatch): Lote de decks.
+
+        Returns:
+            Tuple[List[int], np.ndarray]: Índice da primeira ocorrência de cada
+            deck distinto e, para cada deck do lote, a posição do seu grupo
+            nessa lista (-1 para os decks com erro).
+        """
+        unicos: List[int] = []
+        grupos = np.full(len(batch), -1, dtype=np.int64)
+        vistos: Dict[bytes, int] = {}
+        for i, canonico in enumerate(cls.canonical_batch(batch)):
+            if canonico is None:
+                continue
+            if canonico not in vistos:
+                vistos[canonico] = len(unicos)
+                unicos.append(i)
+            grupos[i] = vistos[canonico]
+        return unicos, grupos
+
+    def same_deck(
+        self, a: Union[str, PathLike, Dict[str, List[int]]], b: Union[str, PathLike, Dict[str, List[int]]]
+    ) -> bool:
+        """
+        Compara dois decks pela codificação canônica. Cada um pode ser um
+        link YDKE, um arquivo `.ydk` ou um dicionário de `read_url`.
+
+        Raises:
+            ValueError: Se algum dos decks não puder ser lido, com a mensagem
+                de `read_url` ou `read_file_deck`.
+        """
+        return self.canonical_bytes(self.__como_deck_(a)) == self.canonical_bytes(self.__como_deck_(b))
+
+    def __como_deck_(self, deck: Union[str, PathLike, Dict[str, List[int]]]) -> Dict[str, List[int]]:
+        """Lê o deck de um link, arquivo `.ydk` ou dicionário."""
+        if isinstance(deck, dict):
+            return deck
+        if isinstance(deck, str) and PROTOCOLO in deck:
+            lido = self.read_url(_ESPACOS.sub('', deck))
+        else:
+            lido = self.read_file_deck(deck)
+        if not isinstance(lido, dict):
+            raise ValueError(lido)
+        return lido
+
     def extract_urls(self, text: str) -> List[str] | List:
         """
         Extrai todas as URLs YDKE de um texto.
@@ -114,11 +619,74 @@ class CoreYDKE:
         Returns:
             List[str]: Lista com link(s) dentro do texto.
         """
-        pat = r'ydke:\/\/[A-Za-z0-9+/=]*![A-Za-z0-9+/=]*![A-Za-z0-9+/=]*!'
-        ydke_pattern = re.compile(pat)
-        result = ydke_pattern.findall(text)
+        result = _URL.findall(text)
         return list(map(lambda x: str(x), result)) if result else []
 
+    @staticmethod
+    def iter_urls(fonte: Fonte, tamanho: int = TAMANHO_BLOCO) -> Iterator[str]:
+        """
+        Extrai as URLs YDKE de uma fonte grande, bloco a bloco, sem carregar
+        o texto inteiro. Links cortados entre blocos são completados com o
+        bloco seguinte e links quebrados em linhas, com ou sem recuo (como o
+        de `__main__`), são devolvidos sem as quebras.
+
+        Args:
+            fonte (Fonte): Texto, bytes UTF-8, arquivo aberto (texto ou
+                binário), `mmap`, caminho (`PathLike`) ou iterável de pedaços.
+            tamanho (int): Tamanho de cada bloco lido.
+
+        Yields:
+            str: Cada URL encontrada, na ordem do texto.
+        """
+        utf8 = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        resto = ''
+        for chunk in _pedacos(fonte, tamanho):
+            buffer = resto + (utf8.decode(chunk) if not isinstance(chunk, str) else chunk)
+            pos = 0
+            for casou in _URL_QUEBRADA.finditer(buffer):
+                yield _ESPACOS.sub('', casou.group())
+                pos = casou.end()
+
+            # Guarda um link ainda sem os tres '!' ou o comeco de um 'ydke://';
+            # so o ultimo 'ydke://' pode ser um link cortado pelo fim do bloco
+            inicio = buffer.rfind('ydke://', pos)
+            if inicio >= 0 and len(buffer) - inicio <= LIMITE_LINK:
+                resto = buffer[inicio:]
+            else:
+                resto = buffer[max(pos, len(buffer) - len('ydke://') + 1):]
+
+    @classmethod
+    def iter_decks(
+        cls, fonte: Fonte, tamanho: int = TAMANHO_BLOCO, lote: int = 1000
+    ) -> Iterator[Tuple[str, Dict[str, List[int]]]]:
+        """
+        Extrai e decodifica os decks de uma fonte grande (`iter_urls`), em
+        lotes de `decode_batch`; os links inválidos são ignorados.
+
+        Args:
+            fonte (Fonte): Mesma fonte de `iter_urls`.
+            tamanho (int): Tamanho de cada bloco lido.
+            lote (int): Links decodificados por vez.
+
+        Yields:
+            Tuple[str, Dict[str, List[int]]]: A URL e o deck no formato de `read_url`.
+        """
+        urls: List[str] = []
+        for url in cls.iter_urls(fonte, tamanho):
+            urls.append(url)
+            if len(urls) < lote:
+                continue
+            yield from cls.__decks_lote_(urls)
+            urls = []
+        yield from cls.__decks_lote_(urls)
+
+    @classmethod
+    def __decks_lote_(cls, urls: List[str]) -> Iterator[Tuple[str, Dict[str, List[int]]]]:
+        """Decodifica um lote de URLs e entrega os decks válidos."""
+        batch = cls.decode_batch(urls)
+        for i in batch.valid:
+            yield urls[i], batch.deck(i)
+
     def read_file_deck(self, file: Union[str, PathLike]) -> Dict[str, List[int]] | str:
         """
         Lê um arquivo `.ydk` de deck e retorna suas informações em um\n
@@ -126,7 +694,8 @@ class CoreYDKE:
 
         O arquivo deve conter:
         - `#created by ` seguido do nome do criador.
-        - Seções `#main`, `#extra` e `!side` listando os códigos das cartas.
+        - Seções `#main`, `#extra` e `!side` listando os códigos das cartas;
+          `#extra` e `!side` podem faltar e CRLF é aceito (`parse_ydk`).
 
         Args:
             file (Union[str, PathLike]): Caminho para o arquivo `.ydk`.
@@ -149,28 +718,112 @@ class CoreYDKE:
             if '.ydk' != extensao:
                 raise ValueError(f'Not a ydk file: {extensao}')
 
-            with open(abs_file, 'r', encoding='utf-8') as deck_file:
-                deck = deck_file.readlines()
+            with open(abs_file, 'r', encoding='utf-8-sig') as deck_file:
+                return parse_ydk(deck_file.read())
+        except Exception as e:
+            return str(e)
 
-            # Constantes do arquivo
-            name = deck[0].replace('#created by ', '').replace('\n', '')
-            imain = deck.index('#main\n')
-            iextra = deck.index('#extra\n')
-            iside = deck.index('!side\n')
+    @staticmethod
+    def scan_directory(
+        diretorio: Union[str, PathLike], paralelo: int = 8,
+        recursivo: bool = False, processos: bool = False
+    ) -> YdkScan:
+        """
+        Lê todos os arquivos `.ydk` de um diretório em paralelo para um único
+        lote irregular (`DeckBatch`). Um arquivo inválido não interrompe a
+        leitura: o erro fica registrado em `YdkScan.errors`.
 
-            main = [] if imain == 1 and iextra == 2 else deck[imain+1:iextra]
-            extra = [] if iextra == 2 and iside == 3 else deck[iextra+1:iside]
-            side = [] if iside == len(deck)-1 else deck[iside+1:]
+        Args:
+            diretorio (Union[str, PathLike]): Diretório com os arquivos.
+            paralelo (int): Leituras simultâneas; 1 lê sem pool.
+            recursivo (bool): Inclui os subdiretórios.
+            processos (bool): Usa processos em vez de threads, para lotes
+                grandes em que a interpretação pesa mais que a leitura.
 
-            fun_number = lambda x: int(str(x).replace('\n', ''))
-            return {
-                'created' : name,
-                'main': list(map(fun_number, main)),
-                'extra': list(map(fun_number, extra)),
-                'side': list(map(fun_number, side))
-            }
-        except Exception as e:
-            return str(e)
+        Returns:
+            YdkScan: Arquivos, criadores e decks, em ordem de caminho.
+        """
+        raiz = os.path.abspath(diretorio)
+        if recursivo:
+            paths = [os.path.join(d, f) for d, _, arqs in os.walk(raiz) for f in arqs]
+        else:
+            paths = [os.path.join(raiz, f) for f in os.listdir(raiz)]
+        paths = sorted(p for p in paths if p.lower().endswith('.ydk') and os.path.isfile(p))
+
+        # Fatias grandes diluem o custo de cada tarefa no pool
+        passo = max(1, -(-len(paths) // (paralelo * 4)))
+        fatias = [paths[i:i + passo] for i in range(0, len(paths), passo)]
+        if paralelo <= 1:
+            lidos = _le_arquivos_ydk(paths)
+        else:
+            pool: Executor = ProcessPoolExecutor(paralelo) if processos else ThreadPoolExecutor(paralelo)
+            with pool:
+                lidos = [lido for fatia in pool.map(_le_arquivos_ydk, fatias) for lido in fatia]
+
+        created: List[str] = []
+        buffers: List[bytes] = []
+        errors: Dict[int, YDKEError] = {}
+        for i, lido in enumerate(lidos):
+            if isinstance(lido, YDKEError):
+                errors[i] = lido
+                created.append('')
+                buffers.extend([b''] * len(PARTES))
+                continue
+            created.append(lido[0])
+            buffers.extend(lido[1])
+        return YdkScan(paths, created, DeckBatch.from_buffers(buffers, errors))
+
+    def write_file_deck(
+        self, deck: Dict[str, Sequence[int]], file: Union[str, PathLike],
+        created: Union[str, None] = None
+    ) -> str:
+        """
+        Grava o deck como arquivo `.ydk` (`format_ydk`).
+
+        Args:
+            deck (Dict[str, Sequence[int]]): Deck com as chaves 'main', 'extra' e 'side'.
+            file (Union[str, PathLike]): Caminho do arquivo, com extensão `.ydk`.
+            created (Union[str, None]): Criador gravado no arquivo.
+
+        Returns:
+            str: Caminho absoluto do arquivo gravado.
+
+        Raises:
+            YDKFileError: Se o caminho não tiver a extensão `.ydk`.
+        """
+        abs_file = str(os.path.abspath(file))
+        _, extensao = os.path.splitext(abs_file)
+        if '.ydk' != extensao:
+            raise YDKFileError(f'Not a ydk file: {extensao}')
+        with open(abs_file, 'w', encoding='utf-8', newline='\n') as deck_file:
+            deck_file.write(format_ydk(deck, created))
+        return abs_file
+
+    def write_batch(
+        self, batch: DeckBatch, diretorio: Union[str, PathLike],
+        nomes: Union[Sequence[str], None] = None, created: Union[str, None] = None
+    ) -> List[Union[str, None]]:
+        """
+        Grava cada deck válido de um lote como `<nome>.ydk` no diretório.
+
+        Args:
+            batch (DeckBatch): Lote de decks.
+            diretorio (Union[str, PathLike]): Diretório de saída, criado se preciso.
+            nomes (Union[Sequence[str], None]): Nome de cada arquivo, padrão `deck_<indice>`.
+            created (Union[str, None]): Criador gravado nos arquivos.
+
+        Returns:
+            List[Union[str, None]]: Caminho de cada arquivo, None para os decks com erro.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        nomes = [f'deck_{i:05d}' for i in range(len(batch))] if nomes is None else nomes
+        return [
+            None if i in batch.errors else self.write_file_deck(
+                {p: batch.part(i, p).tolist() for p in PARTES},
+                os.path.join(diretorio, f'{nomes[i]}.ydk'), created
+            )
+            for i in range(len(batch))
+        ]
 
 if __name__ == '__main__':
     base_ydke = CoreYDKE()
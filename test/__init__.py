@@ -6,7 +6,6 @@
 
 from src.ydke import CoreYDKE
 from src.mount import StructureFile
-from src.scrap import ScrapDefault
 from src.card import CardGame, CardGameAsync
 from src.ban import BanSheetWeb, BanSheetWebAsync
 from src.mesa import MesaCore, Combination
@@ -0,0 +1,173 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import sys
+import pytest
+import pandas as pd
+from fastapi.testclient import TestClient
+from src import app as app_module
+from src.base import COLUNAS_CARDS, CardDatabasePool, iter_card_rows, reconstroi_banco
+
+@pytest.fixture(scope='module')
+def client():
+    # Sem atualizacao em segundo plano durante os testes
+    intervalo, app_module.REFRESH_INTERVAL = app_module.REFRESH_INTERVAL, 0
+    try:
+        with TestClient(app_module.app) as client:
+            yield client
+    finally:
+        app_module.REFRESH_INTERVAL = intervalo
+
+@pytest.fixture()
+def catalog(client):
+    return client.app.state.catalog
+
+@pytest.fixture()
+def banco(tmp_path, monkeypatch):
+    """`cardgame.db` temporario com as cartas 1, 2 e 3 no pool compartilhado."""
+    cards = [{
+        'id': i,
+        'name': f'Card {i}',
+        'ygoprodeck_url': f'https://ygoprodeck.com/card/card-{i}',
+        'card_images': [{'id': i, 'image_url': f'{i}.jpg', 'image_url_small': f'{i}s.jpg',
+                         'image_url_cropped': f'{i}c.jpg'}]
+    } for i in (1, 2, 3)]
+    df = pd.DataFrame.from_records(iter_card_rows(cards, {}), columns=COLUNAS_CARDS)
+    path = str(tmp_path / 'cardgame.db')
+    reconstroi_banco(path, df)
+    pool = CardDatabasePool(path)
+    # o app importa `base` pelo caminho que `src/__init__.py` acrescenta
+    base = sys.modules[app_module.CardInfoOfficial.__module__]
+    monkeypatch.setattr(base.CardDatabasePool, 'shared', classmethod(lambda cls: pool))
+    yield pool
+    pool.close()
+
+def test_app_cards(client, banco):
+    r = client.get('/cards', params={'ids': '2, 999,1'})
+    assert r.status_code == 200
+    assert list(r.json()['cards']) == ['2', '1'] and r.json()['missing'] == [999]
+    assert r.json()['cards']['1']['name'] == 'Card 1'
+
+    # repetidos aparecem uma vez, na ordem da primeira ocorrencia
+    r = client.post('/cards', json={'ids': [3, 1, 3, 1000, 1000]})
+    assert r.status_code == 200
+    assert list(r.json()['cards']) == ['3', '1'] and r.json()['missing'] == [1000]
+    assert r.json() == client.get('/cards', params={'ids': '3,1,3,1000,1000'}).json()
+
+def test_app_cards_invalido(client, banco):
+    limite = list(range(app_module.MAX_CARDS + 1))
+    assert client.post('/cards', json={'ids': limite}).status_code == 400, "Limite ignorado"
+    assert client.get('/cards', params={'ids': ','.join(map(str, limite))}).status_code == 400
+    assert client.post('/cards', json={'ids': limite[:app_module.MAX_CARDS]}).status_code == 200
+
+    assert client.get('/cards', params={'ids': '1,dois'}).status_code == 400
+    # no corpo JSON a validacao de tipos e do FastAPI
+    assert client.post('/cards', json={'ids': [1, 'dois']}).status_code == 422
+
+    # fora de 32 bits sem sinal nao chega ao sqlite
+    assert client.get('/cards', params={'ids': '1,99999999999999999999'}).status_code == 400
+    assert client.get('/cards', params={'ids': '1,-1'}).status_code == 400
+    assert client.post('/cards', json={'ids': [1, 2**64]}).status_code == 400
+    assert client.post('/cards', json={'ids': [app_module.MAX_COD]}).json()['missing'] == [app_module.MAX_COD]
+
+    assert client.get('/cards', params={'ids': ''}).status_code == 400
+    assert client.get('/cards', params={'ids': ','}).status_code == 400
+    assert client.post('/cards', json={'ids': []}).status_code == 400
+
+def test_app_decklist_text(client, catalog):
+    nomes = catalog.complet['card_name'].drop_duplicates().head(2).tolist()
+    texto = f'Main Deck:\n{nomes[0]} x2\n{nomes[1].upper()} 1x\nCarta Que Nao Existe\n'
+    r = client.post('/decklist/text', json={'text': texto})
+    assert r.status_code == 200, r.text
+    dados = r.json()
+    assert len(dados['decklist']['cod']) == 3, "Copias da lista em texto incorretas"
+    assert [u['line'] for u in dados['unknown']] == [4]
+
+    assert client.post('/decklist/text', json={'text': 'nada'}).status_code == 400
+
+def test_app_decklist_text_limite(client, catalog):
+    nome = catalog.complet['card_name'].iloc[0]
+    linhas = '\n'.join([f'{nome} x1'] * (app_module.MAX_LINHAS + 1))
+    r = client.post('/decklist/text', json={'text': linhas})
+    assert r.status_code == 400 and 'lines' in r.json(), "Limite de linhas ignorado"
+    r = client.post('/decklist/text', json={'text': 'x' * (app_module.MAX_TEXTO + 1)})
+    assert r.status_code == 400 and 'bytes' in r.json(), "Limite de bytes ignorado"
+
+class _OutraVersao:
+    """O mesmo catalogo publicado com outra versao."""
+    def __init__(self, catalog):
+        self.__catalog = catalog
+
+    def __getattr__(self, nome):
+        return getattr(self.__catalog, nome)
+
+    @property
+    def version(self):
+        return self.__catalog.version + '-nova'
+
+def test_app_decklist_cached(catalog):
+    cods = catalog.complet['cod'].drop_duplicates().astype(int).tolist()
+    deck = {'main': cods[:20] * 2, 'extra': cods[20:25], 'side': cods[25:28]}
+    reordenado = {p: list(reversed(c)) for p, c in deck.items()}
+    ydk = app_module.CoreYDKE()
+    link, link_reordenado = ydk.to_url(deck), ydk.to_url(reordenado)
+    cache = app_module.ResultCache()
+
+    original = app_module.decklist_cached(link, catalog, cache)
+    assert cache.stats()['misses'] == 1 and cache.stats()['size'] == 1
+    dados = app_module.decklist_cached(link_reordenado, catalog, cache)
+    assert cache.stats()['hits'] == 1, "Deck reordenado nao usou o cache"
+    assert dados == app_module.FrameDeck(link_reordenado, catalog).get_dict_deck(), \
+        "Resultado do cache difere do deck recalculado"
+    assert dados['ydke'] == link_reordenado and dados['ydke'] != original['ydke']
+    assert dados['decklist']['cod'] == reordenado, "decklist nao remontada do link"
+
+    # catalogo trocado: as entradas da versao anterior nao valem mais
+    app_module.decklist_cached(link, _OutraVersao(catalog), cache)
+    assert cache.stats()['misses'] == 2 and cache.stats()['invalidations'] == 1
+
+    # link invalido nao passa pelo cache
+    antes = cache.stats()
+    with pytest.raises(TypeError):
+        app_module.FrameDeck('ydke://invalido!!', catalog).get_dict_deck()
+    with pytest.raises(TypeError):
+        app_module.decklist_cached('ydke://invalido!!', catalog, cache)
+    assert cache.stats() == antes, "Link invalido consultou o cache"
+
+def test_app_lifespan(monkeypatch):
+    monkeypatch.setattr(app_module, 'REFRESH_INTERVAL', 0)
+    with TestClient(app_module.app) as client:
+        state = client.app.state
+        catalog = state.catalog
+        assert isinstance(catalog, app_module.CardCatalog), "Catalogo nao carregado na inicializacao"
+        # indice de estruturas montado antes da primeira requisicao
+        assert catalog._CardCatalog__ESTRUTURAS is not None, "Estruturas nao aquecidas"
+
+        cods = catalog.complet['cod'].drop_duplicates().astype(int).head(3).tolist()
+        link = app_module.CoreYDKE().to_url({'main': cods, 'extra': [], 'side': []})
+        for _ in range(2):
+            assert client.get('/decklist', params={'ydke': link}).status_code == 200
+        assert state.catalog is catalog, "Requisicoes trocaram o catalogo compartilhado"
+        assert state.deck_cache.stats()['hits'] == 1
+        assert not client.get('/refresh').json()['alive'], "Atualizacao iniciada com intervalo 0"
+    assert not state.scheduler.status()['alive']
+
+def test_app_decklist_muitas_copias(client, catalog):
+    import json
+    cods = catalog.complet['cod'].drop_duplicates().astype(int).tolist()
+    ydk = app_module.CoreYDKE()
+    link = ydk.to_url({'main': cods[:40], 'extra': [], 'side': [cods[0]] * 256})
+    esperado = app_module.FrameDeck(link, catalog).get_dict_deck()
+
+    r = client.get('/decklist', params={'ydke': link})
+    assert r.status_code == 200, "Deck com mais de 255 copias falhou"
+    assert r.json()['full_cards'] == esperado['full_cards']
+
+    normal = ydk.to_url({'main': cods[:40], 'extra': [], 'side': []})
+    r = client.post('/decklists', json={'ydke': [link, normal, link]})
+    assert r.status_code == 200
+    registros = [json.loads(l) for l in r.text.splitlines() if l]
+    assert len(registros) == 3 and all('error' not in d for d in registros), "Lote interrompido"
+    assert registros[0]['deck']['full_cards'] == registros[2]['deck']['full_cards'] == esperado['full_cards']
@@ -0,0 +1,115 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import pytest
+import pandas as pd
+from src.base import COLUNAS_CARDS, iter_card_rows, mapa_arquetipos
+
+def _card(id, imagens):
+    return {
+        'id': id,
+        'name': f'Card {id}',
+        'typeline': ['Dragon', 'Effect'],
+        'ygoprodeck_url': f'https://ygoprodeck.com/card/card-{id}',
+        'card_prices': [{'cardmarket_price': '0.10'}],
+        'card_images': [
+            {'id': i, 'image_url': f'{i}.jpg', 'image_url_small': f'{i}s.jpg',
+             'image_url_cropped': f'{i}c.jpg'} for i in imagens
+        ]
+    }
+
+def test_iter_card_rows():
+    complet = pd.DataFrame({'cod': [1, 2, 1], 'arquetype': ['Alfa', 'Beta', 'Gama']})
+    cards = [_card(1, [1, 10]), _card(2, [2]), _card(3, [3]), _card(4, [])]
+    linhas = list(iter_card_rows(cards, mapa_arquetipos(complet)))
+
+    assert [l['id'] for l in linhas] == [1, 10, 2, 3], "Linhas por imagem incorretas"
+    assert [l['arquetype_mc'] for l in linhas] == ['Alfa', 'Alfa', 'Beta', ''], \
+        "Join de arquetipos incorreto"
+    assert linhas[0]['id_sets'] == '1|10' and linhas[2]['id_sets'] == '2', "id_sets incorreto"
+    assert linhas[1]['image_url'] == '10.jpg', "Imagem alternativa incorreta"
+    assert linhas[0]['name_ygopro'] == 'card-1' and linhas[0]['type_set'] == 'Dragon | Effect'
+    assert all(list(l.keys()) == COLUNAS_CARDS for l in linhas), "Colunas fora de ordem"
+
+def test_mapa_arquetipos_vazio():
+    assert mapa_arquetipos(None) == {}, "Planilha ausente deve gerar mapa vazio"
+
+def test_sincroniza_cards(tmp_path):
+    import sqlite3
+    from src.base import CardDatabasePool, sincroniza_cards
+
+    cards = [_card(1, [1, 10]), _card(2, [2]), _card(3, [3])]
+    df = pd.DataFrame.from_records(iter_card_rows(cards, {}), columns=COLUNAS_CARDS)
+    path = str(tmp_path / 'cardgame.db')
+    conx = sqlite3.connect(path, isolation_level=None)
+
+    assert sincroniza_cards(conx, df) == {'rows': 4, 'inserted': 4, 'updated': 0, 'deleted': 0, 'version': 1}
+    assert sincroniza_cards(conx, df)['version'] == 1, "Versao mudou sem alteracoes"
+
+    df.loc[df['id'] == 2, 'name'] = 'Novo nome'
+    resumo = sincroniza_cards(conx, df[df['id'] != 3])
+    assert resumo == {'rows': 3, 'inserted': 0, 'updated': 1, 'deleted': 1, 'version': 2}, f"Diff incorreto: {resumo}"
+    conx.close()
+
+    pool = CardDatabasePool(path)
+    assert pool.catalog_version() == 2, "Versao do catalogo nao gravada"
+    assert pool.fetch_one(2)['name'] == 'Novo nome' and pool.fetch_one(3) == {}, "Upsert incorreto"
+    pool.close()
+
+def test_reconstroi_banco(tmp_path):
+    import os
+    import sqlite3
+    from src.base import CardDatabasePool, reconstroi_banco
+
+    path = str(tmp_path / 'cardgame.db')
+    df = pd.DataFrame.from_records(
+        iter_card_rows([_card(1, [1]), _card(2, [2])], {}), columns=COLUNAS_CARDS
+    )
+    assert reconstroi_banco(path, df)['inserted'] == 2, "Banco inicial nao montado"
+
+    pool = CardDatabasePool(path)
+    assert pool.fetch_one(1)['name'] == 'Card 1'
+    inode = os.stat(path).st_ino
+
+    df.loc[df['id'] == 1, 'name'] = 'Trocado'
+    resumo = reconstroi_banco(path, df)
+    assert resumo == {'rows': 2, 'inserted': 0, 'updated': 1, 'deleted': 0, 'version': 2}, f"Diff incorreto: {resumo}"
+    assert os.stat(path).st_ino != inode, "Banco nao foi trocado por rename"
+    assert pool.fetch_one(1)['name'] == 'Trocado', "Pool seguiu no arquivo antigo"
+
+    with pytest.raises(sqlite3.DatabaseError):
+        reconstroi_banco(path, df.iloc[0:0])
+    assert pool.fetch_one(2)['name'] == 'Card 2', "Banco valido substituido"
+    assert sorted(os.listdir(tmp_path)) == ['cardgame.db'], "Temporarios nao removidos"
+    pool.close()
+
+def test_fetch_many(tmp_path, monkeypatch):
+    from src.base import CardDatabasePool, CardInfoOfficial, reconstroi_banco
+
+    path = str(tmp_path / 'cardgame.db')
+    df = pd.DataFrame.from_records(
+        iter_card_rows([_card(i, [i]) for i in range(1, 1201)], {}), columns=COLUNAS_CARDS
+    )
+    reconstroi_banco(path, df)
+    pool = CardDatabasePool(path)
+    monkeypatch.setattr(CardDatabasePool, 'shared', classmethod(lambda cls: pool))
+
+    # a conexao do pool e reaproveitada: suas consultas ficam registradas
+    consultas = []
+    with pool.connection() as conx:
+        conx.set_trace_callback(consultas.append)
+
+    ids = list(range(1300, 0, -1)) + [5, 5]
+    cards = pool.fetch_many(ids)
+    assert sorted(cards) == list(range(1, 1201)), "Codigos inexistentes ou faltantes"
+    lotes = [c for c in consultas if ' IN (' in c]
+    assert len(lotes) == -(-1300 // CardDatabasePool.LOTE_IN), f"Lotes IN incorretos: {len(lotes)}"
+
+    muitos = CardInfoOfficial.many([1, 700, 1250, 700])
+    assert sorted(muitos) == [1, 700], "Ausentes no resultado de many"
+    for cod in (1, 700, 1200):
+        assert cards[cod] == CardInfoOfficial(cod).info_card, "Lote diferente da busca unitaria"
+    assert muitos[700].name == CardInfoOfficial(700).name == 'Card 700'
+    pool.close()
@@ -0,0 +1,73 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import pytest
+import pandas as pd
+from pandas import DataFrame
+from src.catalog import CardCatalog, CardLookup
+
+@pytest.fixture(scope='module')
+def catalog():
+    return CardCatalog()
+
+def test_catalog_lookup(catalog):
+    cods = catalog.complet['cod'].head(3).to_list()
+    busca = catalog.lookup([cods[1], 1, cods[0], cods[1]])
+    assert isinstance(busca, CardLookup), "Busca sem estrutura"
+    assert isinstance(busca.frame, DataFrame), "Nao é um DataFrame"
+    assert busca.frame['cod'].to_list() == [cods[1], cods[0], cods[1]], "Ordem alterada"
+    assert busca.missing == [1], "Ausentes incorretos"
+
+def test_catalog_lookup_many(catalog):
+    cods = catalog.complet['cod'].head(4).to_list()
+    partes = [cods[:2], [], [1] + cods[2:]]
+    buscas = catalog.lookup_many(partes)
+    assert len(buscas) == 3, "Numero de buscas incorreto"
+    for parte, busca in zip(partes, buscas):
+        unica = catalog.lookup(parte)
+        assert busca.frame['cod'].to_list() == unica.frame['cod'].to_list()
+        assert busca.missing == unica.missing
+
+def test_catalog_classify(catalog):
+    mini = [m for m in catalog.mini_arquetipos if isinstance(m, str)]
+    if not mini:
+        pytest.skip('Sem mini-arquetipos no cache')
+    assert catalog.classify(mini[0]) == 'generic'
+    assert catalog.classify(f'Arquetipo Qualquer | {mini[0]}') == 'generic'
+    assert catalog.classify('Arquetipo Qualquer') == 'Arquetipo Qualquer'
+    serie = pd.Series([mini[0], 'Arquetipo Qualquer'])
+    assert catalog.classify_series(serie).to_list() == ['generic', 'Arquetipo Qualquer']
+
+def test_catalog_version(catalog):
+    from src.catalog import ler_cache, ler_var
+    complet, mini, home = ler_cache('complet.csv'), ler_cache('min.csv'), ler_var('Home.csv')
+    # a versao vem do conteudo carregado, lido do disco ou recebido pronto
+    assert CardCatalog(complet, mini, home).version == catalog.version
+    alterado = complet.copy()
+    alterado['card_name'] = alterado['card_name'].astype(str) + ' '
+    assert CardCatalog(alterado, mini, home).version != catalog.version, "Conteudo novo, mesma versao"
+
+def test_catalog_card_structures(catalog):
+    import os
+    from src import dump
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'json', 'data_cards_official.json')
+    if not os.path.exists(path):
+        pytest.skip('Sem dump oficial das cartas')
+    carta = next((
+        c for c in dump.iter_file(path)
+        if any(i['id'] != c['id'] for i in c['card_images'])
+    ), None)
+    if carta is None:
+        pytest.skip('Sem artes alternativas no dump')
+
+    estruturas = catalog.card_structures
+    assert catalog.card_structures is estruturas, "Indice montado mais de uma vez"
+    base = catalog.card_structure(carta['id'])
+    assert base['id'] == carta['id'] and base['name'] == carta['name']
+    arte = next(i['id'] for i in carta['card_images'] if i['id'] != carta['id'])
+    alternativa = catalog.card_structure(arte)
+    assert alternativa['id'] == arte, "Arte alternativa sem o proprio codigo"
+    assert {**alternativa, 'id': carta['id']} == base, "Arte alternativa nao aponta para a carta"
+    assert catalog.card_structure(-1) is None
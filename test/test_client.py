@@ -0,0 +1,94 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.client import HttpClient, AsyncHttpClient
+
+class _Handler(BaseHTTPRequestHandler):
+    contagem: dict = {}
+    ativos: int = 0
+    pico: int = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, corpo, headers=None):
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(dados)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.contagem[self.path] = cls.contagem.get(self.path, 0) + 1
+            vez = cls.contagem[self.path]
+        if self.path == '/ok':
+            self._json(200, {'folha': [['a']]})
+        elif self.path.startswith('/instavel'):
+            # Duas falhas antes do sucesso
+            self._json(503, {}) if vez <= 2 else self._json(200, {'vez': vez})
+        elif self.path == '/limite':
+            self._json(429, {}, {'Retry-After': '0'}) if vez == 1 else self._json(200, {'vez': vez})
+        elif self.path == '/erro':
+            self._json(500, {})
+        elif self.path.startswith('/lento'):
+            with cls.lock:
+                cls.ativos += 1
+                cls.pico = max(cls.pico, cls.ativos)
+            time.sleep(0.1)
+            with cls.lock:
+                cls.ativos -= 1
+            self._json(200, {'ok': True})
+        else:
+            self._json(404, {})
+
+@pytest.fixture(scope='module')
+def servidor():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+def test_http_client_retry(servidor):
+    client = HttpClient(tentativas=3, backoff_base=0.01)
+    assert client.get_json(f'{servidor}/ok') == {'folha': [['a']]}
+    assert client.get_json(f'{servidor}/instavel-sync') == {'vez': 3}, "503 nao repetido"
+    assert client.get_json(f'{servidor}/erro') is None, "Erro final deve retornar None"
+    assert _Handler.contagem['/erro'] == 4, "Numero de tentativas incorreto"
+    client.close()
+
+def test_async_client_retry(servidor):
+    async def executa():
+        async with AsyncHttpClient(tentativas=3, backoff_base=0.01) as client:
+            return await asyncio.gather(
+                client.get_json(f'{servidor}/instavel-async'),
+                client.get_json(f'{servidor}/limite'),
+                client.get_json(f'{servidor}/nada')
+            )
+    instavel, limite, nada = asyncio.run(executa())
+    assert instavel == {'vez': 3}, "503 nao repetido"
+    assert limite == {'vez': 2}, "429 com Retry-After nao repetido"
+    assert nada is None and _Handler.contagem['/nada'] == 1, "404 nao deve ser repetido"
+
+def test_async_client_limite_host(servidor):
+    async def executa():
+        async with AsyncHttpClient(limite_host=2) as client:
+            return await asyncio.gather(*(client.get_json(f'{servidor}/lento/{i}') for i in range(6)))
+    assert all(r == {'ok': True} for r in asyncio.run(executa()))
+    assert _Handler.pico <= 2, f"Limite por host excedido: {_Handler.pico}"
@@ -0,0 +1,41 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import os
+import pandas as pd
+from src import colunar
+
+def _csv(tmp_path, lim=';'):
+    df = pd.DataFrame({
+        'cod': [89631139, 46986414, 14558127],
+        'card_name': ['Blue-Eyes White Dragon', 'Dark Magician', None],
+        'tipo': ['Normal Monster', 'Normal Monster', 'Effect Monster'],
+        'arquetype': ['Blue-Eyes', 'Dark Magician', None],
+        'atk': [3000.0, 2500.0, None]
+    })
+    path = os.path.join(tmp_path, 'complet.csv')
+    df.to_csv(path, sep=lim, index=False)
+    return path
+
+def test_colunar_ida_volta(tmp_path):
+    path = _csv(tmp_path)
+    assert colunar.write_frame(path, ';'), "Diretorio colunar nao gravado"
+    lido = colunar.read_frame(path)
+    esperado = pd.read_csv(path, sep=';')
+    assert lido is not None, "Versao colunar ignorada"
+    assert lido['cod'].dtype == 'int32', f"cod nao e int32: {lido['cod'].dtype}"
+    assert isinstance(lido['tipo'].dtype, pd.CategoricalDtype), "tipo nao e categoria"
+    lido = lido.astype({'cod': 'int64', 'tipo': object, 'arquetype': object})
+    pd.testing.assert_frame_equal(lido, esperado)
+
+def test_colunar_desatualizado(tmp_path):
+    path = _csv(tmp_path)
+    colunar.write_frame(path, ';')
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('1;Nova;Spell;;\n')
+    assert colunar.read_frame(path) is None, "Versao colunar desatualizada foi usada"
+
+def test_colunar_ausente(tmp_path):
+    assert colunar.read_frame(_csv(tmp_path, '|')) is None, "Leitura sem diretorio colunar"
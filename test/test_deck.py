@@ -31,28 +31,49 @@ def test_caches_deck():
 def test_full_cards():
     frame_deck = frame(LINK)
     assert isinstance(frame_deck.full_cards_main, int), None
-    assert frame_deck._cache_full_main != None, type(None)
-
     assert isinstance(frame_deck.full_cards_extra, int), None
-    assert frame_deck._cache_full_extra != None, type(None)
-
     assert isinstance(frame_deck.full_cards_side, int), None
-    assert frame_deck._cache_full_side != None, type(None)
-
     assert isinstance(frame_deck.full_cards_arquetype, int), None
-    assert frame_deck._cache_full_arquetype != None, type(None)
-
     assert isinstance(frame_deck.full_cards_generic, int), None
-    assert frame_deck._cache_full_generic != None, type(None)
-
     assert isinstance(frame_deck.full_cards_invalid, int), None
-    assert frame_deck._cache_full_invalid != None, type(None)
-
     assert isinstance(frame_deck.full_cards_deck, int), None
-    assert frame_deck._cache_full_cards != None, type(None)
+    assert frame_deck._cache_contagens is not None, type(None)
+
+def test_contagens():
+    frame_deck = frame(LINK)
+    contagens = frame_deck.contagens
+    assert contagens.shape == (3, 4, 4, 2), "Eixos do tensor alterados"
+    assert frame_deck.full_cards_deck == int(frame_deck.decklist()['qtd_copy'].sum())
+    assert frame_deck.full_cards_main == int(frame_deck.main['qtd_copy'].sum())
+    assert frame_deck.full_cards_deck == frame_deck.full_cards_main + \
+        frame_deck.full_cards_extra + frame_deck.full_cards_side
+
+    main = frame_deck.main
+    monster = main.loc[main['tipo'].apply(lambda x: 'Monster' in x)]
+    assert frame_deck.number_monster_main == int(monster['qtd_copy'].sum())
+    generic = main.loc[main['arquetype'] == 'generic']
+    assert frame_deck.number_cards_generic_main == int(generic['qtd_copy'].sum())
+    banlist = main.loc[main['cod'].isin(frame_deck.VETOR_COD_BANLIST)]
+    assert frame_deck.number_cards_banlist_main == int(banlist['qtd_copy'].sum())
 
 def test_dict_deck():
     frame_ = frame(LINK)
     dados = frame_.get_dict_deck()
     assert isinstance(dados, str) == False, "Dados incorretos"
     assert isinstance(dados, dict) == True, "Dados incorretos"
+
+def test_analyze_many():
+    frame_ = frame(LINK)
+    lote = list(FrameDeck.analyze_many([LINK, 'invalido', LINK], frame_.CATALOG))
+    assert [r['index'] for r in lote] == [0, 1, 2], "Ordem do lote alterada"
+    assert 'error' in lote[1], "Link invalido sem erro"
+    assert lote[0]['deck'] == frame_.get_dict_deck(), "Lote diverge do deck unico"
+    assert lote[2]['deck'] == lote[0]['deck'], "Decks iguais divergem"
+
+def test_analyze_many_dedup():
+    frame_ = frame(LINK)
+    deck = frame_.get_deck()
+    invertido = frame_.to_url({p: deck[p][::-1] for p in deck})
+    lote = list(FrameDeck.analyze_many([LINK, invertido], frame_.CATALOG))
+    assert lote[1]['deck'] == frame(invertido).get_dict_deck(), "Deck reaproveitado diverge da analise"
+    assert frame(invertido).deck_fingerprint == frame_.deck_fingerprint
@@ -0,0 +1,77 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import os
+import pytest
+import pandas as pd
+from src.ydke import CoreYDKE
+from src.decklist import CardNameIndex, DecklistParser, normaliza_nome
+
+ARQUETIPO = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'arquetypes', 'A', 'A.I..txt')
+
+@pytest.fixture()
+def parser():
+    frame = pd.DataFrame({
+        'cod': [89631139, 14558127, 7902349, 23434538, 64182380],
+        'card_name': [
+            'Blue-Eyes White Dragon', 'Ash Blossom & Joyous Spring', '7 Colored Fish',
+            'Maxx "C"', 'Hieratic Seal of the Heavenly Spheres'
+        ]
+    })
+    return DecklistParser(CardNameIndex.from_frame(frame))
+
+def test_normaliza_nome():
+    assert normaliza_nome('Ash Blossom & Joyous Spring') == 'ash blossom joyous spring'
+    assert normaliza_nome('Maxx "C"') == normaliza_nome('maxx c')
+    assert normaliza_nome('Évolution Burst') == 'evolution burst'
+
+def test_decklist_parse(parser):
+    texto = (
+        'Main Deck:\r\n'
+        'Blue-Eyes White Dragon x3\r\n'
+        '2 Ash Blossom & Joyous Spring\r\n'
+        '7 Colored Fish\r\n'
+        'Monsters:\r\n'
+        'Maxx C x2\r\n'
+        'Blue-Eyes White Dragon 1x\r\n'
+        'Carta Desconhecida x1\r\n'
+        'Extra Deck:\r\n'
+        'Side Deck:\r\n'
+        'Hieratic Seal of the Heavenly Sphere x1\r\n'
+    )
+    resultado = parser.parse(texto)
+    assert resultado.deck == {
+        'main': [89631139] * 3 + [14558127] * 2 + [7902349] + [23434538] * 2 + [89631139],
+        'extra': [],
+        'side': [64182380]
+    }
+    assert resultado.unknown == [{'line': 8, 'text': 'Carta Desconhecida x1', 'section': 'main'}]
+    assert [f['cod'] for f in resultado.fuzzy] == [64182380], "Nome aproximado nao resolvido"
+    assert CoreYDKE().read_url(parser.to_url(texto)) == resultado.deck
+
+def test_decklist_arquetipo():
+    # os arquivos de arquetypes/ usam o mesmo formato
+    with open(ARQUETIPO, encoding='utf-8') as file:
+        linhas = [l.rsplit(' x', 1)[0] for l in file.read().splitlines() if l.endswith(' x1')]
+    parser = DecklistParser(CardNameIndex(zip(linhas, range(1, len(linhas) + 1))))
+    with open(ARQUETIPO, encoding='utf-8') as file:
+        resultado = parser.parse(file.read())
+    assert resultado.unknown == [], "Linhas do arquivo de arquetipo nao reconhecidas"
+    assert sum(len(codigos) for codigos in resultado.deck.values()) == len(linhas)
+
+def test_decklist_lote(parser):
+    textos = ['Main Deck:\nBlue-Eyes White Dragon x3\n', 'Side Deck:\nMaxx "C" x1\n', '']
+    lote, resultados = parser.parse_many(textos)
+    assert len(lote) == 3 and lote.errors == {}
+    assert [lote.deck(i) for i in range(3)] == [r.deck for r in resultados]
+
+def test_decklist_aproximacao():
+    index = CardNameIndex([('Dark Magician', 46986414), ('Dark Magician Girl', 38033121)], memoria=1)
+    assert index.resolve('Dark Magican') == (46986414, 'dark magician')
+    # sem palavra em comum nao ha aproximacao
+    assert index.resolve('Zzzz Qqqq') == (None, None)
+    # a memoria e limitada e o resultado nao muda apos o descarte
+    assert index.resolve('Dark Magican Girl') == (38033121, 'dark magician girl')
+    assert index.resolve('Dark Magican') == (46986414, 'dark magician')
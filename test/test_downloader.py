@@ -0,0 +1,88 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+from src.downloader import DependencyDownloader
+from src.manifest import SourceManifest
+
+_COLUNAS = ['cod', 'card_name', 'tipo', 'effect', 'arquetype']
+_CARTAS = [
+    [89631139, 'Blue-Eyes White Dragon', 'Normal Monster', '', 'Blue-Eyes'],
+    [14558127, 'Ash Blossom & Joyous Spring', 'Effect Monster', '', 'Hand Trap']
+]
+_BAN = ['Card Type', 'Card Name', 'Condition', 'Remarks']
+
+def _folhas():
+    folhas = {s: {'col': _COLUNAS, s: _CARTAS} for s in ['complet', 'monster', 'spell', 'trap']}
+    folhas['min'] = {'col': ['name'], 'min': [['Hand Trap']]}
+    folhas['Home'] = {'folha': [_BAN, ['Monster', 'Ash Blossom & Joyous Spring', 'Limited', '']]}
+    for s in ['Forbidden', 'Limited', 'Semi-limited', 'Unlimited']:
+        folhas[s] = {'folha': [_BAN]}
+    return folhas
+
+class _Handler(BaseHTTPRequestHandler):
+    folhas = _folhas()
+    falha: set = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        sheet = parse_qs(urlsplit(self.path).query)['sheet'][0]
+        if sheet in self.falha:
+            self.send_response(404)
+            self.end_headers()
+            return
+        dados = json.dumps(self.folhas[sheet]).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+@pytest.fixture(scope='module')
+def servidor():
+    ThreadingHTTPServer.request_queue_size = 32
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+def _downloader(servidor, tmp_path):
+    manifest = SourceManifest(str(tmp_path / 'sources.json'))
+    downloader = DependencyDownloader(manifest=manifest, diretorio=str(tmp_path))
+    for nome, (_, path, lim, folha) in downloader.FONTES.items():
+        downloader.FONTES[nome] = (f'{servidor}/exec?sheet={folha}', path, lim, folha)
+    return downloader
+
+def test_downloader(servidor, tmp_path):
+    downloader = _downloader(servidor, tmp_path)
+    catalogo = downloader.run_sync()
+    assert len(downloader.ALTERADOS) == 10, f"Folhas alteradas: {downloader.ALTERADOS}"
+    assert sorted(os.listdir(tmp_path / 'var')) == sorted(
+        f'{s}{e}' for s in ['Home', 'Forbidden', 'Limited', 'Semi-limited', 'Unlimited']
+        for e in ['.csv', '.csv.col']
+    ) + ['manifest.json'], "Arquivos de var/ incorretos ou temporarios deixados"
+    assert catalogo.banlist['cod'].tolist() == [14558127], "Banlist atual incorreta"
+    assert catalogo.classify('Hand Trap') == 'generic', "Mini arquetipos nao carregados"
+
+    downloader = _downloader(servidor, tmp_path)
+    assert downloader.run_sync(catalogo=False) is None, "Catalogo montado sem ser pedido"
+    assert downloader.ALTERADOS == [], "Folhas inalteradas foram regravadas"
+
+def test_downloader_falha(servidor, tmp_path):
+    _Handler.falha = {'spell'}
+    try:
+        with pytest.raises(ConnectionError):
+            _downloader(servidor, tmp_path).run_sync()
+    finally:
+        _Handler.falha = set()
+    assert not (tmp_path / 'sources.json').exists(), "Manifesto salvo apos falha"
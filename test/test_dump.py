@@ -0,0 +1,41 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import json
+import pytest
+from src import dump
+
+CARDS = [
+    {'id': 1, 'name': 'Dark Magician', 'card_images': [{'id': 1}]},
+    {'id': 2, 'name': 'Ração "ú"', 'atk': 2500, 'card_images': [{'id': 2}, {'id': 20}]}
+]
+
+@pytest.mark.parametrize('tamanho', [1, 3, 64])
+def test_iter_json_array_resposta(tamanho):
+    texto = json.dumps({'data': CARDS, 'meta': {'total': 2}}, ensure_ascii=False, indent=4)
+    dados = texto.encode('utf-8')
+    chunks = [dados[i:i + tamanho] for i in range(0, len(dados), tamanho)]
+    assert list(dump.iter_json_array(chunks)) == CARDS, f"Falha com blocos de {tamanho} bytes"
+
+def test_iter_json_array_invalido():
+    with pytest.raises(ValueError):
+        list(dump.iter_json_array(['{"meta": {}, "data": []}']))
+    with pytest.raises(ValueError):
+        list(dump.iter_json_array(['[{"id": 1}, {"id"']))
+
+def test_write_file(tmp_path):
+    path = str(tmp_path / 'data_cards_official.json')
+    assert list(dump.write_file(path, iter(CARDS))) == CARDS, "Cartas nao repassadas"
+    with open(path, 'r', encoding='utf-8') as file:
+        linhas = file.read().splitlines()
+    assert len(linhas) == len(CARDS) + 2, "Dump nao tem uma carta por linha"
+    assert list(dump.iter_file(path, tamanho=5)) == CARDS, "Dump gravado ilegivel"
+
+def test_write_file_interrompido(tmp_path):
+    path = str(tmp_path / 'data_cards_official.json')
+    gravacao = dump.write_file(path, iter(CARDS))
+    next(gravacao)
+    gravacao.close()
+    assert list(tmp_path.iterdir()) == [], "Dump parcial ou temporario deixado no disco"
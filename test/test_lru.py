@@ -0,0 +1,39 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import time
+import pytest
+from src.lru import ResultCache
+
+@pytest.fixture()
+def cache():
+    return ResultCache(maxsize=2, ttl=60)
+
+def test_cache_hit_miss(cache):
+    assert cache.get('v1', 'a') is None, "Chave inexistente retornou valor"
+    cache.put('v1', 'a', {'x': 1})
+    assert cache.get('v1', 'a') == {'x': 1}, "Valor nao recuperado"
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1, f"Contadores errados: {stats}"
+
+def test_cache_lru(cache):
+    cache.put('v1', 'a', 1)
+    cache.put('v1', 'b', 2)
+    cache.get('v1', 'a')
+    cache.put('v1', 'c', 3) # remove 'b', o menos usado
+    assert cache.get('v1', 'b') is None, "Entrada menos usada nao removida"
+    assert cache.get('v1', 'a') == 1, "Entrada recente removida"
+
+def test_cache_versao(cache):
+    cache.put('v1', 'a', 1)
+    assert cache.get('v2', 'a') is None, "Versao nova leu dado antigo"
+    assert cache.stats()['invalidations'] == 1, "Invalidação nao contada"
+    assert cache.stats()['size'] == 0, "Entradas antigas mantidas"
+
+def test_cache_ttl():
+    cache = ResultCache(maxsize=2, ttl=0.01)
+    cache.put('v1', 'a', 1)
+    time.sleep(0.02)
+    assert cache.get('v1', 'a') is None, "Entrada expirada retornada"
@@ -0,0 +1,159 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import os
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import pandas as pd
+from src.ban import BanSheetWebAsync
+from src.card import CardGameAsync
+from src.catalog import ler_artefato
+from src.client import HttpClient, AsyncHttpClient
+from src.manifest import SourceManifest, ArtifactManifest, grava_csv_atomico, remove_dir_atomico
+
+class _Handler(BaseHTTPRequestHandler):
+    corpo: bytes = b'{"folha": [1]}'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/falha':
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = '"v1"' if self.path == '/etag' else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(self.corpo)))
+        self.end_headers()
+        self.wfile.write(self.corpo)
+
+@pytest.fixture(scope='module')
+def servidor():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+def test_manifest_etag(servidor, tmp_path):
+    path = str(tmp_path / 'sources.json')
+    artefato = tmp_path / 'complet.csv'
+    client = HttpClient(tentativas=0)
+
+    manifest = SourceManifest(path)
+    assert manifest.fetch('card:complet', f'{servidor}/etag', client, str(artefato)) == (200, _Handler.corpo)
+    artefato.write_text('cod;arquetype\n')
+    manifest.save()
+
+    manifest = SourceManifest(path)
+    assert manifest.conditional_headers('card:complet', str(artefato)) == {'If-None-Match': '"v1"'}
+    assert manifest.fetch('card:complet', f'{servidor}/etag', client, str(artefato)) == (304, None)
+
+    artefato.unlink()
+    assert manifest.fetch('card:complet', f'{servidor}/etag', client, str(artefato))[0] == 200, \
+        "Artefato ausente deve forcar o download"
+
+def test_manifest_hash(servidor, tmp_path):
+    path = str(tmp_path / 'sources.json')
+    manifest = SourceManifest(path)
+
+    async def busca():
+        async with AsyncHttpClient(tentativas=0) as client:
+            return await manifest.fetch_async('ban:Home', f'{servidor}/sem-etag', client)
+
+    assert asyncio.run(busca())[0] == 200
+    assert asyncio.run(busca()) == (304, None), "Mesmo conteudo deve ser inalterado"
+    assert manifest.entry('ban:Home')['sha256'] == SourceManifest.digest(_Handler.corpo)
+
+def test_manifest_sync(servidor, tmp_path):
+    path = tmp_path / 'sources.json'
+    manifest = SourceManifest(str(path))
+    gravados = []
+
+    async def grava(nome, conteudo):
+        (tmp_path / f'{nome}.csv').write_bytes(conteudo)
+        gravados.append(nome)
+
+    async def sincroniza(fontes, junto=None):
+        async with AsyncHttpClient(tentativas=0) as client:
+            return await manifest.sync_async(client, fontes, grava, junto)
+
+    fontes = {n: (f'{servidor}/sem-etag', str(tmp_path / f'{n}.csv')) for n in ('a', 'b')}
+    with pytest.raises(ConnectionError):
+        asyncio.run(sincroniza({**fontes, 'c': (f'{servidor}/falha', str(tmp_path / 'c.csv'))}))
+    assert not path.exists(), "Manifesto salvo apos falha"
+    assert sorted(gravados) == ['a', 'b'], "Fontes baixadas nao foram gravadas"
+
+    async def junto(tarefas):
+        return await tarefas['a']
+    assert asyncio.run(sincroniza(fontes, junto)) == ([], False)
+    assert path.exists(), "Manifesto nao salvo apos sucesso"
+    assert sorted(gravados) == ['a', 'b'], "Fontes inalteradas foram regravadas"
+
+@pytest.mark.parametrize('classe, folha', [(CardGameAsync, 'complet'), (BanSheetWebAsync, 'Home')])
+def test_creat_files_falha(classe, folha, monkeypatch):
+    salvos = []
+    async def falha(self, nome, url, client, artefato=None):
+        return 503, None
+    monkeypatch.setattr(SourceManifest, 'fetch_async', falha)
+    monkeypatch.setattr(SourceManifest, 'save', lambda self: salvos.append(self))
+    assert asyncio.run(classe().creat_files([folha])) is False, "Falha de download reportada como sucesso"
+    assert salvos == [], "Manifesto salvo apos falha"
+
+def _frame(n):
+    return pd.DataFrame({'cod': list(range(n)), 'card_name': [f'Carta {i}' for i in range(n)]})
+
+def test_artefato_gravado(tmp_path):
+    path = str(tmp_path / 'cache' / 'min.csv')
+    grava_csv_atomico(_frame(3), path, ';')
+    entrada = ArtifactManifest.of(path).entry(path)
+    assert entrada['rows'] == 3 and entrada['version'] == 1
+    assert entrada['size'] == os.path.getsize(path)
+    assert sorted(os.listdir(tmp_path / 'cache')) == ['manifest.json', 'min.csv', 'min.csv.col'], \
+        "Temporarios nao devem sobrar no diretorio"
+
+    grava_csv_atomico(_frame(3), path, ';')
+    assert ArtifactManifest.of(path).entry(path)['version'] == 1, "Mesmo conteudo mantem a versao"
+    grava_csv_atomico(_frame(4), path, ';')
+    assert ArtifactManifest.of(path).entry(path)['version'] == 2
+
+def test_artefato_verificado(tmp_path):
+    path = str(tmp_path / 'min.csv')
+    manifest = ArtifactManifest(str(tmp_path))
+    manifest.write_csv(_frame(3), path, ';')
+    assert manifest.verify(path) is not None
+
+    os.utime(path, ns=(0, 0))
+    assert manifest.verify(path) is not None, "So a data mudou, o sha256 confere"
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('3;Carta 3\n')
+    assert manifest.verify(path) is None, "Arquivo alterado fora do manifesto"
+
+def test_artefato_lido_sem_reparse(tmp_path):
+    path = str(tmp_path / 'min.csv')
+    grava_csv_atomico(_frame(3), path, ';')
+    primeiro = ler_artefato(path, ';')
+    primeiro.loc[0, 'card_name'] = 'Alterada'
+    assert ler_artefato(path, ';')['card_name'][0] == 'Carta 0', "Leitor recebeu a copia compartilhada"
+
+    pd.DataFrame({'cod': [9], 'card_name': ['Nova']}).to_csv(path, sep=';', index=False)
+    assert ler_artefato(path, ';')['card_name'].tolist() == ['Nova'], "Arquivo alterado deve ser relido"
+
+def test_remove_dir_atomico(tmp_path):
+    grava_csv_atomico(_frame(2), str(tmp_path / 'var' / 'Home.csv'), '|')
+    assert remove_dir_atomico(str(tmp_path / 'var'))
+    assert os.listdir(tmp_path) == []
+    assert not remove_dir_atomico(str(tmp_path / 'var'))
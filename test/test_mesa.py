@@ -8,6 +8,7 @@ import pytest
 
 from numpy import ndarray
 from pandas import DataFrame
+from pandas.testing import assert_frame_equal
 from src.mesa import MesaCore, Combination
 
 LINK = """ydke://ZgEeAGYBHgA8Vk4FPFZOBQckdALEO0cFxDtHBbLJCQSyyQkEkFaQAZBWkAGQVpAB3ADiAdwA4gHJPTIDyT0yA2KA1ATj1qQA49akAOPWpABO93UBTvd1AbIyzAWyMswFPkiiAT5IogE+SKIB47AqAybrAATV9tYA1fbWAA31DAEN9QwBDfUMAd8WLwPfFi8D3xYvA8/v0ATP79AEz+/QBA==!Ebm4BWHRwQHNW4wFzVuMBc1bjAXADkkCiVRyAaSaKwAAuQgEALkIBAC5CAT5UX8Ei0cbA6KjRATbI+sD!7I8BAOyPAQDsjwEAsskJBE73dQGyMswF7ydRAO8nUQDV9tYAI9adAiPWnQJoTEQDIe4tAyHuLQMh7i0D!
@@ -15,6 +16,7 @@ LINK = """ydke://ZgEeAGYBHgA8Vk4FPFZOBQckdALEO0cFxDtHBbLJCQSyyQkEkFaQAZBWkAGQVpA
 
 FILE_TRUE  = os.path.dirname(__file__).replace('test', 'decks/_deck_false.txt')
 FILE_FALSE = os.path.dirname(__file__).replace('test', 'decks/_deck_false.txt')
+DECKS = os.path.dirname(__file__).replace('test', 'decks')
 
 @pytest.fixture()
 def mesa():
@@ -70,6 +72,13 @@ def test_monta_parte_deck(mesa):
     df = mesa.monta_parte_deck('side', side)
     assert isinstance(df, DataFrame) is True, "Side deck não Montado"
 
+def test_monta_parte_deck_ausentes(mesa):
+    main = mesa.read_url(LINK)['main']
+    df = mesa.monta_parte_deck('main', main + [1, 1])
+    assert isinstance(df, DataFrame) is True, "Main deck não Montado"
+    assert 1 not in df['cod'].to_list(), "Código inexistente montado"
+    assert mesa.CARTAS_AUSENTES['main'] == [1, 1], "Ausentes não registrados"
+
 def test_read_link_deck_ydke(mesa):
     dados = mesa.read_link_deck_ydke(LINK)
     assert isinstance(dados, tuple), "É uma tupla"
@@ -122,3 +131,52 @@ def test_class_combination_file_false():
     except Exception as e:
         assert 'Parameter invalid : ' in str(e), "Mensagem de error incorreta"
         assert FILE_FALSE in str(e), "O path não está presente"
+
+
+def _sub_frequence_referencia(estrutura: Combination, part_deck: DataFrame) -> DataFrame:
+    """Implementação original (laço linhas x tokens) do passo de sub frequência."""
+    import pandas as pd
+    alg_freq = pd.Series('|'.join(
+        part_deck.arquetype).replace(' | ', '|').split('|')
+    )
+    alg_freq = alg_freq.str.split(' ').explode().value_counts(
+        ).reset_index(name='freq')
+    alg_freq.columns = ['arquetype', 'sub_freq']
+    alg_freq['sub_freq'] = alg_freq['sub_freq'] / 10
+    alg_freq['sub_key'] = range(len(alg_freq), 0, -1)
+    array = alg_freq['sub_key'] == alg_freq['sub_key'].max()
+    array = alg_freq['arquetype'].loc[array].to_list()
+    if array[0] == 'generic':
+        alg_freq.loc[alg_freq['sub_key'] == alg_freq['sub_key'].max(), 'sub_key'] = 0
+
+    key = []
+    frq = []
+    for j in part_deck.arquetype:
+        for i in alg_freq.arquetype:
+            if i in j:
+                key.append(alg_freq.loc[alg_freq['arquetype'].isin([i])].iloc[0].to_numpy()[2])
+                frq.append(alg_freq.loc[alg_freq['arquetype'].isin([i])].iloc[0].to_numpy()[1])
+                break
+    part_deck['sub_key'] = key
+    part_deck['sub_freq'] = frq
+    return part_deck.copy()
+
+def test_sub_frequence_equivalente():
+    estrutura = comb(LINK)
+    links = [LINK]
+    for arq in sorted(os.listdir(DECKS)):
+        if arq.endswith('.ydk'):
+            deck = estrutura.read_file_deck(os.path.join(DECKS, arq))
+            links.append(estrutura.to_url(deck))
+
+    comparados = 0
+    for link in links:
+        main = estrutura.read_link_deck_ydke(link)[0]
+        if main.empty:
+            continue
+        freq = estrutura._conta_frequencia_arquetipo_main_deck(main)
+        novo = estrutura._conta_sub_frequence_main_deck(freq.copy())
+        referencia = _sub_frequence_referencia(estrutura, freq.copy())
+        assert_frame_equal(novo, referencia)
+        comparados += 1
+    assert comparados > 0, "Nenhum deck comparado"
@@ -0,0 +1,106 @@
+#
+# Python 3.11.10
+#
+# Pytest 8.3.3
+#
+import time
+import pytest
+from src.scheduler import RefreshScheduler
+
+class _Catalogo:
+    card_structures = {}
+
+    def __init__(self, version):
+        self.version = version
+
+class _Fontes:
+    """Estado das fontes falsas, novo a cada teste."""
+    def __init__(self):
+        self.alterados = ['card:complet']
+        self.base_mudou = False
+        self.falha = False
+        self.eventos = []
+        self.catalogos = 0
+
+    def downloader(self):
+        fontes = self
+
+        class _Downloader:
+            def __init__(self):
+                self.ALTERADOS = list(fontes.alterados)
+
+            def run_sync(self, catalogo=True):
+                assert not catalogo, "Catalogo montado junto com o download"
+                if fontes.falha:
+                    raise ConnectionError('HTTP 503')
+                fontes.eventos.append('folhas')
+
+        return _Downloader()
+
+    def base(self):
+        fontes = self
+
+        class _Base:
+            def atualizar(self, forcar=False, planilha=True):
+                fontes.eventos.append(('banco', forcar, planilha))
+                return fontes.base_mudou
+
+        return _Base()
+
+    def catalogo(self):
+        self.eventos.append('catalogo')
+        self.catalogos += 1
+        return _Catalogo(f'v{self.catalogos}')
+
+@pytest.fixture()
+def fontes():
+    return _Fontes()
+
+def _scheduler(fontes, publicados, intervalo=60):
+    return RefreshScheduler(
+        publicados.append, intervalo, fontes.downloader, fontes.base, fontes.catalogo
+    )
+
+def test_scheduler_refresh(fontes):
+    publicados = []
+    scheduler = _scheduler(fontes, publicados)
+    assert scheduler.refresh(), "Atualizacao falhou"
+    assert len(publicados) == 1, "Catalogo nao publicado"
+    assert fontes.eventos == ['folhas', ('banco', True, False), 'catalogo'], "Catalogo montado antes do banco"
+
+    fontes.alterados = []
+    assert scheduler.refresh()
+    assert len(publicados) == 1, "Catalogo inalterado foi publicado de novo"
+
+    fontes.falha = True
+    assert not scheduler.refresh(), "Falha nao reportada"
+    status = scheduler.status()
+    assert status['runs'] == 3 and status['failures'] == 1 and status['version'] == 'v1'
+    assert 'ConnectionError' in status['last_error'], "Erro nao registrado"
+
+def test_scheduler_refresh_dump(fontes):
+    # Folhas inalteradas, so o dump oficial (e o banco) mudou
+    publicados = []
+    scheduler = _scheduler(fontes, publicados)
+    assert scheduler.refresh()
+    fontes.alterados = []
+    fontes.base_mudou = True
+    fontes.eventos.clear()
+    assert scheduler.refresh()
+    assert len(publicados) == 2, "Mudanca do dump nao republicou o catalogo"
+    assert fontes.eventos == ['folhas', ('banco', True, False), 'catalogo']
+    assert scheduler.status()['version'] == 'v2' == publicados[-1].version
+
+def test_scheduler_thread(fontes):
+    publicados = []
+    scheduler = _scheduler(fontes, publicados, 0.05)
+    scheduler.start()
+    try:
+        limite = time.monotonic() + 5
+        while not publicados and time.monotonic() < limite:
+            time.sleep(0.01)
+        assert scheduler.status()['alive'], "Thread de atualizacao parada"
+    finally:
+        scheduler.stop()
+    assert publicados, "Thread nao publicou o catalogo"
+    assert not scheduler.status()['alive'], "Thread nao parou"
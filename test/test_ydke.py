@@ -4,8 +4,12 @@
 # Pytest 8.3.3
 #
 import os
+import mmap
 import pytest
-from src.ydke import CoreYDKE
+from src.ydke import (
+    CoreYDKE, DeckBatch, YDKEComponentError, YDKEEncodingError, YDKEProtocolError, YDKFileError,
+    TAMANHO_BLOCO
+)
 
 @pytest.fixture()
 def ydk():
@@ -54,6 +58,22 @@ def test_ydke_read_url(ydk):
     assert 'URL component' in ydk.read_url(component), "Componente sem alvo"
 
 
+def test_ydke_fingerprint(ydk):
+    deck = {
+        'main': [69680031, 95679145, 60303688, 69680031],
+        'extra': [93053159, 24915933],
+        'side': [99735427]
+    }
+    embaralhado = {
+        'main': [60303688, 69680031, 69680031, 95679145],
+        'extra': [24915933, 93053159],
+        'side': [99735427]
+    }
+    assert ydk.fingerprint(deck) == ydk.fingerprint(embaralhado), "Ordem alterou a impressao"
+    # a mesma carta em outra parte e outro deck
+    outro = {'main': deck['main'], 'extra': [93053159], 'side': [99735427, 24915933]}
+    assert ydk.fingerprint(deck) != ydk.fingerprint(outro), "Partes diferentes, mesma impressao"
+
 def test_ydke_extract_urls(ydk):
     deck = """
         ydke://sO3fAhdb8gOKGRAFIE7rBYk4dAT4NdICKfasACdEqwBOE4UEZV2NADUz/
@@ -103,3 +123,128 @@ def test_ydke_read_file_deck(ydk):
     assert isinstance(result['main'], list), "Nao e uma lista python"
     assert isinstance(result['extra'], list), "Nao e uma lista python"
     assert isinstance(result['side'], list), "Nao e uma lista python"
+
+def test_ydke_batch(ydk):
+    decks = [
+        {'main': [69680031, 95679145, 60303688], 'extra': [93053159], 'side': []},
+        {'main': [], 'extra': [], 'side': [99735427, 14087893]}
+    ]
+    links = [ydk.to_url(d) for d in decks]
+    lote = CoreYDKE.decode_batch(links + ['ydke://AAAA!!!', 'sem protocolo', 'ydke://!'])
+    assert len(lote) == 5
+    assert lote.values.dtype == 'int32' and lote.offsets.shape[0] == 16
+    assert [lote.deck(i) for i in lote.valid] == decks, "Lote diverge de read_url"
+    assert lote.part(0, 'main').base is not None, "Parte deve ser uma visao do buffer"
+    assert isinstance(lote.errors[2], YDKEEncodingError)
+    assert isinstance(lote.errors[3], YDKEProtocolError)
+    assert str(lote.errors[3]) == ydk.read_url('sem protocolo'), "Mensagem diverge de read_url"
+    assert isinstance(lote.errors[4], YDKEComponentError)
+
+    assert CoreYDKE.encode_batch(lote) == links + [None, None, None]
+    assert CoreYDKE.encode_batch(DeckBatch.from_decks(decks)) == links
+    with pytest.raises(YDKEProtocolError):
+        CoreYDKE.decode_batch(['sem protocolo'], strict=True)
+
+def test_ydke_batch_read_url(ydk):
+    # o lote aceita e recusa exatamente os mesmos links de `read_url`
+    link = ydk.to_url({'main': [69680031, 95679145], 'extra': [93053159], 'side': [1]})
+    casos = [
+        link, link[:-1], 'ydke://!!', 'ydke://!!!', link + 'sobra!', link.replace('!', '!\t', 1),
+        'ydke://AAAA!!!', 'ydke://AAAAAA==!!!', 'ydke://!', 'ydke://AA*A!!!', 'sem protocolo'
+    ]
+    lote = CoreYDKE.decode_batch(casos)
+    for i, caso in enumerate(casos):
+        lido = ydk.read_url(caso)
+        if isinstance(lido, dict):
+            assert i not in lote.errors and lote.deck(i) == lido, f"Lote recusou {caso!r}"
+        else:
+            assert i in lote.errors, f"Lote aceitou {caso!r}: {lido}"
+    assert lote.deck(1) == lote.deck(0), "Link sem '!' final diverge"
+    assert str(lote.errors[8]) == ydk.read_url('ydke://!') == 'Missing ydke URL component'
+    assert isinstance(lote.errors[8], YDKEComponentError)
+
+def test_ydke_iter_urls(ydk, tmp_path):
+    decks = [
+        {'main': [69680031, 95679145, 60303688], 'extra': [93053159], 'side': []},
+        {'main': [14087893] * 40, 'extra': [24915933] * 15, 'side': [99735427] * 15}
+    ]
+    links = [ydk.to_url(d) for d in decks]
+    # segundo link quebrado em linhas, como nos dumps de formularios
+    quebrado = '\n        '.join(links[1][i:i + 60] for i in range(0, len(links[1]), 60))
+    texto = f'Inscricao 1: {links[0]} ok\nInscricao 2:\n        {quebrado}\nydke://invalido!!'
+
+    for tamanho in (1, 7, 64, len(texto)):
+        assert list(CoreYDKE.iter_urls(texto, tamanho)) == links, f"Blocos de {tamanho} perderam links"
+
+    # 'ydke://' solto muito antes do fim do bloco nao descarta o link cortado
+    solto = 'cole seu link ydke:// abaixo\n'
+    solto += 'x' * (TAMANHO_BLOCO - len(solto) - 10) + links[0]
+    assert list(CoreYDKE.iter_urls(solto)) == ydk.extract_urls(solto) == links[:1]
+    # texto corrido nao vira parte de um link
+    prosa = 'ydke://AAAA!BBBB! then the third part is missing hi!'
+    assert list(CoreYDKE.iter_urls(prosa)) == [], "Texto incorporado ao link"
+
+    path = tmp_path / 'inscricoes.txt'
+    path.write_text(texto * 3, encoding='utf-8')
+    with open(path, 'rb') as file:
+        assert list(CoreYDKE.iter_urls(file, 13)) == links * 3
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            assert list(CoreYDKE.iter_urls(mapa, 13)) == links * 3
+    assert [d for _, d in CoreYDKE.iter_decks(path, 13, lote=2)] == decks * 3
+
+def test_ydke_canonical(ydk):
+    deck = {'main': [69680031, 95679145, 69680031], 'extra': [93053159], 'side': []}
+    embaralhado = {'main': [69680031, 69680031, 95679145], 'extra': [93053159], 'side': []}
+    canonico = ydk.canonical_bytes(deck)
+    assert canonico == ydk.canonical_bytes(embaralhado)
+    # versao, tres contagens e um codigo e uma contagem por carta distinta
+    assert len(canonico) == 1 + 4 * 3 + 8 * 3, "Copias repetidas nao compactadas"
+    assert ydk.from_canonical(canonico) == {k: sorted(v) for k, v in deck.items()}
+    with pytest.raises(ValueError):
+        ydk.from_canonical(canonico[:-1])
+
+    links = [ydk.to_url(deck), 'invalido', ydk.to_url(embaralhado), ydk.to_url({**deck, 'side': [1]})]
+    lote = CoreYDKE.decode_batch(links)
+    assert CoreYDKE.canonical_batch(lote) == [canonico, None, canonico, ydk.canonical_bytes({**deck, 'side': [1]})]
+    assert CoreYDKE.fingerprint_batch(lote)[0] == ydk.fingerprint(deck)
+    unicos, grupos = CoreYDKE.dedup_batch(lote)
+    assert unicos == [0, 3] and grupos.tolist() == [0, -1, 0, 1]
+    assert ydk.same_deck(links[0], links[2]) and not ydk.same_deck(links[0], links[3])
+
+    # mais de 255 copias de uma carta ainda tem codificacao canonica
+    muitas = {**deck, 'side': [1] * 256}
+    assert ydk.from_canonical(ydk.canonical_bytes(muitas)) == {k: sorted(v) for k, v in muitas.items()}
+    lote = CoreYDKE.decode_batch([ydk.to_url(muitas), links[0], ydk.to_url(muitas)])
+    assert CoreYDKE.canonical_batch(lote)[0] == ydk.canonical_bytes(muitas)
+    assert CoreYDKE.dedup_batch(lote)[1].tolist() == [0, 1, 0]
+
+def test_ydke_scan_directory(ydk, tmp_path):
+    decks = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'decks')
+    esperado = ydk.read_file_deck(os.path.join(decks, '_dogmatica.ydk'))
+    texto = open(os.path.join(decks, '_dogmatica.ydk'), encoding='utf-8').read()
+
+    # CRLF e arquivo sem !side
+    (tmp_path / 'crlf.ydk').write_bytes(texto.replace('\n', '\r\n').encode('utf-8'))
+    (tmp_path / 'sem_side.ydk').write_text(texto.split('!side')[0], encoding='utf-8')
+    (tmp_path / 'quebrado.ydk').write_text('#main\nnao e carta\n', encoding='utf-8')
+    (tmp_path / 'so_side.ydk').write_text('!side\n123\n', encoding='utf-8')
+    (tmp_path / 'ignorado.txt').write_text(texto, encoding='utf-8')
+
+    for processos in (False, True):
+        scan = CoreYDKE.scan_directory(tmp_path, paralelo=2, processos=processos)
+        assert [os.path.basename(p) for p in scan.paths] == [
+            'crlf.ydk', 'quebrado.ydk', 'sem_side.ydk', 'so_side.ydk'
+        ]
+        assert scan.batch.deck(0) == {p: esperado[p] for p in ('main', 'extra', 'side')}
+        assert scan.batch.deck(2) == {**scan.batch.deck(0), 'side': []}
+        assert scan.created == ['Laplace', '', 'Laplace', '']
+        assert [e['type'] for e in scan.errors] == ['YDKFileError', 'YDKFileError']
+        assert 'line 2' in scan.errors[0]['error']
+        assert scan.errors[1]['error'] == 'Missing #main section', "Arquivo sem #main aceito"
+
+    saida = ydk.write_batch(scan.batch, tmp_path / 'saida', ['a', 'b', 'c', 'd'], created='Laplace')
+    assert saida[1] is None
+    assert open(saida[0], encoding='utf-8').read() == texto, "Escrita diverge do arquivo original"
+    assert ydk.read_file_deck(saida[2])['side'] == []
+    with pytest.raises(YDKFileError):
+        ydk.write_file_deck(esperado, tmp_path / 'deck.txt')